@@ -1,13 +1,21 @@
 # app.py
 import uvicorn
-from fastapi import FastAPI, Request, Form
-from fastapi.responses import HTMLResponse, JSONResponse, FileResponse
+from fastapi import FastAPI, HTTPException, Request, Form, WebSocket
+from fastapi.responses import HTMLResponse, JSONResponse, FileResponse, PlainTextResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
+from fastapi.concurrency import run_in_threadpool
 from fastapi.templating import Jinja2Templates
+import asyncio
+import json
 import logging
 import os
+from typing import Optional
 
+from core.audio_stream import wav_header
 from core.config import Config
+from core.jobs import JobManager
+from core.manager import DEFAULT_PIPELINE, PipelineManager
+from core.metrics import METRICS
 from core.pipeline import AssistivePipeline
 try:
     from core.ocr_engine import TESSER_AVAILABLE
@@ -26,82 +34,329 @@ BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 templates = Jinja2Templates(directory=os.path.join(BASE_DIR, "templates"))
 app.mount("/static", StaticFiles(directory=os.path.join(BASE_DIR, "static")), name="static")
 
-cfg = Config(os.path.join(BASE_DIR, "config.json"))
-pipeline = AssistivePipeline(cfg)
+# Built in the startup hook, not at import: OCR worker processes are spawned
+# and re-import this module, and must not load pipelines and models of their own
+cfg: Optional[Config] = None
+# One pipeline per classroom: "default" runs from config.json, others from
+# configs/<name>.json. Routes without a pipeline id act on "default".
+manager: Optional[PipelineManager] = None
+# Slow work (speech, model reloads) runs here instead of on the event loop
+jobs: Optional[JobManager] = None
+
+
+def _publish_job(job: dict):
+    target = manager.get(job.get("pipeline") or DEFAULT_PIPELINE) if manager is not None else None
+    if target is not None:
+        target.events.publish("job", job)
+
+
+@app.on_event("startup")
+def on_startup():
+    global cfg, manager, jobs
+    cfg = Config(os.path.join(BASE_DIR, "config.json"))
+    manager = PipelineManager(cfg, os.path.join(BASE_DIR, "configs"))
+    jobs = JobManager(on_update=_publish_job)
+
+
+def _pipeline(pipeline_id: str) -> AssistivePipeline:
+    pipe = manager.get(pipeline_id)
+    if pipe is None:
+        raise HTTPException(status_code=404, detail=f"unknown pipeline '{pipeline_id}'")
+    return pipe
 
 @app.get("/", response_class=HTMLResponse)
-async def dashboard(request: Request):
+@app.get("/pipelines/{pipeline_id}", response_class=HTMLResponse)
+async def dashboard(request: Request, pipeline_id: str = DEFAULT_PIPELINE):
+    pipe = _pipeline(pipeline_id)
     voices = []
-    if pipeline.tts.coqui and hasattr(pipeline.tts.coqui, 'speakers') and pipeline.tts.coqui.speakers:
-        voices = pipeline.tts.coqui.speakers
-    return templates.TemplateResponse("dashboard.html", {"request": request, "config": cfg.data, "voices": voices})
+    if pipe.tts.coqui and hasattr(pipe.tts.coqui, 'speakers') and pipe.tts.coqui.speakers:
+        voices = pipe.tts.coqui.speakers
+    return templates.TemplateResponse("dashboard.html", {
+        "request": request, "config": pipe.cfg, "voices": voices, "pipeline_id": pipe.name,
+    })
+
+@app.get("/api/pipelines")
+async def api_pipelines():
+    """All classroom pipelines plus the shared models and scheduler state."""
+    return JSONResponse({"pipelines": manager.summary(), **manager.stats()})
+
+@app.post("/api/pipelines")
+def api_create_pipeline(payload: dict):
+    """Create a pipeline: {"name": "room-101", "config": {"camera": {...}}} (unset keys copy the default)."""
+    name, overrides = payload.get("name", ""), payload.get("config") or {}
+    if not isinstance(overrides, dict):
+        return JSONResponse({"status": "error", "message": "config must be an object"}, status_code=400)
+    try:
+        pipe = manager.create(name, overrides)
+    except ValueError as e:
+        return JSONResponse({"status": "error", "message": str(e)}, status_code=400)
+    return JSONResponse({"status": "created", "name": pipe.name, "config": pipe.cfg}, status_code=201)
+
+@app.delete("/api/pipelines/{pipeline_id}")
+def api_delete_pipeline(pipeline_id: str):
+    try:
+        manager.remove(pipeline_id)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"unknown pipeline '{pipeline_id}'")
+    except ValueError as e:
+        return JSONResponse({"status": "error", "message": str(e)}, status_code=400)
+    return JSONResponse({"status": "removed", "name": pipeline_id})
 
+# start/stop spawn and join threads (and OCR worker processes), so they are
+# plain handlers that FastAPI runs in its threadpool
 @app.post("/api/start")
-async def api_start():
+@app.post("/api/pipelines/{pipeline_id}/start")
+def api_start(pipeline_id: str = DEFAULT_PIPELINE):
+    pipeline = _pipeline(pipeline_id)
     pipeline.start()
     return JSONResponse({"status": "started", "pipeline": pipeline.get_status()})
 
 @app.post("/api/stop")
-async def api_stop():
+@app.post("/api/pipelines/{pipeline_id}/stop")
+def api_stop(pipeline_id: str = DEFAULT_PIPELINE):
+    pipeline = _pipeline(pipeline_id)
     pipeline.stop()
     return JSONResponse({"status": "stopped", "pipeline": pipeline.get_status()})
 
 @app.get("/api/status")
-async def api_status():
+@app.get("/api/pipelines/{pipeline_id}/status")
+async def api_status(pipeline_id: str = DEFAULT_PIPELINE):
+    pipeline = _pipeline(pipeline_id)
     return JSONResponse({"status": "ok", "pipeline": pipeline.get_status()})
 
+@app.get("/api/ready")
+@app.get("/api/pipelines/{pipeline_id}/ready")
+async def api_ready(pipeline_id: str = DEFAULT_PIPELINE):
+    """Per-engine load state; 'ready' turns true once every heavy model has loaded or failed."""
+    pipeline = _pipeline(pipeline_id)
+    return JSONResponse(pipeline.get_readiness())
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus scrape endpoint: per-stage latency histograms, frame counters, queue depths."""
+    return PlainTextResponse(METRICS.render(), media_type="text/plain; version=0.0.4")
+
+@app.get("/api/events")
+@app.get("/api/pipelines/{pipeline_id}/events")
+async def api_events(request: Request, pipeline_id: str = DEFAULT_PIPELINE):
+    """
+    Server-sent events: a full "status" snapshot on connect, then "transcript"
+    entries as they are produced and "status" deltas (changed fields only).
+    """
+    pipeline = _pipeline(pipeline_id)
+    q = pipeline.events.subscribe()
+
+    async def stream():
+        try:
+            yield f"event: status\ndata: {json.dumps(pipeline.get_status())}\n\n"
+            while not await request.is_disconnected():
+                try:
+                    event, data = await asyncio.wait_for(q.get(), timeout=15)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"event: {event}\ndata: {json.dumps(data)}\n\n"
+        finally:
+            pipeline.events.unsubscribe(q)
+
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    return StreamingResponse(stream(), media_type="text/event-stream", headers=headers)
+
 @app.get("/api/history")
-async def api_history():
-    return JSONResponse({"history": pipeline.get_history()})
+@app.get("/api/pipelines/{pipeline_id}/history")
+async def api_history(
+    since: Optional[int] = None,
+    before: Optional[int] = None,
+    limit: int = 50,
+    q: Optional[str] = None,
+    pipeline_id: str = DEFAULT_PIPELINE,
+):
+    """
+    Transcript page, newest first. ?since=<id> returns only entries after that
+    id (poll with the last id seen); ?before=<id> pages back through older
+    entries; ?q= searches the text.
+    """
+    pipeline = _pipeline(pipeline_id)
+    limit = max(1, min(limit, 500))
+    history = await run_in_threadpool(pipeline.get_history, since, before, limit, q)
+    ids = [h["id"] for h in history]
+    return JSONResponse({
+        "history": history,
+        "latest_id": max(ids) if ids else since,
+        "oldest_id": min(ids) if ids else before,
+        "has_more": len(history) == limit,
+    })
 
 @app.get("/api/config")
-async def api_get_config():
-    return JSONResponse(cfg.data)
+@app.get("/api/pipelines/{pipeline_id}/config")
+async def api_get_config(pipeline_id: str = DEFAULT_PIPELINE):
+    return JSONResponse(_pipeline(pipeline_id).cfg)
 
 @app.post("/api/config")
-async def api_update_config(payload: dict):
-    global pipeline
-    cfg.update(payload)
-    pipeline.stop()
-    pipeline = AssistivePipeline(cfg)
-    pipeline.start()
-    return JSONResponse({"status": "saved", "config": cfg.data})
+@app.post("/api/pipelines/{pipeline_id}/config")
+async def api_update_config(payload: dict, pipeline_id: str = DEFAULT_PIPELINE):
+    pipeline = _pipeline(pipeline_id)
+    pipeline.config.update(payload)
+    # Apply in place in the background; only engines whose model settings
+    # changed are rebuilt. The job result holds what was applied.
+    job = jobs.submit(
+        "config", pipeline.reconfigure,
+        lane=f"config:{pipeline.name}", tags={"pipeline": pipeline.name},
+    )
+    return JSONResponse({"status": "saved", "config": pipeline.cfg, "job": job}, status_code=202)
 
 
 @app.post("/api/speak")
-async def api_speak(payload: dict):
+@app.post("/api/pipelines/{pipeline_id}/speak")
+async def api_speak(payload: dict, pipeline_id: str = DEFAULT_PIPELINE):
+    """
+    Speak text ahead of board text; {"interrupt": true} also cuts off what is
+    playing now. The job finishes with the utterance's outcome
+    (spoken, interrupted, failed).
+    """
+    pipeline = _pipeline(pipeline_id)
     text = payload.get("text", "")
-    if text:
-        pipeline.tts.speak(text,
-                          voice=cfg.data["tts"].get("voice"),
-                          speed=cfg.data["tts"].get("speed",1.0),
-                          volume=cfg.data["tts"].get("volume",0.9))
-        return JSONResponse({"status": "speaking"})
-    return JSONResponse({"status": "error", "message": "no text"}, status_code=400)
+    if not text:
+        return JSONResponse({"status": "error", "message": "no text"}, status_code=400)
+    utt = pipeline.say(text, interrupt=bool(payload.get("interrupt", False)))
+    if utt is None:
+        return JSONResponse({"status": "error", "message": "speech queue full"}, status_code=429)
+    job = jobs.submit("speak", utt.wait, lane=f"speak:{pipeline.name}", tags={"pipeline": pipeline.name})
+    return JSONResponse({"status": "speaking", "job": job}, status_code=202)
+
+@app.post("/api/speak/stop")
+@app.post("/api/pipelines/{pipeline_id}/speak/stop")
+async def api_speak_stop(pipeline_id: str = DEFAULT_PIPELINE):
+    """Barge-in: stop the current utterance and drop everything queued."""
+    pipeline = _pipeline(pipeline_id)
+    pipeline.speech.interrupt()
+    return JSONResponse({"status": "stopped", "speech_queue": pipeline.speech.stats()})
+
+@app.get("/api/jobs")
+async def api_jobs():
+    return JSONResponse({"jobs": jobs.recent()})
+
+@app.get("/api/jobs/{job_id}")
+async def api_job(job_id: str):
+    """Status of a background job: queued, running, done (with result) or failed (with error)."""
+    job = jobs.get(job_id)
+    if job is None:
+        return JSONResponse({"status": "error", "message": "unknown job"}, status_code=404)
+    return JSONResponse(job)
 
 @app.get("/api/replay")
-async def api_replay():
+@app.get("/api/pipelines/{pipeline_id}/replay")
+async def api_replay(pipeline_id: str = DEFAULT_PIPELINE):
+    pipeline = _pipeline(pipeline_id)
     # return last audio file if available
     last = pipeline.tts.last_audio_path
     if last and os.path.exists(last):
         return FileResponse(last, media_type="audio/wav", filename="last_audio.wav")
     return JSONResponse({"status":"no_audio"}, status_code=404)
 
-@app.get("/api/test-camera")
-async def api_test_camera():
-    """Test if camera is accessible and can capture frames."""
+@app.websocket("/api/audio/ws")
+@app.websocket("/api/pipelines/{pipeline_id}/audio/ws")
+async def api_audio_ws(websocket: WebSocket, pipeline_id: str = DEFAULT_PIPELINE):
+    """
+    Live speech for a listener's own device: a JSON "format" message, then
+    binary frames of mono int16 PCM as soon as each sentence is synthesized.
+    """
+    pipeline = manager.get(pipeline_id)
+    if pipeline is None:
+        await websocket.close(code=4404)
+        return
+    await websocket.accept()
+    audio = pipeline.audio
+    listener = audio.subscribe()
+    try:
+        await websocket.send_json({
+            "type": "format", "encoding": "pcm_s16le", "channels": 1,
+            "sample_rate": audio.sample_rate, "chunk_ms": audio.chunk_ms,
+        })
+        while True:
+            chunk = await listener.get(timeout=15.0)
+            if listener.closed:
+                # Stream format changed; 1012 (service restart) tells the client to reconnect
+                await websocket.close(code=1012)
+                break
+            if chunk is None:
+                await websocket.send_json({"type": "ping"})
+            else:
+                await websocket.send_bytes(chunk)
+    except Exception as e:
+        # Client went away (WebSocketDisconnect or a failed send)
+        logger.debug("Audio listener disconnected: %s", e)
+    finally:
+        audio.unsubscribe(listener)
+
+@app.get("/api/audio/stream")
+@app.get("/api/pipelines/{pipeline_id}/audio/stream")
+async def api_audio_stream(request: Request, pipeline_id: str = DEFAULT_PIPELINE):
+    """
+    The same speech as an endless WAV over chunked HTTP, for plain <audio>
+    players. Sent in real time with silence between utterances so the
+    player's clock never stalls and falls behind.
+    """
+    audio = _pipeline(pipeline_id).audio
+    lead = 0.3  # seconds of audio kept in flight ahead of real time
+
+    async def stream():
+        listener = audio.subscribe()
+        loop = asyncio.get_running_loop()
+        try:
+            rate, silence = audio.sample_rate, audio.silence()
+            yield wav_header(rate)
+            start, sent = loop.time(), 0.0
+            # Ends when the sample rate changes; players reconnect and read the new header
+            while not listener.closed and not await request.is_disconnected():
+                ahead = sent - (loop.time() - start)
+                if ahead > lead:
+                    await asyncio.sleep(ahead - lead)
+                    continue
+                chunk = listener.get_nowait() or silence
+                sent += len(chunk) / 2 / rate
+                yield chunk
+        finally:
+            audio.unsubscribe(listener)
+
+    return StreamingResponse(stream(), media_type="audio/wav", headers={"Cache-Control": "no-store"})
+
+def _camera_frame(pipeline: AssistivePipeline):
+    """
+    A current camera frame and where it came from. While the pipeline runs the
+    capture thread owns the device, so use its latest frame from the hub;
+    otherwise open the camera briefly.
+    """
     import cv2
+    if pipeline.running:
+        _, frame, _ = pipeline.hub.snapshot(max_age=2.0)
+        if frame is not None:
+            return frame, "pipeline"
+        return None, "pipeline"
+    cam_id = pipeline.cfg["camera"].get("camera_id", 0)
+    cap = cv2.VideoCapture(cam_id)
     try:
-        cam_id = cfg.data["camera"].get("camera_id", 0)
-        cap = cv2.VideoCapture(cam_id)
         if not cap.isOpened():
-            return JSONResponse({"status": "error", "message": f"Camera {cam_id} cannot be opened"})
+            return None, "closed"
         ret, frame = cap.read()
+        return (frame if ret else None), "device"
+    finally:
         cap.release()
-        if ret and frame is not None:
+
+@app.get("/api/test-camera")
+@app.get("/api/pipelines/{pipeline_id}/test-camera")
+def api_test_camera(pipeline_id: str = DEFAULT_PIPELINE):
+    """Test if camera is accessible and can capture frames (sync handler, runs in the threadpool)."""
+    pipeline = _pipeline(pipeline_id)
+    try:
+        cam_id = pipeline.cfg["camera"].get("camera_id", 0)
+        frame, source = _camera_frame(pipeline)
+        if source == "closed":
+            return JSONResponse({"status": "error", "message": f"Camera {cam_id} cannot be opened"})
+        if frame is not None:
             return JSONResponse({
                 "status": "ok", 
-                "message": f"Camera {cam_id} working",
+                "message": f"Camera {cam_id} working" + (" (live pipeline frame)" if source == "pipeline" else ""),
                 "frame_shape": list(frame.shape)
             })
         else:
@@ -110,9 +365,43 @@ async def api_test_camera():
         logger.exception("Camera test failed")
         return JSONResponse({"status": "error", "message": str(e)}, status_code=500)
 
+@app.get("/api/preview")
+@app.get("/api/pipelines/{pipeline_id}/preview")
+async def api_preview(request: Request, pipeline_id: str = DEFAULT_PIPELINE):
+    """
+    MJPEG preview of the running pipeline's camera. Frames come from the frame
+    hub, so viewers never open the device; one JPEG encode per frame is shared
+    by all viewers and capped at camera.preview_fps.
+    """
+    pipeline = _pipeline(pipeline_id)
+    if not pipeline.running:
+        return JSONResponse({"status": "error", "message": "pipeline not running"}, status_code=409)
+    hub = pipeline.hub
+
+    async def stream():
+        hub.add_viewer()
+        last = -1
+        try:
+            while pipeline.running and not await request.is_disconnected():
+                if hub.seq != last:
+                    seq, jpg = await run_in_threadpool(hub.jpeg)
+                    if jpg is not None and seq != last:
+                        last = seq
+                        yield (
+                            b"--frame\r\nContent-Type: image/jpeg\r\nContent-Length: "
+                            + str(len(jpg)).encode() + b"\r\n\r\n" + jpg + b"\r\n"
+                        )
+                await asyncio.sleep(hub.preview_interval)
+        finally:
+            hub.remove_viewer()
+
+    return StreamingResponse(stream(), media_type="multipart/x-mixed-replace; boundary=frame")
+
 @app.get("/api/test-ocr")
-async def api_test_ocr():
-    """Test OCR engine initialization - optimized version."""
+@app.get("/api/pipelines/{pipeline_id}/test-ocr")
+def api_test_ocr(pipeline_id: str = DEFAULT_PIPELINE):
+    """Test OCR engine initialization - optimized version (sync handler, runs in the threadpool)."""
+    pipeline = _pipeline(pipeline_id)
     # Check Tesseract availability
     tesseract_module_available = False
     tesseract_executable_available = False
@@ -159,20 +448,15 @@ async def api_test_ocr():
     # Test OCR on a real camera frame if available
     ocr_test_result = None
     try:
-        import cv2
-        cam_id = cfg.data["camera"].get("camera_id", 0)
-        cap = cv2.VideoCapture(cam_id)
-        if cap.isOpened():
-            ret, frame = cap.read()
-            cap.release()
-            if ret and frame is not None:
-                ocr_res = pipeline.ocr.extract_text(frame)
-                ocr_test_result = {
-                    "text": ocr_res.text[:100] if ocr_res.text else "",
-                    "engine": ocr_res.engine,
-                    "confidence": ocr_res.confidence,
-                    "length": len(ocr_res.text) if ocr_res.text else 0
-                }
+        frame, _ = _camera_frame(pipeline)
+        if frame is not None:
+            ocr_res = pipeline.run_ocr(frame)  # waits for the process loop, never runs alongside it
+            ocr_test_result = {
+                "text": ocr_res.text[:100] if ocr_res.text else "",
+                "engine": ocr_res.engine,
+                "confidence": ocr_res.confidence,
+                "length": len(ocr_res.text) if ocr_res.text else 0
+            }
     except Exception as e:
         logger.error("OCR test on camera frame failed: %s", e)
         ocr_test_result = {"error": str(e)}
@@ -197,6 +481,13 @@ async def api_test_ocr():
         }
     })
 
+@app.on_event("shutdown")
+def on_shutdown():
+    if jobs is not None:
+        jobs.shutdown()
+    if manager is not None:
+        manager.close_all()
+
 if __name__ == "__main__":
     # Create templates directory if missing (templates provided separately)
     uvicorn.run("app:app", host="0.0.0.0", port=8000, reload=False)
\ No newline at end of file
@@ -0,0 +1,100 @@
+"""
+Synthetic lecture corpus for offline benchmarks.
+
+Renders classroom-board style images (whiteboard, blackboard, projected
+slide) with known text, plus short clips in which lines appear one after
+another as if being written. Everything is generated from a seed, so two
+runs on different versions see exactly the same input.
+"""
+import json
+import os
+import random
+from typing import Dict, List
+
+import cv2
+import numpy as np
+
+SENTENCES = [
+    "Newton's second law",
+    "F = m * a",
+    "Units of force are newtons",
+    "Photosynthesis needs sunlight",
+    "Water boils at 100 C",
+    "Area of a circle is pi r squared",
+    "Homework due on Monday",
+    "Chapter 4 summary",
+    "Mitochondria make energy",
+    "The derivative of x squared is 2x",
+    "Read pages 40 to 52",
+    "Velocity is distance over time",
+    "Ohm's law V = I R",
+    "Kinetic energy 1/2 m v squared",
+    "Test on Friday",
+    "Atoms contain protons and neutrons",
+]
+
+STYLES = {
+    "whiteboard": {"bg": (235, 238, 240), "fg": (40, 40, 40)},
+    "blackboard": {"bg": (40, 60, 45), "fg": (230, 230, 225)},
+    "slide": {"bg": (250, 250, 250), "fg": (20, 20, 120)},
+}
+
+FONTS = [cv2.FONT_HERSHEY_SIMPLEX, cv2.FONT_HERSHEY_DUPLEX, cv2.FONT_HERSHEY_SCRIPT_SIMPLEX]
+
+
+def render_board(lines: List[str], style: str, rng: random.Random, size=(1280, 720)) -> np.ndarray:
+    """Draw text lines on a board background with mild noise, blur and tilt."""
+    w, h = size
+    colors = STYLES[style]
+    img = np.full((h, w, 3), colors["bg"], dtype=np.uint8)
+    font = rng.choice(FONTS)
+    scale = rng.uniform(1.1, 1.6)
+    thickness = rng.choice([2, 3])
+    y = 110
+    for line in lines:
+        cv2.putText(img, line, (80 + rng.randint(-10, 10), y), font, scale, colors["fg"], thickness, cv2.LINE_AA)
+        y += int(60 * scale)
+
+    # Camera-ish degradation: slight perspective, blur and sensor noise
+    d = rng.randint(0, 25)
+    src = np.float32([[0, 0], [w, 0], [w, h], [0, h]])
+    dst = np.float32([[d, 0], [w - d, d], [w, h], [0, h - d]])
+    img = cv2.warpPerspective(img, cv2.getPerspectiveTransform(src, dst), (w, h), borderMode=cv2.BORDER_REPLICATE)
+    img = cv2.GaussianBlur(img, (3, 3), rng.uniform(0.3, 1.0))
+    noise = np.random.default_rng(rng.randint(0, 2 ** 31)).normal(0, 4, img.shape)
+    return np.clip(img.astype(np.float32) + noise, 0, 255).astype(np.uint8)
+
+
+def build_corpus(out_dir: str, seed: int = 1234, n_images: int = 24, n_clips: int = 2, clip_fps: int = 5) -> Dict:
+    """Generate images/, clips/ and manifest.json under out_dir; returns the manifest."""
+    rng = random.Random(seed)
+    os.makedirs(os.path.join(out_dir, "images"), exist_ok=True)
+    os.makedirs(os.path.join(out_dir, "clips"), exist_ok=True)
+    manifest = {"seed": seed, "images": [], "clips": []}
+
+    styles = list(STYLES)
+    for i in range(n_images):
+        lines = rng.sample(SENTENCES, rng.randint(1, 4))
+        style = styles[i % len(styles)]
+        name = f"board_{i:03d}_{style}.png"
+        cv2.imwrite(os.path.join(out_dir, "images", name), render_board(lines, style, rng))
+        manifest["images"].append({"file": f"images/{name}", "style": style, "text": "\n".join(lines)})
+
+    for c in range(n_clips):
+        lines = rng.sample(SENTENCES, 4)
+        style = styles[c % len(styles)]
+        name = f"lecture_{c:02d}_{style}.avi"
+        writer = cv2.VideoWriter(os.path.join(out_dir, "clips", name), cv2.VideoWriter_fourcc(*"MJPG"), clip_fps, (1280, 720))
+        frames = []
+        # Each line stays on the board for 2 s before the next one is written
+        for n in range(1, len(lines) + 1):
+            board = render_board(lines[:n], style, random.Random(seed + c))
+            for _ in range(clip_fps * 2):
+                writer.write(board)
+                frames.append("\n".join(lines[:n]))
+        writer.release()
+        manifest["clips"].append({"file": f"clips/{name}", "style": style, "fps": clip_fps, "text": "\n".join(lines), "frame_text": frames})
+
+    with open(os.path.join(out_dir, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
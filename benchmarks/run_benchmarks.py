@@ -0,0 +1,298 @@
+#!/usr/bin/env python
+"""
+Offline OCR→TTS benchmark suite.
+
+Measures, on a synthetic lecture corpus with ground truth:
+- each OCR backend and the full OCREngine.extract_text: frames/sec,
+  p50/p95/p99 latency, character accuracy and correct characters/sec
+- TTS synthesis real-time factor (synthesis time / audio duration)
+- the pipeline's per-frame path (change gate → OCR → dedupe/line diff)
+  over recorded clips, without camera or audio device
+- peak RSS of the process
+
+Results are written as JSON; pass --compare old.json to print deltas
+against an earlier run.
+
+Usage:
+    python -m benchmarks.run_benchmarks --out bench.json
+    python -m benchmarks.run_benchmarks --out new.json --compare bench.json
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+import cv2
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.corpus import build_corpus  # noqa: E402
+
+# Backends that can be benchmarked on their own (name -> OCREngine method, input)
+BACKENDS = {
+    "tesseract": ("_ocr_tesseract", "gray"),
+    "paddle": ("_ocr_paddle", "color"),
+    "easyocr": ("_ocr_easy", "color"),
+    "trocr": ("_ocr_trocr", "gray"),
+}
+
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    return round(float(np.percentile(values, q)) * 1000, 2) if values else None
+
+
+def char_accuracy(pred: str, truth: str) -> float:
+    """1 - character error rate (Levenshtein distance / reference length), whitespace-normalized."""
+    a, b = " ".join(pred.split()), " ".join(truth.split())
+    if not b:
+        return 1.0 if not a else 0.0
+    prev = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        cur = [i]
+        for j, cb in enumerate(b, 1):
+            cur.append(min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (ca != cb)))
+        prev = cur
+    return max(0.0, 1.0 - prev[-1] / len(b))
+
+
+def peak_rss_mb() -> Optional[float]:
+    try:
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports KiB, macOS bytes
+        return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+    except Exception:
+        pass
+    try:
+        import psutil  # type: ignore
+
+        return round(psutil.Process().memory_info().peak_wset / (1024 * 1024), 1)
+    except Exception:
+        return None
+
+
+def summarize(latencies: List[float], accs: List[float], chars: List[int]) -> Dict:
+    total = sum(latencies)
+    correct = sum(a * c for a, c in zip(accs, chars))
+    return {
+        "frames": len(latencies),
+        "fps": round(len(latencies) / total, 2) if total else None,
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+        "p99_ms": percentile(latencies, 99),
+        "char_accuracy": round(float(np.mean(accs)), 4) if accs else None,
+        "correct_chars_per_sec": round(correct / total, 1) if total else None,
+    }
+
+
+def bench_ocr(corpus_dir: str, manifest: Dict, ocr_cfg: Dict, repeat: int) -> Dict:
+    from core.ocr_engine import OCREngine
+
+    engine = OCREngine(ocr_cfg)
+    images = []
+    for item in manifest["images"]:
+        img = cv2.imread(os.path.join(corpus_dir, item["file"]))
+        images.append((img, cv2.cvtColor(img, cv2.COLOR_BGR2GRAY), item["text"]))
+
+    results = {}
+    loaded = {
+        "tesseract": engine.engine_state.get("tesseract") == "ready",
+        "paddle": engine.paddle is not None,
+        "easyocr": engine.easyocr is not None,
+        "trocr": engine.trocr_model is not None,
+    }
+    for name, (method, kind) in BACKENDS.items():
+        if not loaded[name]:
+            results[name] = {"available": False}
+            continue
+        fn = getattr(engine, method)
+        lat, accs, chars = [], [], []
+        for _ in range(repeat):
+            for color, gray, truth in images:
+                t0 = time.perf_counter()
+                res, _ = fn(gray if kind == "gray" else color)
+                lat.append(time.perf_counter() - t0)
+                accs.append(char_accuracy(res.text, truth))
+                chars.append(len(truth))
+        results[name] = dict(available=True, **summarize(lat, accs, chars))
+
+    # Full extract_text (cascade, line segmentation, cache...) as configured.
+    # The cache is emptied before every pass, or later passes would only time lookups
+    lat, accs, chars = [], [], []
+    for _ in range(repeat):
+        if engine.cache is not None:
+            engine.cache.clear()
+        for color, _, truth in images:
+            t0 = time.perf_counter()
+            res = engine.extract_text(color)
+            lat.append(time.perf_counter() - t0)
+            accs.append(char_accuracy(res.text, truth))
+            chars.append(len(truth))
+    results["extract_text"] = dict(available=True, cache=engine.cache_stats(), **summarize(lat, accs, chars))
+    engine.close()
+    return results
+
+
+def bench_tts(tts_cfg: Dict) -> Dict:
+    from core.tts_engine import TTSEngine
+
+    cfg = dict(tts_cfg, audio_cache=False)
+    tts = TTSEngine(cfg)
+    if tts.coqui is None:
+        return {"coqui": {"available": False}}
+    phrases = ["Newton's second law.", "The derivative of x squared is two x.", "Homework is due on Monday, read pages forty to fifty two."]
+    synth, audio_s, first = 0.0, 0.0, []
+    for text in phrases:
+        t0 = time.perf_counter()
+        out = tts._synthesize_coqui(text, cfg.get("voice"), float(cfg.get("speed", 1.0)))
+        dt = time.perf_counter() - t0
+        if out is None:
+            continue
+        audio, sr = out
+        synth += dt
+        audio_s += len(audio) / float(sr)
+        first.append(dt)
+    return {
+        "coqui": {
+            "available": True,
+            "utterances": len(first),
+            "real_time_factor": round(synth / audio_s, 3) if audio_s else None,
+            "p50_synth_ms": percentile(first, 50),
+        }
+    }
+
+
+def bench_pipeline(corpus_dir: str, manifest: Dict, base_cfg: Dict) -> Dict:
+    """Drive AssistivePipeline's per-frame path over the recorded clips (no camera, no audio)."""
+    from core.config import Config
+    from core.pipeline import AssistivePipeline
+
+    # Everything the pipeline writes (its config, the TTS audio cache) stays in tmp
+    with tempfile.TemporaryDirectory() as tmp:
+        config = Config(os.path.join(tmp, "config.json"))
+        config.update(base_cfg)
+        config.data["app"]["lazy_load"] = False
+        config.data["app"]["transcript_db"] = ""
+        config.data["tts"]["audio_cache_dir"] = os.path.join(tmp, "tts_cache")
+        pipe = AssistivePipeline(config)
+        try:
+            lat, accs, chars = [], [], []
+            for clip in manifest["clips"]:
+                cap = cv2.VideoCapture(os.path.join(corpus_dir, clip["file"]))
+                idx = 0
+                while True:
+                    ok, frame = cap.read()
+                    if not ok:
+                        break
+                    t0 = time.perf_counter()
+                    if pipe.change_gate.should_process(frame):
+                        pipe.frames_processed += 1
+                        res = pipe.ocr.extract_text(frame)
+                        pipe._handle_ocr_result(res)
+                        lat.append(time.perf_counter() - t0)
+                        accs.append(char_accuracy(res.text, clip["frame_text"][idx]))
+                        chars.append(len(clip["frame_text"][idx]))
+                    else:
+                        pipe.frames_skipped += 1
+                    idx += 1
+                cap.release()
+            spoken = pipe.speech.stats()["board_updates"]
+        finally:
+            pipe.close()
+            pipe.ocr.close()
+    out = summarize(lat, accs, chars)
+    out.update({
+        "frames_skipped": pipe.frames_skipped,
+        "frames_processed": pipe.frames_processed,
+        "utterances_queued": spoken,
+    })
+    return out
+
+
+def compare(new: Dict, old: Dict, prefix: str = ""):
+    for key, val in new.items():
+        ref = old.get(key) if isinstance(old, dict) else None
+        path = f"{prefix}{key}"
+        if isinstance(val, dict):
+            compare(val, ref or {}, path + ".")
+        elif isinstance(val, (int, float)) and not isinstance(val, bool) and isinstance(ref, (int, float)) and ref:
+            delta = (val - ref) / abs(ref) * 100
+            flag = "  <--" if abs(delta) >= 10 else ""
+            print(f"{path:55s} {ref:>12} -> {val:<12} ({delta:+.1f}%){flag}")
+
+
+def git_version() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "describe", "--always", "--dirty"], cwd=ROOT, text=True).strip()
+    except Exception:
+        return None
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--out", default="bench_results.json", help="JSON file to write")
+    ap.add_argument("--corpus-dir", default=None, help="Reuse/generate the corpus here (default: temp dir)")
+    ap.add_argument("--seed", type=int, default=1234)
+    ap.add_argument("--images", type=int, default=24)
+    ap.add_argument("--clips", type=int, default=2)
+    ap.add_argument("--repeat", type=int, default=1, help="Passes over the image set per engine")
+    ap.add_argument("--config", default=os.path.join(ROOT, "config.json"), help="Config whose ocr/tts sections are benchmarked")
+    ap.add_argument("--skip-tts", action="store_true")
+    ap.add_argument("--skip-pipeline", action="store_true")
+    ap.add_argument("--compare", default=None, help="Earlier results JSON to diff against")
+    args = ap.parse_args()
+
+    with open(args.config, "r", encoding="utf-8") as f:
+        base_cfg = json.load(f)
+
+    tmp = None
+    corpus_dir = args.corpus_dir
+    if corpus_dir is None:
+        tmp = tempfile.TemporaryDirectory()
+        corpus_dir = tmp.name
+    manifest_path = os.path.join(corpus_dir, "manifest.json")
+    if os.path.exists(manifest_path):
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    else:
+        print(f"Generating corpus in {corpus_dir} ...")
+        manifest = build_corpus(corpus_dir, seed=args.seed, n_images=args.images, n_clips=args.clips)
+
+    report = {
+        "version": git_version(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "platform": {"python": platform.python_version(), "machine": platform.machine(), "system": platform.system(), "cpus": os.cpu_count()},
+        "corpus": {"seed": manifest["seed"], "images": len(manifest["images"]), "clips": len(manifest["clips"])},
+        "ocr": bench_ocr(corpus_dir, manifest, base_cfg.get("ocr", {}), args.repeat),
+    }
+    if not args.skip_tts:
+        report["tts"] = bench_tts(base_cfg.get("tts", {}))
+    if not args.skip_pipeline:
+        report["pipeline"] = bench_pipeline(corpus_dir, manifest, base_cfg)
+    report["peak_rss_mb"] = peak_rss_mb()
+
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(json.dumps(report, indent=2))
+    print(f"\nWrote {args.out}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            old = json.load(f)
+        print(f"\nChange vs {args.compare} ({old.get('version')}):")
+        compare(report, old)
+
+    if tmp is not None:
+        tmp.cleanup()
+
+
+if __name__ == "__main__":
+    main()
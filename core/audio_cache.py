@@ -0,0 +1,144 @@
+import hashlib
+import logging
+import os
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import soundfile as sf
+
+logger = logging.getLogger("audio_cache")
+
+
+def normalize_text(text: str) -> str:
+    """Whitespace/Unicode normalisation so trivially different OCR strings share audio."""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+class AudioCache:
+    """
+    Two-tier cache of synthesized speech.
+
+    - Memory tier: LRU of float32 arrays, bounded by total bytes
+    - Disk tier (optional): one WAV file per utterance in cache_dir, bounded
+      by total bytes with least-recently-used files removed first
+
+    Keys are hashes of (normalized text, voice, speed, model) so entries
+    survive restarts and never collide across voices or models.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, cache_dir: Optional[str] = None, max_disk_bytes: int = 256 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.cache_dir = cache_dir
+        self.max_disk_bytes = max_disk_bytes
+        self._mem: "OrderedDict[str, Tuple[np.ndarray, int]]" = OrderedDict()
+        self._mem_bytes = 0
+        self._disk: "OrderedDict[str, int]" = OrderedDict()  # key -> file size, oldest first
+        self._disk_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        if self.cache_dir and self.max_disk_bytes > 0:
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                files = []
+                for name in os.listdir(self.cache_dir):
+                    if name.endswith(".wav"):
+                        path = os.path.join(self.cache_dir, name)
+                        st = os.stat(path)
+                        files.append((st.st_mtime, name[:-4], st.st_size))
+                for _, key, size in sorted(files):
+                    self._disk[key] = size
+                    self._disk_bytes += size
+                self._trim_disk()
+            except Exception as e:
+                logger.warning("Audio disk cache disabled: %s", e)
+                self.cache_dir = None
+
+    @staticmethod
+    def make_key(text: str, voice: Optional[str], speed: float, model: Optional[str]) -> str:
+        raw = f"{model}|{voice}|{float(speed):.3f}|{normalize_text(text)}"
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + ".wav")
+
+    def _put_mem(self, key: str, audio: np.ndarray, sr: int):
+        if key in self._mem:
+            self._mem_bytes -= self._mem[key][0].nbytes
+        self._mem[key] = (audio, sr)
+        self._mem.move_to_end(key)
+        self._mem_bytes += audio.nbytes
+        while self._mem and self._mem_bytes > self.max_bytes:
+            _, (old, _) = self._mem.popitem(last=False)
+            self._mem_bytes -= old.nbytes
+
+    def _trim_disk(self):
+        while self._disk and self._disk_bytes > self.max_disk_bytes:
+            old, size = self._disk.popitem(last=False)
+            self._disk_bytes -= size
+            try:
+                os.remove(self._path(old))
+            except OSError:
+                pass
+
+    def get(self, key: str) -> Optional[Tuple[np.ndarray, int]]:
+        with self._lock:
+            hit = self._mem.get(key)
+            if hit is not None:
+                self._mem.move_to_end(key)
+                self.hits += 1
+                return hit
+            on_disk = self.cache_dir is not None and key in self._disk
+        if on_disk:
+            try:
+                audio, sr = sf.read(self._path(key), dtype="float32")
+                with self._lock:
+                    self._disk.move_to_end(key)
+                    self._put_mem(key, audio, sr)
+                    self.disk_hits += 1
+                # Refresh mtime so disk LRU order survives restarts
+                os.utime(self._path(key), None)
+                return audio, sr
+            except Exception as e:
+                logger.debug("Audio cache read failed for %s: %s", key, e)
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, audio: np.ndarray, sr: int):
+        audio = np.ascontiguousarray(audio, dtype=np.float32)
+        with self._lock:
+            self._put_mem(key, audio, sr)
+            if self.cache_dir is None or key in self._disk:
+                return
+        try:
+            path = self._path(key)
+            tmp = path + ".tmp"
+            sf.write(tmp, audio, sr, subtype="FLOAT", format="WAV")
+            os.replace(tmp, path)
+            size = os.path.getsize(path)
+            with self._lock:
+                self._disk[key] = size
+                self._disk_bytes += size
+                self._trim_disk()
+        except Exception as e:
+            logger.debug("Audio cache write failed: %s", e)
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            total = self.hits + self.disk_hits + self.misses
+            return {
+                "entries": len(self._mem),
+                "bytes": self._mem_bytes,
+                "disk_entries": len(self._disk),
+                "disk_bytes": self._disk_bytes,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round((self.hits + self.disk_hits) / total, 3) if total else 0.0,
+            }
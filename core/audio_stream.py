@@ -0,0 +1,173 @@
+import asyncio
+import logging
+import struct
+import threading
+from collections import deque
+from typing import Deque, List, Optional
+
+import numpy as np
+
+from .metrics import METRICS
+
+logger = logging.getLogger("audio_stream")
+
+AUDIO_CHUNKS_DROPPED = METRICS.counter(
+    "assistive_audio_chunks_dropped_total", "Streamed audio chunks dropped for slow listeners", ("pipeline",)
+)
+
+
+def to_pcm16(audio: np.ndarray, sr: int, rate: int) -> bytes:
+    """Mono float audio at `sr` -> little-endian int16 PCM at `rate`."""
+    audio = np.asarray(audio, dtype=np.float32)
+    if audio.ndim > 1:
+        audio = audio.mean(axis=1)
+    if sr != rate and len(audio):
+        n = max(1, int(round(len(audio) * rate / sr)))
+        audio = np.interp(np.linspace(0, len(audio) - 1, n), np.arange(len(audio)), audio).astype(np.float32)
+    return (np.clip(audio, -1.0, 1.0) * 32767).astype("<i2").tobytes()
+
+
+def wav_header(rate: int, channels: int = 1, bits: int = 16) -> bytes:
+    """RIFF/WAVE header with 'unknown' sizes, for an open-ended stream."""
+    block = channels * bits // 8
+    return (
+        b"RIFF" + struct.pack("<I", 0xFFFFFFFF) + b"WAVE"
+        + b"fmt " + struct.pack("<IHHIIHH", 16, 1, channels, rate, rate * block, block, bits)
+        + b"data" + struct.pack("<I", 0xFFFFFFFF)
+    )
+
+
+class AudioListener:
+    """One connected client: a bounded buffer of PCM chunks, oldest dropped first."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.chunks: Deque[bytes] = deque()
+        self.ready = asyncio.Event()
+        self.dropped = 0
+        # Set when the stream format changed; the client has to reconnect
+        self.closed = False
+        self._lock = threading.Lock()
+
+    def _offer(self, chunks: List[bytes], max_chunks: int) -> int:
+        """
+        Queue a whole utterance. It always fits: the limit is stretched to its
+        length, and the older backlog is dropped first.
+        """
+        with self._lock:
+            overflow = len(self.chunks) + len(chunks) - max(max_chunks, len(chunks))
+            dropped = max(0, min(overflow, len(self.chunks)))
+            for _ in range(dropped):
+                self.chunks.popleft()
+            self.chunks.extend(chunks)
+            self.dropped += dropped
+        self.loop.call_soon_threadsafe(self.ready.set)
+        return dropped
+
+    def close(self):
+        self.closed = True
+        self.loop.call_soon_threadsafe(self.ready.set)
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[bytes]:
+        """Next chunk, or None if nothing arrived within `timeout` or the listener was closed."""
+        while not self.closed:
+            chunk = self.get_nowait()
+            if chunk is not None:
+                return chunk
+            self.ready.clear()
+            if self.chunks or self.closed:
+                continue
+            try:
+                await asyncio.wait_for(self.ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                return None
+        return None
+
+    def get_nowait(self) -> Optional[bytes]:
+        with self._lock:
+            return self.chunks.popleft() if self.chunks else None
+
+
+class AudioBroadcaster:
+    """
+    Fans synthesized speech out to listeners on their own devices
+    (/api/audio/ws, /api/audio/stream).
+
+    The TTS engine publishes each utterance (or sentence, when streaming) as
+    soon as it is synthesized. Audio is converted once to mono int16 PCM at a
+    fixed rate and cut into `chunk_ms` chunks, and every listener gets its
+    own deque of about `buffer_seconds` worth of chunks (stretched to fit an
+    utterance longer than that). publish() never waits on a client: a
+    listener that can't keep up loses its oldest audio, which also caps how
+    far behind the room it can fall.
+    """
+
+    def __init__(self, name: str = "default", sample_rate: int = 22050, chunk_ms: int = 100, buffer_seconds: float = 15.0):
+        self.name = name
+        self.chunk_ms = int(chunk_ms)
+        self._listeners: List[AudioListener] = []
+        self._lock = threading.Lock()
+        self.sample_rate = 0
+        self.configure(sample_rate, buffer_seconds)
+
+    def configure(self, sample_rate: int, buffer_seconds: float):
+        """
+        Apply new settings. A buffer change applies to connected listeners;
+        a sample rate change disconnects them so they reconnect in the new
+        format.
+        """
+        sample_rate = int(sample_rate)
+        self.max_chunks = max(1, int(buffer_seconds * 1000 / self.chunk_ms))
+        if sample_rate == self.sample_rate:
+            return
+        self.sample_rate = sample_rate
+        self.chunk_bytes = max(2, self.sample_rate * self.chunk_ms // 1000 * 2)
+        with self._lock:
+            listeners, self._listeners = self._listeners, []
+        for listener in listeners:
+            try:
+                listener.close()
+            except RuntimeError:
+                pass  # its event loop is already gone
+
+    def subscribe(self) -> AudioListener:
+        """Register a listener; must be called from within the event loop."""
+        listener = AudioListener(asyncio.get_running_loop())
+        with self._lock:
+            self._listeners.append(listener)
+        return listener
+
+    def unsubscribe(self, listener: AudioListener):
+        with self._lock:
+            self._listeners = [l for l in self._listeners if l is not listener]
+
+    @property
+    def listeners(self) -> int:
+        return len(self._listeners)
+
+    def publish(self, audio: np.ndarray, sr: int):
+        """Called from TTS threads with float audio; a no-op while nobody is listening."""
+        listeners = self._listeners
+        if not listeners:
+            return
+        pcm = to_pcm16(audio, sr, self.sample_rate)
+        chunks = [pcm[i:i + self.chunk_bytes] for i in range(0, len(pcm), self.chunk_bytes)]
+        dropped = 0
+        for listener in listeners:
+            try:
+                dropped += listener._offer(chunks, self.max_chunks)
+            except RuntimeError:
+                # Event loop already closed; the endpoint unsubscribes on its way out
+                continue
+        if dropped:
+            AUDIO_CHUNKS_DROPPED.inc(dropped, pipeline=self.name)
+
+    def silence(self) -> bytes:
+        return bytes(self.chunk_bytes)
+
+    def stats(self) -> dict:
+        return {
+            "listeners": self.listeners,
+            "sample_rate": self.sample_rate,
+            "dropped": sum(l.dropped for l in self._listeners),
+        }
@@ -0,0 +1,163 @@
+import logging
+from typing import List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from .segmentation import Box, detect_text_lines
+
+logger = logging.getLogger("board")
+
+# Width of the downscaled frame used for board detection and motion checks
+_PROBE_W = 640
+_MOTION_W = 160
+
+
+def order_corners(pts: np.ndarray) -> np.ndarray:
+    """Order four points as top-left, top-right, bottom-right, bottom-left."""
+    pts = pts.reshape(4, 2).astype(np.float32)
+    s = pts.sum(axis=1)
+    d = np.diff(pts, axis=1).ravel()
+    return np.array([pts[np.argmin(s)], pts[np.argmin(d)], pts[np.argmax(s)], pts[np.argmax(d)]], dtype=np.float32)
+
+
+def find_board_quad(gray: np.ndarray, min_area: float = 0.2) -> Optional[np.ndarray]:
+    """
+    Largest convex quadrilateral covering at least min_area of the image
+    (board edge, slide border, projector screen), in image coordinates.
+    """
+    h, w = gray.shape[:2]
+    scale = _PROBE_W / float(w) if w > _PROBE_W else 1.0
+    small = cv2.resize(gray, (int(w * scale), int(h * scale)), interpolation=cv2.INTER_AREA) if scale < 1.0 else gray
+    edges = cv2.Canny(cv2.GaussianBlur(small, (5, 5), 0), 50, 150)
+    # Close small gaps in the frame edge so it forms one contour
+    edges = cv2.dilate(edges, cv2.getStructuringElement(cv2.MORPH_RECT, (3, 3)))
+    contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    min_px = min_area * small.shape[0] * small.shape[1]
+    for c in sorted(contours, key=cv2.contourArea, reverse=True)[:5]:
+        hull = cv2.convexHull(c)
+        if cv2.contourArea(hull) < min_px:
+            break
+        approx = cv2.approxPolyDP(hull, 0.02 * cv2.arcLength(hull, True), True)
+        if len(approx) == 4 and cv2.isContourConvex(approx):
+            return order_corners(approx / scale)
+    return None
+
+
+class BoardRectifier:
+    """
+    Finds the board in the frame and warps it to a fronto-parallel image in
+    which text lines are about `board_text_height` pixels tall.
+
+    Detection (edges + contour fit + a text-height probe) is only done when
+    needed; the homography is cached and every other frame costs a single
+    warpPerspective. The cached board is re-detected when the camera moves
+    (global shift measured by phase correlation on a thumbnail), when the
+    frame size changes, or every `board_redetect_every` frames. If no board
+    is found, rectify() returns None and the caller uses the whole frame.
+    """
+
+    def __init__(self, cfg: dict):
+        self.min_area = float(cfg.get("board_min_area", 0.2))
+        self.text_height = float(cfg.get("board_text_height", 32))
+        self.max_width = int(cfg.get("board_max_width", 1920))
+        # Camera shift (in % of frame width) that invalidates the homography
+        self.move_threshold = float(cfg.get("board_move_threshold", 1.0))
+        self.redetect_every = int(cfg.get("board_redetect_every", 300))
+        # Frames to wait before trying again after a failed detection
+        self.retry_every = int(cfg.get("board_retry_every", 15))
+        self.reset()
+
+    def reset(self):
+        self.quad: Optional[np.ndarray] = None
+        self.H: Optional[np.ndarray] = None
+        self.H_inv: Optional[np.ndarray] = None
+        self.out_size: Tuple[int, int] = (0, 0)
+        self._frame_shape = None
+        self._ref: Optional[np.ndarray] = None
+        self._window: Optional[np.ndarray] = None
+        self._since_detect = 0
+        self.detections = 0
+
+    def _thumb(self, gray: np.ndarray) -> np.ndarray:
+        h, w = gray.shape[:2]
+        small = cv2.resize(gray, (_MOTION_W, max(1, int(h * _MOTION_W / w))), interpolation=cv2.INTER_AREA)
+        return small.astype(np.float32)
+
+    def _camera_moved(self, gray: np.ndarray) -> bool:
+        thumb = self._thumb(gray)
+        if self._ref is None or self._ref.shape != thumb.shape:
+            return True
+        if self._window is None or self._window.shape != thumb.shape:
+            self._window = cv2.createHanningWindow((thumb.shape[1], thumb.shape[0]), cv2.CV_32F)
+        (dx, dy), _ = cv2.phaseCorrelate(self._ref, thumb, self._window)
+        return np.hypot(dx, dy) * 100.0 / _MOTION_W > self.move_threshold
+
+    def _detect(self, frame: np.ndarray, gray: np.ndarray):
+        self._since_detect = 0
+        self._frame_shape = frame.shape
+        self._ref = self._thumb(gray)
+        self.detections += 1
+        quad = find_board_quad(gray, self.min_area)
+        if quad is None:
+            if self.quad is not None:
+                logger.info("Board lost; using the full frame")
+            self.quad, self.H, self.H_inv = None, None, None
+            return
+
+        tl, tr, br, bl = quad
+        bw = max(np.linalg.norm(tr - tl), np.linalg.norm(br - bl))
+        bh = max(np.linalg.norm(bl - tl), np.linalg.norm(br - tr))
+        # Probe the text size at native scale to pick the output scale
+        scale = 1.0
+        dst = np.float32([[0, 0], [bw, 0], [bw, bh], [0, bh]])
+        native = cv2.warpPerspective(gray, cv2.getPerspectiveTransform(quad, dst), (int(bw), int(bh)))
+        heights = [b[3] for b in detect_text_lines(native)]
+        if heights:
+            scale = float(np.clip(self.text_height / float(np.median(heights)), 0.5, 3.0))
+        scale = min(scale, self.max_width / bw)
+        out_w, out_h = max(1, int(bw * scale)), max(1, int(bh * scale))
+        dst = np.float32([[0, 0], [out_w, 0], [out_w, out_h], [0, out_h]])
+        self.quad = quad
+        self.H = cv2.getPerspectiveTransform(quad, dst)
+        self.H_inv = np.linalg.inv(self.H)
+        self.out_size = (out_w, out_h)
+        logger.info("Board detected: %dx%d -> %dx%d", int(bw), int(bh), out_w, out_h)
+
+    def rectify(self, frame: np.ndarray) -> Optional[np.ndarray]:
+        """Warped board image, or None if no board is known for this view."""
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if len(frame.shape) == 3 else frame
+        self._since_detect += 1
+        due = (
+            self._frame_shape != frame.shape
+            or (self.redetect_every > 0 and self._since_detect >= self.redetect_every)
+            or (self.quad is None and self._since_detect >= self.retry_every)
+        )
+        if due or self._camera_moved(gray):
+            self._detect(frame, gray)
+        if self.H is None:
+            return None
+        return cv2.warpPerspective(frame, self.H, self.out_size, flags=cv2.INTER_LINEAR)
+
+    def to_frame(self, boxes: List[Box]) -> List[Box]:
+        """Map boxes from the rectified image back to axis-aligned boxes in the frame."""
+        if self.H_inv is None or not boxes:
+            return boxes
+        corners = []
+        for x, y, w, h in boxes:
+            corners += [(x, y), (x + w, y), (x + w, y + h), (x, y + h)]
+        pts = cv2.perspectiveTransform(np.float32(corners).reshape(-1, 1, 2), self.H_inv).reshape(-1, 4, 2)
+        out = []
+        for quad in pts:
+            x0, y0 = quad.min(axis=0)
+            x1, y1 = quad.max(axis=0)
+            out.append((int(x0), int(y0), int(x1 - x0), int(y1 - y0)))
+        return out
+
+    def stats(self) -> dict:
+        return {
+            "detected": self.quad is not None,
+            "quad": self.quad.astype(int).tolist() if self.quad is not None else None,
+            "size": list(self.out_size) if self.quad is not None else None,
+            "detections": self.detections,
+        }
@@ -7,14 +7,26 @@ DEFAULT_CONFIG = {
     "camera": {
         "source_type": "opencv",
         "camera_id": 0,
-        "resolution": "720p"  # 720p for speed (2x faster than 1080p)
+        "resolution": "720p",  # 720p for speed (2x faster than 1080p); "480p" for slow USB links
+        "fourcc": "MJPG",  # Requested camera pixel format; MJPG lets USB cams deliver 1080p at full rate
+        "preview_fps": 5.0,  # Cap for the /api/preview MJPEG stream
+        "source_path": "",  # video file (source_type "video") or image folder ("images")
+        "replay_speed": 1.0,  # 1.0 = real time, 0 = as fast as possible
+        "images_fps": 1.0,  # Frame rate assigned to an image folder
+        "loop": False
     },
     "ocr": {
         "engine": "tesseract",
         "language": "eng",
         "capture_interval": 0.05,  # Ultra-fast: 20 FPS processing for instant detection
         "min_confidence": 0.4,  # Lower threshold for faster detection
-        "min_text_len": 2  # Allow shorter text for faster detection
+        "min_text_len": 2,  # Allow shorter text for faster detection
+        "change_detection": True,  # Skip OCR while the board is unchanged
+        "change_min_blocks": 3,  # Changed blocks (of a 160x90 grid) that trigger OCR
+        "change_pixel_delta": 16,  # Per-block intensity delta counted as a change
+        "change_persist_frames": 1,  # Frames a change must last before it is OCR'd
+        "board_detection": True,  # Find the board and OCR a rectified view of it
+        "board_text_height": 32  # Target text line height (px) in the rectified board
     },
     "tts": {
         "engine": "coqui",         # coqui or espeak
@@ -26,7 +38,12 @@ DEFAULT_CONFIG = {
     "app": {
         "high_contrast": False,
         "font_size": "16px",
-        "max_history": 50
+        "max_history": 50,  # Entries kept in memory / shown on the dashboard
+        "transcript_db": "transcripts.db",  # SQLite file with the full transcript ("" = memory only)
+        "lazy_load": True,  # Serve immediately, load heavy OCR/TTS models in the background
+        "warmup_inference": True,  # One dummy inference per model before it is used
+        "ocr_slots": 2,  # Concurrent OCR inferences shared fairly across all pipelines
+        "tts_slots": 1  # Concurrent TTS syntheses shared fairly across all pipelines
     }
 }
 
@@ -0,0 +1,207 @@
+import ctypes
+import ctypes.util
+import logging
+import shutil
+import struct
+import subprocess
+import threading
+import time
+from typing import Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger("espeak_backend")
+
+# speak_lib.h
+_AUDIO_OUTPUT_SYNCHRONOUS = 2
+_POS_CHARACTER = 1
+_CHARS_UTF8 = 1
+_RATE, _VOLUME = 1, 2
+_EE_OK = 0
+
+_SYNTH_CALLBACK = ctypes.CFUNCTYPE(ctypes.c_int, ctypes.POINTER(ctypes.c_short), ctypes.c_int, ctypes.c_void_p)
+
+
+class EspeakBackend:
+    """
+    espeak-ng that returns PCM instead of playing it.
+
+    Preferably libespeak-ng loaded once in-process through ctypes, in
+    synchronous mode: espeak_Synth() returns when the utterance is done and
+    the samples arrive through the synth callback, so there is no process
+    spawn, voice reload or audio device open per utterance. The library is
+    a single global synthesizer, so calls are serialized with a lock.
+
+    Without the shared library it falls back to `espeak-ng --stdout` and
+    reads the WAV from the pipe, which still avoids the sound device. Those
+    processes are independent, so they run concurrently and are killed when
+    the caller's cancel flag is set.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._lib = None
+        self._callback = None  # keep a reference, ctypes doesn't
+        self._buf = []
+        self._cancel: Optional[threading.Event] = None  # caller's flag for the synthesis in progress
+        self._voice: Optional[str] = None
+        self.sample_rate = 22050
+        self.binary = shutil.which("espeak-ng") or shutil.which("espeak")
+        self.mode = "unavailable"
+        try:
+            self._load_library()
+        except Exception as e:
+            logger.info("libespeak-ng not usable (%s)", e)
+        if self._lib is not None:
+            self.mode = "library"
+        elif self.binary:
+            self.mode = "process"
+        logger.info("espeak backend: %s", self.mode)
+
+    def _load_library(self):
+        name = ctypes.util.find_library("espeak-ng")
+        if not name:
+            return
+        lib = ctypes.CDLL(name)
+        lib.espeak_Initialize.restype = ctypes.c_int
+        lib.espeak_Initialize.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.c_char_p, ctypes.c_int]
+        lib.espeak_SetSynthCallback.argtypes = [_SYNTH_CALLBACK]
+        lib.espeak_SetParameter.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.c_int]
+        lib.espeak_SetVoiceByName.restype = ctypes.c_int
+        lib.espeak_SetVoiceByName.argtypes = [ctypes.c_char_p]
+        lib.espeak_Synth.restype = ctypes.c_int
+        lib.espeak_Synth.argtypes = [
+            ctypes.c_void_p, ctypes.c_size_t, ctypes.c_uint, ctypes.c_int,
+            ctypes.c_uint, ctypes.c_uint, ctypes.c_void_p, ctypes.c_void_p,
+        ]
+        rate = lib.espeak_Initialize(_AUDIO_OUTPUT_SYNCHRONOUS, 0, None, 0)
+        if rate <= 0:
+            raise RuntimeError("espeak_Initialize failed")
+        self.sample_rate = rate
+        self._callback = _SYNTH_CALLBACK(self._on_samples)
+        lib.espeak_SetSynthCallback(self._callback)
+        self._lib = lib
+
+    def _on_samples(self, wav, numsamples, events) -> int:
+        if wav and numsamples > 0:
+            self._buf.append(ctypes.string_at(wav, numsamples * 2))
+        return 1 if self._cancel is not None and self._cancel.is_set() else 0
+
+    @property
+    def available(self) -> bool:
+        return self.mode != "unavailable"
+
+    def synthesize(
+        self,
+        text: str,
+        speed: float = 1.0,
+        volume: float = 0.9,
+        voice: Optional[str] = None,
+        cancel: Optional[threading.Event] = None,
+    ) -> Optional[Tuple[np.ndarray, int]]:
+        """
+        (float32 mono audio, sample rate), or None if espeak is unavailable or
+        failed. Setting `cancel` aborts in-process synthesis early.
+        """
+        if not text or not self.available:
+            return None
+        wpm = max(80, int(150 * speed))
+        amplitude = max(0, min(200, int(100 * volume)))
+        if self._lib is None:
+            return self._synth_process(text, wpm, amplitude, voice, cancel)
+        with self._lock:
+            self._cancel = cancel
+            try:
+                return self._synth_library(text, wpm, amplitude, voice)
+            finally:
+                self._cancel = None
+
+    def _synth_library(self, text: str, wpm: int, amplitude: int, voice: Optional[str]):
+        lib = self._lib
+        if voice != self._voice:
+            # Coqui speaker ids (e.g. "p335") aren't espeak voices; keep the default then
+            if voice and lib.espeak_SetVoiceByName(voice.encode()) != _EE_OK:
+                lib.espeak_SetVoiceByName(b"en")
+            self._voice = voice
+        lib.espeak_SetParameter(_RATE, wpm, 0)
+        lib.espeak_SetParameter(_VOLUME, amplitude, 0)
+        data = text.encode("utf-8") + b"\0"
+        self._buf = []
+        err = lib.espeak_Synth(data, len(data), 0, _POS_CHARACTER, 0, _CHARS_UTF8, None, None)
+        pcm, self._buf = b"".join(self._buf), []
+        if err != _EE_OK:
+            logger.warning("espeak_Synth failed (%d)", err)
+            return None
+        audio = np.frombuffer(pcm, dtype="<i2").astype(np.float32) / 32768.0
+        return audio, self.sample_rate
+
+    def _synth_process(self, text: str, wpm: int, amplitude: int, voice: Optional[str], cancel: Optional[threading.Event]):
+        base = [self.binary, "--stdout", f"-s{wpm}", f"-a{amplitude}"]
+        attempts = [base + ["-v", voice, text], base + [text]] if voice else [base + [text]]
+        for cmd in attempts:
+            try:
+                proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+            except OSError as e:
+                logger.warning("espeak-ng failed: %s", e)
+                return None
+            stdout = self._wait_process(proc, cancel, timeout=60)
+            if stdout is None:
+                return None
+            if proc.returncode == 0:
+                out = _parse_wav(stdout)
+                if out is not None:
+                    return out
+        return None
+
+    @staticmethod
+    def _wait_process(proc: subprocess.Popen, cancel: Optional[threading.Event], timeout: float) -> Optional[bytes]:
+        """Output of `proc`, or None after killing it on cancel or timeout."""
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                stdout, _ = proc.communicate(timeout=0.05)
+                return stdout
+            except subprocess.TimeoutExpired:
+                pass
+            timed_out = time.monotonic() > deadline
+            if timed_out or (cancel is not None and cancel.is_set()):
+                if timed_out:
+                    logger.warning("espeak-ng timed out")
+                proc.kill()
+                proc.communicate()
+                return None
+
+
+def _parse_wav(data: bytes) -> Optional[Tuple[np.ndarray, int]]:
+    """
+    16-bit mono WAV from a pipe. Parsed by hand because espeak can't seek
+    back to fill in the sizes and writes placeholders instead.
+    """
+    if len(data) < 44 or data[:4] != b"RIFF" or data[8:12] != b"WAVE":
+        return None
+    pos, sr = 12, None
+    while pos + 8 <= len(data):
+        tag, size = data[pos:pos + 4], struct.unpack("<I", data[pos + 4:pos + 8])[0]
+        if tag == b"fmt ":
+            sr = struct.unpack("<I", data[pos + 12:pos + 16])[0]
+        elif tag == b"data":
+            pcm = data[pos + 8:]
+            pcm = pcm[:len(pcm) // 2 * 2]
+            if sr is None or not pcm:
+                return None
+            return np.frombuffer(pcm, dtype="<i2").astype(np.float32) / 32768.0, sr
+        pos += 8 + size
+    return None
+
+
+_BACKEND: Optional[EspeakBackend] = None
+_BACKEND_LOCK = threading.Lock()
+
+
+def get_backend() -> EspeakBackend:
+    """The process-wide espeak backend, created on first use."""
+    global _BACKEND
+    with _BACKEND_LOCK:
+        if _BACKEND is None:
+            _BACKEND = EspeakBackend()
+        return _BACKEND
@@ -0,0 +1,56 @@
+import asyncio
+import logging
+import threading
+from typing import Any, Dict, List, Tuple
+
+logger = logging.getLogger("events")
+
+
+class EventBroadcaster:
+    """
+    Fan-out of pipeline events (transcript entries, status deltas) to
+    connected dashboards.
+
+    publish() is called from pipeline threads; each subscriber owns a bounded
+    asyncio.Queue on the server's event loop and items are handed over with
+    call_soon_threadsafe, so the pipeline never blocks on a slow client. When
+    a client falls behind, its oldest undelivered event is dropped.
+    """
+
+    def __init__(self, max_queue: int = 100):
+        self.max_queue = max_queue
+        self._subscribers: List[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]] = []
+        self._lock = threading.Lock()
+
+    def subscribe(self) -> asyncio.Queue:
+        """Register a subscriber; must be called from within the event loop."""
+        q: asyncio.Queue = asyncio.Queue(maxsize=self.max_queue)
+        with self._lock:
+            self._subscribers.append((asyncio.get_running_loop(), q))
+        return q
+
+    def unsubscribe(self, q: asyncio.Queue):
+        with self._lock:
+            self._subscribers = [(loop, sub) for loop, sub in self._subscribers if sub is not q]
+
+    def has_subscribers(self) -> bool:
+        return bool(self._subscribers)
+
+    @staticmethod
+    def _offer(q: asyncio.Queue, item):
+        if q.full():
+            try:
+                q.get_nowait()
+            except asyncio.QueueEmpty:
+                pass
+        q.put_nowait(item)
+
+    def publish(self, event: str, data: Dict[str, Any]):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for loop, q in subscribers:
+            try:
+                loop.call_soon_threadsafe(self._offer, q, (event, data))
+            except RuntimeError:
+                # Event loop already closed (server shutting down)
+                self.unsubscribe(q)
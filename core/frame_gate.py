@@ -0,0 +1,69 @@
+import logging
+from typing import Optional
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger("frame_gate")
+
+
+class FrameChangeDetector:
+    """
+    Cheap block-wise change detector that sits between capture and OCR.
+
+    Every frame is shrunk to a small grayscale grid (one pixel per block) and
+    compared with the last frame that was let through. A frame only passes when
+    at least `min_blocks` blocks changed, for `persist_frames` frames in a row,
+    so a static board costs one tiny resize per frame instead of a full OCR run.
+    """
+
+    def __init__(self, cfg: dict):
+        self.enabled = bool(cfg.get("change_detection", True))
+        # Grid size (cols x rows); each cell is the mean of one block of the frame.
+        # 160x90 is an 8x8 block on 720p, fine enough that rewriting a single
+        # digit moves several cells by ~100 grey levels
+        self.grid_w = int(cfg.get("change_grid_w", 160))
+        self.grid_h = int(cfg.get("change_grid_h", 90))
+        # Per-block intensity delta (0-255) that counts as "changed"
+        self.pixel_delta = float(cfg.get("change_pixel_delta", 16))
+        # Changed blocks needed to re-OCR; an absolute count, so a one-character
+        # correction counts the same on any board size
+        self.min_blocks = max(1, int(cfg.get("change_min_blocks", 3)))
+        # Consecutive changed frames needed, for cameras whose noise trips single frames
+        self.persist_frames = max(1, int(cfg.get("change_persist_frames", 1)))
+        self._reference: Optional[np.ndarray] = None
+        self._streak = 0
+
+    def _signature(self, frame: np.ndarray) -> np.ndarray:
+        if len(frame.shape) == 3:
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        else:
+            gray = frame
+        # INTER_AREA averages each block, which also suppresses sensor noise
+        small = cv2.resize(gray, (self.grid_w, self.grid_h), interpolation=cv2.INTER_AREA)
+        return small.astype(np.int16)
+
+    def should_process(self, frame: np.ndarray) -> bool:
+        """
+        Return True if the frame changed enough to be worth OCR'ing.
+        The reference only moves forward on accepted frames, so slow drift
+        (e.g. a line being written stroke by stroke) still accumulates.
+        """
+        if not self.enabled or frame is None or frame.size == 0:
+            return True
+        sig = self._signature(frame)
+        if self._reference is not None and self._reference.shape == sig.shape:
+            diff = np.abs(sig - self._reference) > self.pixel_delta
+            if np.count_nonzero(diff) < self.min_blocks:
+                self._streak = 0
+                return False
+            self._streak += 1
+            if self._streak < self.persist_frames:
+                return False
+        self._streak = 0
+        self._reference = sig
+        return True
+
+    def reset(self):
+        self._reference = None
+        self._streak = 0
@@ -0,0 +1,103 @@
+import logging
+import threading
+import time
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger("frame_hub")
+
+
+class FrameHub:
+    """
+    Latest decoded frame from the capture thread, shared with everything else
+    that wants to look at the camera (preview stream, camera/OCR tests).
+
+    The capture loop decodes every frame into a fresh array and never touches
+    it again after publish(), so consumers get a read-only view of the same
+    memory instead of a copy, and nobody has to open the device a second time.
+
+    JPEG encoding for the preview is shared: the first viewer to ask for a
+    new frame encodes it, every other viewer reuses those bytes, and encoding
+    is capped at `preview_fps` no matter how many viewers are connected.
+    """
+
+    def __init__(self, preview_fps: float = 5.0, preview_width: int = 960, jpeg_quality: int = 70):
+        self.configure(preview_fps, preview_width, jpeg_quality)
+        self._cond = threading.Condition()
+        self._frame: Optional[np.ndarray] = None
+        self._seq = 0
+        self._ts = 0.0
+        self._published = 0.0  # monotonic time of the last publish
+        self._encode_lock = threading.Lock()
+        self._jpeg: Optional[bytes] = None
+        self._jpeg_seq = -1
+        self._jpeg_time = 0.0
+        self.viewers = 0
+
+    def configure(self, preview_fps: float, preview_width: int, jpeg_quality: int):
+        """Preview settings; take effect from the next encoded frame."""
+        self.preview_interval = 1.0 / max(0.1, float(preview_fps))
+        self.preview_width = int(preview_width)
+        self.jpeg_quality = int(jpeg_quality)
+
+    @property
+    def seq(self) -> int:
+        return self._seq
+
+    def publish(self, frame: np.ndarray, ts: Optional[float] = None):
+        """Called by the capture thread; the frame must not be modified afterwards."""
+        with self._cond:
+            self._frame = frame
+            self._seq += 1
+            self._ts = ts if ts is not None else time.time()
+            self._published = time.monotonic()
+            self._cond.notify_all()
+
+    def wants_frame(self) -> bool:
+        """True when a preview viewer is waiting for a frame newer than the last one published."""
+        return self.viewers > 0 and time.monotonic() - self._published >= self.preview_interval
+
+    def snapshot(self, max_age: Optional[float] = None) -> Tuple[int, Optional[np.ndarray], float]:
+        """(seq, read-only view of the latest frame, capture timestamp); frame is None if none/too old."""
+        with self._cond:
+            frame, seq, ts = self._frame, self._seq, self._ts
+        if frame is None or (max_age is not None and time.time() - ts > max_age):
+            return seq, None, ts
+        view = frame.view()
+        view.flags.writeable = False
+        return seq, view, ts
+
+    def wait(self, after_seq: int, timeout: float = 1.0) -> int:
+        """Block until a frame newer than after_seq is published (or timeout); returns the current seq."""
+        with self._cond:
+            self._cond.wait_for(lambda: self._seq > after_seq, timeout=timeout)
+            return self._seq
+
+    def jpeg(self) -> Tuple[int, Optional[bytes]]:
+        """(seq, JPEG bytes) of the latest frame, re-encoded at most every preview interval."""
+        with self._encode_lock:
+            seq = self._seq
+            fresh = seq == self._jpeg_seq or time.monotonic() - self._jpeg_time < self.preview_interval
+            if self._jpeg is not None and fresh:
+                return self._jpeg_seq, self._jpeg
+            _, frame, _ = self.snapshot()
+            if frame is None:
+                return seq, None
+            h, w = frame.shape[:2]
+            if w > self.preview_width:
+                frame = cv2.resize(frame, (self.preview_width, int(h * self.preview_width / w)), interpolation=cv2.INTER_AREA)
+            ok, buf = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, self.jpeg_quality])
+            if not ok:
+                return seq, None
+            self._jpeg, self._jpeg_seq, self._jpeg_time = buf.tobytes(), seq, time.monotonic()
+            return seq, self._jpeg
+
+    def add_viewer(self):
+        with self._cond:
+            self.viewers += 1
+
+    def remove_viewer(self):
+        with self._cond:
+            self.viewers = max(0, self.viewers - 1)
@@ -0,0 +1,101 @@
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger("jobs")
+
+
+class JobManager:
+    """
+    Runs slow API work (speech, model reloads) off the event loop and tracks
+    it by job id so clients can poll /api/jobs/{id}.
+
+    Jobs in the same named lane run one at a time in submission order (two
+    /api/speak calls must not talk over each other, two config changes must
+    not reconfigure concurrently); jobs without a lane share a small pool.
+    Only the most recent `keep` jobs are remembered. `on_update` is called
+    with the job dict on every state change (used to push job events).
+    """
+
+    def __init__(self, max_workers: int = 2, keep: int = 100, on_update: Optional[Callable[[Dict[str, Any]], None]] = None):
+        self.keep = keep
+        self.on_update = on_update
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self._lanes: Dict[str, ThreadPoolExecutor] = {}
+        self._jobs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _executor(self, lane: Optional[str]) -> ThreadPoolExecutor:
+        if lane is None:
+            return self._pool
+        with self._lock:
+            ex = self._lanes.get(lane)
+            if ex is None:
+                ex = self._lanes[lane] = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"job-{lane}")
+            return ex
+
+    def _update(self, job: Dict[str, Any], **fields):
+        with self._lock:
+            job.update(fields)
+            snapshot = dict(job)
+        if self.on_update is not None:
+            try:
+                self.on_update(snapshot)
+            except Exception:
+                logger.debug("Job update callback failed", exc_info=True)
+
+    def submit(
+        self,
+        kind: str,
+        fn: Callable[..., Any],
+        *args,
+        lane: Optional[str] = None,
+        tags: Optional[Dict[str, Any]] = None,
+        **kwargs,
+    ) -> Dict[str, Any]:
+        """Queue fn(*args, **kwargs); `tags` are extra fields stored on the job (e.g. its pipeline)."""
+        job = {
+            "id": uuid.uuid4().hex[:12],
+            "kind": kind,
+            "status": "queued",
+            "created": time.time(),
+            "started": None,
+            "finished": None,
+            "result": None,
+            "error": None,
+        }
+        job.update(tags or {})
+        with self._lock:
+            self._jobs[job["id"]] = job
+            while len(self._jobs) > self.keep:
+                self._jobs.popitem(last=False)
+
+        def run():
+            self._update(job, status="running", started=time.time())
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                logger.exception("Job %s (%s) failed", job["id"], kind)
+                self._update(job, status="failed", error=str(e), finished=time.time())
+            else:
+                self._update(job, status="done", result=result, finished=time.time())
+
+        self._executor(lane).submit(run)
+        return dict(job)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job is not None else None
+
+    def recent(self, limit: int = 20) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [dict(j) for j in list(self._jobs.values())[-limit:]][::-1]
+
+    def shutdown(self):
+        for ex in [self._pool] + list(self._lanes.values()):
+            ex.shutdown(wait=False, cancel_futures=True)
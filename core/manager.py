@@ -0,0 +1,120 @@
+import copy
+import logging
+import os
+import re
+import threading
+from typing import Any, Dict, List, Optional
+
+from .config import Config
+from .metrics import METRICS
+from .model_registry import MODELS
+from .pipeline import AssistivePipeline
+from .scheduler import SCHEDULER
+
+logger = logging.getLogger("manager")
+
+DEFAULT_PIPELINE = "default"
+_NAME_RE = re.compile(r"^[a-z0-9][a-z0-9_-]{0,31}$")
+
+
+class PipelineManager:
+    """
+    Named pipelines (one per classroom) in a single server process.
+
+    "default" uses the main config.json; every other pipeline has its own
+    configs/<name>.json, seeded from the default config when created. All of
+    them share the process-wide model registry, so a model is loaded once
+    however many classrooms use it, and the fair-share scheduler, so OCR and
+    TTS capacity is split evenly between classrooms.
+    """
+
+    def __init__(self, default_config: Config, configs_dir: str):
+        self.configs_dir = configs_dir
+        self.pipelines: Dict[str, AssistivePipeline] = {}
+        self._lock = threading.Lock()
+        self.default_config = default_config
+        app_cfg = default_config.data["app"]
+        SCHEDULER.configure("ocr", int(app_cfg.get("ocr_slots", 2)))
+        SCHEDULER.configure("tts", int(app_cfg.get("tts_slots", 1)))
+        self.pipelines[DEFAULT_PIPELINE] = AssistivePipeline(default_config, name=DEFAULT_PIPELINE)
+        if os.path.isdir(configs_dir):
+            for fname in sorted(os.listdir(configs_dir)):
+                name, ext = os.path.splitext(fname)
+                if ext == ".json" and _NAME_RE.match(name) and name != DEFAULT_PIPELINE:
+                    try:
+                        self.pipelines[name] = AssistivePipeline(Config(os.path.join(configs_dir, fname)), name=name)
+                    except Exception as e:
+                        logger.error("Could not load pipeline %s: %s", name, e)
+
+    @staticmethod
+    def valid_name(name: Any) -> bool:
+        return isinstance(name, str) and bool(_NAME_RE.match(name))
+
+    def get(self, name: str) -> Optional[AssistivePipeline]:
+        return self.pipelines.get(name)
+
+    def create(self, name: str, overrides: Optional[Dict[str, Any]] = None) -> AssistivePipeline:
+        """New pipeline with the default config plus `overrides` (e.g. its own camera)."""
+        if not self.valid_name(name):
+            raise ValueError("pipeline name must be 1-32 chars of a-z, 0-9, '_' or '-'")
+        with self._lock:
+            if name in self.pipelines:
+                raise ValueError(f"pipeline '{name}' already exists")
+            data = copy.deepcopy(self.default_config.data)
+            # Per-classroom files, so pipelines never write to each other's transcript or cache
+            db = data["app"].get("transcript_db")
+            if db:
+                root, ext = os.path.splitext(db)
+                data["app"]["transcript_db"] = f"{root}-{name}{ext or '.db'}"
+            if data["tts"].get("audio_cache_dir"):
+                data["tts"]["audio_cache_dir"] = os.path.join(data["tts"]["audio_cache_dir"], name)
+            os.makedirs(self.configs_dir, exist_ok=True)
+            config = Config(os.path.join(self.configs_dir, f"{name}.json"))
+            config.update(data)
+            if overrides:
+                config.update(overrides)
+            pipeline = AssistivePipeline(config, name=name)
+            self.pipelines[name] = pipeline
+        logger.info("Pipeline %s created", name)
+        return pipeline
+
+    def remove(self, name: str):
+        if name == DEFAULT_PIPELINE:
+            raise ValueError("the default pipeline can't be removed")
+        with self._lock:
+            pipeline = self.pipelines.pop(name, None)
+        if pipeline is None:
+            raise KeyError(name)
+        pipeline.close()
+        pipeline.ocr.close()
+        # Its labelled series would otherwise be exported until the process restarts
+        METRICS.remove_series(pipeline=name)
+        try:
+            os.remove(pipeline.config.filepath)
+        except OSError:
+            pass
+        logger.info("Pipeline %s removed", name)
+
+    def summary(self) -> List[Dict[str, Any]]:
+        out = []
+        for name, pipeline in list(self.pipelines.items()):
+            cam = pipeline.cfg["camera"]
+            out.append({
+                "name": name,
+                "running": pipeline.running,
+                "source_type": cam.get("source_type"),
+                "source": cam.get("source_path") or cam.get("camera_id"),
+                "ready": pipeline.get_readiness()["ready"],
+            })
+        return out
+
+    def stats(self) -> Dict[str, Any]:
+        return {"models": [str(k) for k in MODELS.keys()], "scheduler": SCHEDULER.stats()}
+
+    def close_all(self):
+        for pipeline in list(self.pipelines.values()):
+            try:
+                pipeline.close()
+                pipeline.ocr.close()
+            except Exception as e:
+                logger.error("Closing pipeline %s failed: %s", pipeline.name, e)
@@ -0,0 +1,200 @@
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Sequence, Tuple
+
+# Seconds; spans a 5 ms gate check up to a multi-second TrOCR/Coqui call
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _label_key(labelnames: Sequence[str], labels: Dict[str, str]) -> Tuple[str, ...]:
+    return tuple(str(labels.get(name, "")) for name in labelnames)
+
+
+def _matches(labelnames: Sequence[str], key: Tuple[str, ...], labels: Dict[str, str]) -> bool:
+    """True if the series `key` has every label in `labels` (a subset of labelnames)."""
+    return all(str(labels[n]) == v for n, v in zip(labelnames, key) if n in labels)
+
+
+def _fmt_labels(labelnames: Sequence[str], key: Tuple[str, ...], extra: str = "") -> str:
+    parts = [f'{n}="{v}"' for n, v in zip(labelnames, key)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _fmt_value(v: float) -> str:
+    return repr(float(v)) if v != int(v) else str(int(v))
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        self.name, self.help, self.labelnames = name, help_text, tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = _label_key(self.labelnames, labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def remove_matching(self, **labels):
+        """Drop every series carrying these label values (e.g. pipeline="room-101")."""
+        with self._lock:
+            for key in [k for k in self._values if _matches(self.labelnames, k, labels)]:
+                del self._values[key]
+
+    def render(self) -> List[str]:
+        out = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, v in sorted(self._values.items()):
+                out.append(f"{self.name}{_fmt_labels(self.labelnames, key)} {_fmt_value(v)}")
+        return out
+
+
+class Gauge:
+    """Gauge set directly or computed at scrape time from a callback (e.g. queue depth)."""
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        self.name, self.help, self.labelnames = name, help_text, tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._functions: Dict[Tuple[str, ...], Callable[[], float]] = {}
+        self._lock = threading.Lock()
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[_label_key(self.labelnames, labels)] = value
+
+    def set_function(self, fn: Callable[[], float], **labels):
+        with self._lock:
+            self._functions[_label_key(self.labelnames, labels)] = fn
+
+    def remove(self, **labels):
+        key = _label_key(self.labelnames, labels)
+        with self._lock:
+            self._values.pop(key, None)
+            self._functions.pop(key, None)
+
+    def remove_matching(self, **labels):
+        with self._lock:
+            for store in (self._values, self._functions):
+                for key in [k for k in store if _matches(self.labelnames, k, labels)]:
+                    del store[key]
+
+    def render(self) -> List[str]:
+        out = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} gauge"]
+        with self._lock:
+            values = dict(self._values)
+            functions = dict(self._functions)
+        for key, fn in functions.items():
+            try:
+                values[key] = float(fn())
+            except Exception:
+                continue
+        for key, v in sorted(values.items()):
+            out.append(f"{self.name}{_fmt_labels(self.labelnames, key)} {_fmt_value(v)}")
+        return out
+
+
+class Histogram:
+    """Fixed-bucket histogram; observe() is a bisect plus three additions under a lock."""
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name, self.help, self.labelnames = name, help_text, tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[Tuple[str, ...], list] = {}  # key -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = _label_key(self.labelnames, labels)
+        idx = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * (len(self.buckets) + 1) + [0.0, 0]
+            series[idx] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def remove_matching(self, **labels):
+        with self._lock:
+            for key in [k for k in self._series if _matches(self.labelnames, k, labels)]:
+                del self._series[key]
+
+    @contextmanager
+    def time(self, **labels):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - t0, **labels)
+
+    def render(self) -> List[str]:
+        out = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = {k: list(v) for k, v in self._series.items()}
+        for key, s in sorted(series.items()):
+            cumulative = 0
+            for bound, n in zip(self.buckets, s):
+                cumulative += n
+                le = 'le="%s"' % bound
+                out.append(f"{self.name}_bucket{_fmt_labels(self.labelnames, key, le)} {cumulative}")
+            le = 'le="+Inf"'
+            labels = _fmt_labels(self.labelnames, key)
+            out.append(f"{self.name}_bucket{_fmt_labels(self.labelnames, key, le)} {s[-1]}")
+            out.append(f"{self.name}_sum{labels} {s[-2]!r}")
+            out.append(f"{self.name}_count{labels} {s[-1]}")
+        return out
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, cls, name: str, help_text: str, labelnames: Sequence[str], **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, help_text, labelnames, **kwargs)
+            return metric
+
+    def counter(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._get(Counter, name, help_text, labelnames)
+
+    def gauge(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._get(Gauge, name, help_text, labelnames)
+
+    def histogram(self, name: str, help_text: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._get(Histogram, name, help_text, labelnames, buckets=buckets)
+
+    def remove_series(self, **labels):
+        """
+        Forget all series with these label values in every metric that has
+        those labels, e.g. remove_series(pipeline=name) when a pipeline goes.
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            if set(labels) <= set(metric.labelnames):
+                metric.remove_matching(**labels)
+
+    def render(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+METRICS = MetricsRegistry()
+
+# Metrics shared across modules
+FRAMES = METRICS.counter("assistive_frames_total", "Frames by outcome (grabbed, captured, dropped, skipped, ocr)", ("pipeline", "outcome"))
+STAGE_SECONDS = METRICS.histogram("assistive_stage_seconds", "Latency of pipeline stages", ("pipeline", "stage"))
+OCR_BACKEND_SECONDS = METRICS.histogram("assistive_ocr_backend_seconds", "Latency of individual OCR backend calls", ("engine",))
+TTS_SECONDS = METRICS.histogram("assistive_tts_seconds", "TTS synthesis and playback latency", ("phase", "engine"))
+QUEUE_DEPTH = METRICS.gauge("assistive_queue_depth", "Items waiting in pipeline queues", ("pipeline", "queue"))
@@ -0,0 +1,57 @@
+import logging
+import threading
+from typing import Any, Callable, Dict, Hashable, List
+
+logger = logging.getLogger("model_registry")
+
+
+class ModelRegistry:
+    """
+    Process-wide store of loaded models keyed by everything that affects them
+    (e.g. ("paddle", "en") or ("coqui", model_name)).
+
+    Engines fetch models through get_or_load, so rebuilding an OCREngine or
+    TTSEngine after a config change - or running a second pipeline - reuses
+    what is already in memory instead of loading it again. Concurrent loads of
+    the same key wait for the first one.
+
+    Shared models are not assumed to be thread-safe: callers run inference
+    under inference_lock(model), so two pipelines never drive the same model
+    object at once (different models still run in parallel).
+    """
+
+    def __init__(self):
+        self._models: Dict[Hashable, Any] = {}
+        self._key_locks: Dict[Hashable, threading.Lock] = {}
+        self._infer_locks: Dict[int, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            if key in self._models:
+                return self._models[key]
+            model = loader()
+            if model is not None:
+                self._models[key] = model
+                logger.info("Model registered: %s", key)
+            return model
+
+    def inference_lock(self, model: Any) -> threading.Lock:
+        with self._lock:
+            return self._infer_locks.setdefault(id(model), threading.Lock())
+
+    def is_loaded(self, key: Hashable) -> bool:
+        return key in self._models
+
+    def evict(self, key: Hashable):
+        with self._lock:
+            self._models.pop(key, None)
+
+    def keys(self) -> List[Hashable]:
+        return list(self._models)
+
+
+# Shared by every pipeline in this process
+MODELS = ModelRegistry()
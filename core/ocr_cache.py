@@ -0,0 +1,134 @@
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger("ocr_cache")
+
+
+def image_fingerprint(img: np.ndarray, size: int = 64) -> int:
+    """
+    Two-sided difference hash of an image as a 2*size*size-bit integer.
+
+    For each cell of the downscaled image one bit says "clearly brighter than
+    its right neighbour" and one says "clearly darker". That survives exposure
+    drift, JPEG noise and small resizes but flips as soon as strokes are added
+    or removed. The margin keeps flat (blank board) cells from flickering.
+    """
+    if len(img.shape) == 3:
+        img = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    small = cv2.resize(img, (size + 1, size), interpolation=cv2.INTER_AREA).astype(np.int16)
+    diff = small[:, 1:] - small[:, :-1]
+    bits = np.concatenate([(diff > 2).ravel(), (diff < -2).ravel()])
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+def image_thumbnail(img: np.ndarray, width: int = 320) -> np.ndarray:
+    """
+    Grayscale thumbnail a cache hit is confirmed against. At 320 px across a
+    720p board, a single changed digit still differs in dozens of pixels,
+    which the 64-cell fingerprint can't resolve.
+    """
+    if len(img.shape) == 3:
+        img = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    height = max(1, int(round(img.shape[0] * width / float(img.shape[1]))))
+    return cv2.resize(img, (width, height), interpolation=cv2.INTER_AREA)
+
+
+class OCRCache:
+    """
+    Bounded LRU cache of OCR results keyed by image fingerprint.
+
+    The fingerprint only finds candidates. A hit is confirmed against the
+    stored thumbnail: no more than `verify_pixels` thumbnail pixels may
+    differ by more than `verify_delta` grey levels, so a board where one
+    character was rewritten is read again. Exact fingerprints are required
+    by default; max_distance > 0 also considers entries a few flipped bits
+    away.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        max_bytes: int = 8 * 1024 * 1024,
+        max_distance: int = 0,
+        verify_delta: int = 32,
+        verify_pixels: int = 2,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_distance = max_distance
+        self.verify_delta = verify_delta
+        self.verify_pixels = verify_pixels
+        self._entries: "OrderedDict[int, Tuple[object, Optional[np.ndarray]]]" = OrderedDict()
+        self._sizes: Dict[int, int] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _size_of(result, thumb: Optional[np.ndarray]) -> int:
+        size = len(result.text.encode("utf-8")) + 16 * len(result.boxes) + 64
+        return size + (thumb.nbytes if thumb is not None else 0)
+
+    def _same_image(self, stored: Optional[np.ndarray], thumb: Optional[np.ndarray]) -> bool:
+        if stored is None or thumb is None:
+            return stored is None and thumb is None
+        if stored.shape != thumb.shape:
+            return False
+        return int(np.count_nonzero(cv2.absdiff(stored, thumb) > self.verify_delta)) <= self.verify_pixels
+
+    def _find(self, key: int, thumb: Optional[np.ndarray]) -> Optional[int]:
+        if self.max_distance <= 0:
+            candidates = [key] if key in self._entries else []
+        else:
+            near = ((bin(k ^ key).count("1"), k) for k in self._entries)
+            candidates = [k for dist, k in sorted(near) if dist <= self.max_distance]
+        for k in candidates:
+            if self._same_image(self._entries[k][1], thumb):
+                return k
+        return None
+
+    def get(self, key: int, thumb: Optional[np.ndarray] = None):
+        with self._lock:
+            found = self._find(key, thumb)
+            if found is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(found)
+            self.hits += 1
+            return self._entries[found][0]
+
+    def put(self, key: int, result, thumb: Optional[np.ndarray] = None):
+        size = self._size_of(result, thumb)
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._sizes[key]
+            self._entries[key] = (result, thumb)
+            self._entries.move_to_end(key)
+            self._sizes[key] = size
+            self._bytes += size
+            while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+                old, _ = self._entries.popitem(last=False)
+                self._bytes -= self._sizes.pop(old)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 3) if total else 0.0,
+            }
@@ -1,10 +1,22 @@
 import logging
-from typing import List, Tuple
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from functools import partial
+from typing import List, Optional, Tuple
 
 import cv2
 import numpy as np
 from PIL import Image
 
+from .board import BoardRectifier
+from .metrics import OCR_BACKEND_SECONDS
+from .model_registry import MODELS
+from .ocr_cache import OCRCache, image_fingerprint, image_thumbnail
+from .segmentation import detect_text_lines, group_rows
+from .tesseract_backend import TESSEROCR_AVAILABLE, TesseractAPIPool
+
 logger = logging.getLogger("ocr_engine")
 
 # Tesseract import (global so app-level diagnostics can use the flag)
@@ -12,14 +24,30 @@ try:
     import pytesseract
     try:
         pytesseract.get_tesseract_version()
-        TESSER_AVAILABLE = True
+        PYTESSERACT_AVAILABLE = True
     except Exception:
-        TESSER_AVAILABLE = False
+        PYTESSERACT_AVAILABLE = False
 except ImportError:
-    TESSER_AVAILABLE = False
+    PYTESSERACT_AVAILABLE = False
+
+# libtesseract via tesserocr works without the pytesseract wrapper or binary on PATH.
+# Whether an engine can actually use either is decided per engine (tesseract_ready)
+TESSER_AVAILABLE = PYTESSERACT_AVAILABLE or TESSEROCR_AVAILABLE
 
 LANG_MAP = {"eng": "en", "hin": "hi", "kan": "kn"}
 
+# Line crops of every engine (and pipeline) share one pool sized to the cores
+_LINE_POOL: Optional[ThreadPoolExecutor] = None
+_LINE_POOL_LOCK = threading.Lock()
+
+
+def _line_pool() -> ThreadPoolExecutor:
+    global _LINE_POOL
+    with _LINE_POOL_LOCK:
+        if _LINE_POOL is None:
+            _LINE_POOL = ThreadPoolExecutor(max_workers=os.cpu_count() or 2, thread_name_prefix="ocr-line")
+        return _LINE_POOL
+
 
 class OCRResult:
     def __init__(self, text: str, boxes: List[Tuple[int, int, int, int]] = None, confidence: float = 0.0, engine: str = ""):
@@ -28,6 +56,9 @@ class OCRResult:
         self.confidence = confidence
         self.engine = engine
 
+    def copy(self) -> "OCRResult":
+        return OCRResult(self.text, list(self.boxes), self.confidence, self.engine)
+
 
 class OCREngine:
     """
@@ -37,12 +68,20 @@ class OCREngine:
     - EasyOCR            (if installed and handwriting_fallback=True)
     - TrOCR (Transformers) (if installed and use_trocr=True)
 
+    With lazy=True only Tesseract is usable right away; the heavy engines are
+    loaded by load_engines()/start_warmup() and join in once they are ready.
+
     We still keep the runtime lightweight by:
     - Doing minimal preprocessing
-    - Running engines sequentially and choosing the best text
+    - Splitting the frame into text lines (line_segmentation=True) so
+      Tesseract and TrOCR see single-line crops
+    - Running engines concurrently (parallel_ocr=True) or sequentially and
+      choosing the best text
+    - Cascading (cascade=True): Tesseract first, heavier engines only when
+      its result is weak, and never more than latency_budget per frame
     """
 
-    def __init__(self, cfg: dict):
+    def __init__(self, cfg: dict, lazy: bool = False):
         self.cfg = cfg
         self.lang = cfg.get("language", "eng")
         self.min_confidence = float(cfg.get("min_confidence", 0.5))
@@ -51,58 +90,161 @@ class OCREngine:
         self.handwriting_fallback = bool(cfg.get("handwriting_fallback", True))
         self.easyocr_langs = cfg.get("easyocr_languages", ["en"])
         self.parallel_ocr = bool(cfg.get("parallel_ocr", False))
-
-        # --- Tesseract (always available if TESSER_AVAILABLE) ---
-        if not TESSER_AVAILABLE:
+        # Per-frame deadline: late parallel engines are dropped, sequential ones not started
+        self.ocr_deadline = float(cfg.get("ocr_deadline", 2.0))
+        self._pool = None
+        self._inflight = {}
+        # Split the frame into text lines and OCR each line on its own
+        self.line_segmentation = bool(cfg.get("line_segmentation", True))
+        # Confidence cascade + latency governor
+        self.cascade = bool(cfg.get("cascade", True))
+        self.cascade_confidence = float(cfg.get("cascade_confidence", 0.7))
+        self.latency_budget = float(cfg.get("latency_budget", 1.5))  # seconds per frame, 0 = no limit
+        self.probe_every = int(cfg.get("latency_probe_every", 30))
+        self.engine_latency = {}  # engine -> moving average seconds
+        self._skipped_frames = {}
+        # Results for content we've already read (teacher stepping in and out, repeated slides)
+        self.cache = None
+        if cfg.get("ocr_cache", True):
+            self.cache = OCRCache(
+                max_entries=int(cfg.get("ocr_cache_entries", 256)),
+                max_distance=int(cfg.get("ocr_cache_max_distance", 0)),
+            )
+        # Board detection + cached perspective rectification (replaces the center crop)
+        self.board = BoardRectifier(cfg) if cfg.get("board_detection", True) else None
+
+        # --- Tesseract ---
+        # In-process libtesseract handles (one per core, shared by every engine
+        # using this language through the registry); pytesseract is the fallback
+        self.tess_api = None
+        if TESSEROCR_AVAILABLE and cfg.get("tesseract_backend", "auto") != "pytesseract":
+            try:
+                self.tess_api = MODELS.get_or_load(
+                    ("tesserocr", self.lang), lambda: TesseractAPIPool(lang=self.lang, size=os.cpu_count() or 2)
+                )
+                logger.info("✅ Tesseract in-process backend (tesserocr) initialized")
+            except Exception as e:
+                logger.warning("⚠️ tesserocr init failed, using pytesseract: %s", str(e)[:200])
+                self.tess_api = None
+        # Usable only through a backend that actually came up
+        self.tesseract_ready = self.tess_api is not None or PYTESSERACT_AVAILABLE
+        if not self.tesseract_ready:
             logger.warning("⚠️ Tesseract not available - install pytesseract and Tesseract OCR executable")
 
         # --- Optional engines: PaddleOCR, EasyOCR, TrOCR ---
+        # Each handle is only assigned once the model is loaded (and warmed up),
+        # so extract_text simply skips engines that aren't ready yet.
         self.paddle = None
         self.easyocr = None
         self.trocr_processor = None
         self.trocr_model = None
-
-        # PaddleOCR
+        self.engine_state = {
+            "tesseract": "ready" if self.tesseract_ready else "unavailable",
+            "paddle": "pending",
+            "easyocr": "pending" if self.handwriting_fallback else "disabled",
+            "trocr": "pending" if self.use_trocr else "disabled",
+        }
+        self._warmup_thread = None
+        if not lazy:
+            self.load_engines(warmup=False)
+
+    def _load_paddle(self, sample: Optional[np.ndarray]):
         try:
             from paddleocr import PaddleOCR  # type: ignore
-
-            lang_code = LANG_MAP.get(self.lang, "en")
-            try:
-                self.paddle = PaddleOCR(lang=lang_code, use_gpu=False, show_log=False)
-                logger.info("✅ PaddleOCR initialized with lang=%s", lang_code)
-            except Exception as e:
-                logger.warning("⚠️ PaddleOCR init failed: %s", str(e)[:200])
-                self.paddle = None
         except Exception as e:
             logger.info("ℹ️ PaddleOCR not available: %s", str(e)[:80])
+            return None
+        lang_code = LANG_MAP.get(self.lang, "en")
 
-        # EasyOCR (handwriting fallback)
-        if self.handwriting_fallback:
-            try:
-                import easyocr  # type: ignore
+        def load():
+            paddle = PaddleOCR(lang=lang_code, use_gpu=False, show_log=False)
+            if sample is not None:
+                paddle.ocr(sample)
+            logger.info("✅ PaddleOCR initialized with lang=%s", lang_code)
+            return paddle
 
-                self.easyocr = easyocr.Reader(self.easyocr_langs, gpu=False)
-                logger.info("✅ EasyOCR initialized with langs=%s", self.easyocr_langs)
-            except Exception as e:
-                logger.info("ℹ️ EasyOCR not available or failed to init: %s", str(e)[:120])
-                self.easyocr = None
+        return MODELS.get_or_load(("paddle", lang_code), load)
 
-        # TrOCR (Transformers)
-        if self.use_trocr:
-            try:
-                from transformers import TrOCRProcessor, VisionEncoderDecoderModel  # type: ignore
+    def _load_easyocr(self, sample: Optional[np.ndarray]):
+        try:
+            import easyocr  # type: ignore
+        except Exception as e:
+            logger.info("ℹ️ EasyOCR not available: %s", str(e)[:120])
+            return None
 
-                try:
-                    self.trocr_processor = TrOCRProcessor.from_pretrained("microsoft/trocr-base-handwritten")
-                    self.trocr_model = VisionEncoderDecoderModel.from_pretrained("microsoft/trocr-base-handwritten")
-                    self.trocr_model.eval()
-                    logger.info("✅ TrOCR initialized (base-handwritten)")
-                except Exception as e:
-                    logger.warning("⚠️ TrOCR model load failed: %s", str(e)[:200])
-                    self.trocr_processor = None
-                    self.trocr_model = None
+        def load():
+            reader = easyocr.Reader(self.easyocr_langs, gpu=False)
+            if sample is not None:
+                reader.readtext(sample, detail=1)
+            logger.info("✅ EasyOCR initialized with langs=%s", self.easyocr_langs)
+            return reader
+
+        return MODELS.get_or_load(("easyocr", tuple(self.easyocr_langs)), load)
+
+    def _load_trocr(self, sample: Optional[np.ndarray]):
+        try:
+            from transformers import TrOCRProcessor, VisionEncoderDecoderModel  # type: ignore
+        except Exception as e:
+            logger.info("ℹ️ TrOCR not available: %s", str(e)[:80])
+            return None
+
+        def load():
+            processor = TrOCRProcessor.from_pretrained("microsoft/trocr-base-handwritten")
+            model = VisionEncoderDecoderModel.from_pretrained("microsoft/trocr-base-handwritten")
+            model.eval()
+            if sample is not None:
+                pixels = processor(images=Image.fromarray(sample), return_tensors="pt").pixel_values
+                model.generate(pixels, max_new_tokens=4)
+            logger.info("✅ TrOCR initialized (base-handwritten)")
+            return processor, model
+
+        return MODELS.get_or_load(("trocr", "microsoft/trocr-base-handwritten"), load)
+
+    @staticmethod
+    def _warmup_image() -> np.ndarray:
+        img = np.full((64, 256, 3), 255, dtype=np.uint8)
+        cv2.putText(img, "Ready", (10, 45), cv2.FONT_HERSHEY_SIMPLEX, 1.2, (0, 0, 0), 2)
+        return img
+
+    def load_engines(self, warmup: bool = True):
+        """
+        Load the heavy engines one by one (cheapest first). Models come from the
+        shared registry, so engines already loaded by another OCREngine are
+        reused as-is. With warmup=True a newly loaded model also runs one dummy
+        inference before it is handed to extract_text, so the first real frame
+        doesn't pay for lazy init.
+        """
+        sample = self._warmup_image() if warmup else None
+        steps = [("paddle", self._load_paddle), ("easyocr", self._load_easyocr), ("trocr", self._load_trocr)]
+        for name, loader in steps:
+            if self.engine_state.get(name) != "pending":
+                continue
+            self.engine_state[name] = "loading"
+            try:
+                handle = loader(sample)
+                if handle is None:
+                    self.engine_state[name] = "unavailable"
+                    continue
+                if name == "paddle":
+                    self.paddle = handle
+                elif name == "easyocr":
+                    self.easyocr = handle
+                else:
+                    self.trocr_processor, self.trocr_model = handle
+                self.engine_state[name] = "ready"
             except Exception as e:
-                logger.info("ℹ️ TrOCR not available: %s", str(e)[:80])
+                logger.warning("⚠️ %s init failed: %s", name, str(e)[:200])
+                self.engine_state[name] = "failed"
+
+    def start_warmup(self, warmup: bool = True):
+        """Load heavy engines in the background; Tesseract keeps serving meanwhile."""
+        if self._warmup_thread is not None:
+            return
+        self._warmup_thread = threading.Thread(target=self.load_engines, args=(warmup,), name="ocr-warmup", daemon=True)
+        self._warmup_thread.start()
+
+    def is_ready(self) -> bool:
+        return all(state not in ("pending", "loading") for state in self.engine_state.values())
 
     def _is_plausible_text(self, text: str) -> bool:
         """
@@ -123,16 +265,29 @@ class OCREngine:
         # Otherwise reject (pure symbols/whitespace).
         return False
 
+    def _tesseract_text(self, img: np.ndarray, psm: int = 6) -> Tuple[str, Optional[float]]:
+        """(text, confidence); confidence is None when the backend can't report one."""
+        if self.tess_api is not None:
+            return self.tess_api.recognize(img, psm=psm)
+        lang = LANG_MAP.get(self.lang, "eng")
+        config = f'--oem 3 --psm {psm}'
+        return pytesseract.image_to_string(img, lang=lang, config=config).strip(), None
+
+    def _tesseract_conf(self, text: str, reported: Optional[float] = None) -> float:
+        if reported is not None:
+            return reported
+        # Estimate confidence based on text quality
+        word_count = len(text.split())
+        return 0.7 if word_count > 2 else 0.6
+
     def _ocr_tesseract(self, img: np.ndarray) -> Tuple[OCRResult, float]:
         """Ultra-fast Tesseract OCR - single PSM mode only."""
-        if not TESSER_AVAILABLE:
+        if not self.tesseract_ready:
             return OCRResult("", [], 0.0, "tesseract"), 0.0
         
         try:
-            lang = LANG_MAP.get(self.lang, "eng")
             # Use only PSM 6 (fastest and most accurate for most cases)
-            config = r'--oem 3 --psm 6'
-            text = pytesseract.image_to_string(img, lang=lang, config=config).strip()
+            text, reported = self._tesseract_text(img, psm=6)
             
             if not text or len(text) < self.min_text_len:
                 return OCRResult("", [], 0.0, "tesseract"), 0.0
@@ -140,21 +295,59 @@ class OCREngine:
             if not self._is_plausible_text(text):
                 return OCRResult("", [], 0.0, "tesseract"), 0.0
             
-            # Estimate confidence based on text quality
-            word_count = len(text.split())
-            conf = 0.7 if word_count > 2 else 0.6
-            
+            conf = self._tesseract_conf(text, reported)
             return OCRResult(text, [], conf, "tesseract"), conf
         except Exception as e:
             logger.debug("Tesseract error: %s", str(e)[:50])
             return OCRResult("", [], 0.0, "tesseract"), 0.0
 
+    def _tesseract_line(self, img: np.ndarray) -> Tuple[str, Optional[float]]:
+        try:
+            # PSM 7: treat the crop as a single text line
+            return self._tesseract_text(img, psm=7)
+        except Exception as e:
+            logger.debug("Tesseract line error: %s", str(e)[:50])
+            return "", None
+
+    def _ocr_tesseract_lines(self, img: np.ndarray, lines: List[Tuple[int, int, int, int]]) -> Tuple[OCRResult, float]:
+        """Tesseract on each detected line crop, spread across cores."""
+        if not self.tesseract_ready:
+            return OCRResult("", [], 0.0, "tesseract"), 0.0
+        crops = [img[y:y + h, x:x + w] for x, y, w, h in lines]
+        results = list(_line_pool().map(self._tesseract_line, crops))
+        texts = [t for t, _ in results]
+        text, boxes = self._assemble_lines(lines, texts)
+        if not text or not self._is_plausible_text(text):
+            return OCRResult("", [], 0.0, "tesseract"), 0.0
+        reported = [c for t, c in results if t and c is not None]
+        conf = self._tesseract_conf(text, float(np.mean(reported)) if reported else None)
+        return OCRResult(text, boxes, conf, "tesseract"), conf
+
+    @staticmethod
+    def _assemble_lines(lines, texts) -> Tuple[str, List[Tuple[int, int, int, int]]]:
+        """Rebuild reading-order text from per-line results (rows joined by newlines)."""
+        by_box = {box: t for box, t in zip(lines, texts) if t}
+        rows = []
+        boxes = []
+        for row in group_rows(list(by_box)):
+            rows.append(" ".join(by_box[b] for b in row))
+            boxes.extend(row)
+        return "\n".join(rows).strip(), boxes
+
+    @staticmethod
+    def _poly_to_box(poly) -> Tuple[int, int, int, int]:
+        pts = np.asarray(poly, dtype=np.float32).reshape(-1, 2)
+        x, y = pts.min(axis=0)
+        x2, y2 = pts.max(axis=0)
+        return int(x), int(y), int(x2 - x), int(y2 - y)
+
     def _ocr_paddle(self, img: np.ndarray) -> Tuple[OCRResult, float]:
         """Simple PaddleOCR wrapper."""
         if self.paddle is None:
             return OCRResult("", [], 0.0, "paddle"), 0.0
         try:
-            res = self.paddle.ocr(img)
+            with MODELS.inference_lock(self.paddle):
+                res = self.paddle.ocr(img)
             if not res:
                 return OCRResult("", [], 0.0, "paddle"), 0.0
 
@@ -162,6 +355,7 @@ class OCREngine:
             lines = res[0] if isinstance(res, list) and len(res) > 0 else res
             texts = []
             confidences = []
+            boxes = []
             for item in lines:
                 if not isinstance(item, (list, tuple)) or len(item) < 2:
                     continue
@@ -173,13 +367,22 @@ class OCREngine:
                 if txt:
                     texts.append(txt)
                     confidences.append(conf)
+                    try:
+                        boxes.append(self._poly_to_box(item[0]))
+                    except (TypeError, ValueError):
+                        boxes.append(None)  # malformed polygon: keep the text, lose its position
             if not texts:
                 return OCRResult("", [], 0.0, "paddle"), 0.0
-            text = " ".join(texts).strip()
+            if None in boxes:
+                # Rows can't be rebuilt without every position; keep Paddle's order
+                text, boxes = "\n".join(texts), [b for b in boxes if b is not None]
+            else:
+                # One output line per board row, so downstream line diffs see the layout
+                text, boxes = self._assemble_lines(boxes, texts)
             if not self._is_plausible_text(text):
                 return OCRResult("", [], 0.0, "paddle"), 0.0
             conf = float(np.mean(confidences)) if confidences else 0.6
-            return OCRResult(text, [], conf, "paddle"), conf
+            return OCRResult(text, boxes, conf, "paddle"), conf
         except Exception as e:
             logger.debug("PaddleOCR error: %s", str(e)[:80])
             return OCRResult("", [], 0.0, "paddle"), 0.0
@@ -194,24 +397,27 @@ class OCREngine:
                 img_color = cv2.cvtColor(img, cv2.COLOR_GRAY2BGR)
             else:
                 img_color = img
-            output = self.easyocr.readtext(img_color, detail=1)
+            with MODELS.inference_lock(self.easyocr):
+                output = self.easyocr.readtext(img_color, detail=1)
             if not output:
                 return OCRResult("", [], 0.0, "easyocr"), 0.0
             texts = []
             confs = []
+            boxes = []
             for bbox, text, conf in output:
                 text = (text or "").strip()
                 if not text:
                     continue
                 texts.append(text)
                 confs.append(float(conf))
+                boxes.append(self._poly_to_box(bbox))
             if not texts:
                 return OCRResult("", [], 0.0, "easyocr"), 0.0
-            text = " ".join(texts).strip()
+            text, boxes = self._assemble_lines(boxes, texts)
             if not self._is_plausible_text(text):
                 return OCRResult("", [], 0.0, "easyocr"), 0.0
             conf = float(np.mean(confs)) if confs else 0.6
-            return OCRResult(text, [], conf, "easyocr"), conf
+            return OCRResult(text, boxes, conf, "easyocr"), conf
         except Exception as e:
             logger.debug("EasyOCR error: %s", str(e)[:80])
             return OCRResult("", [], 0.0, "easyocr"), 0.0
@@ -228,7 +434,8 @@ class OCREngine:
                 rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
             pil_img = Image.fromarray(rgb)
             inputs = self.trocr_processor(images=pil_img, return_tensors="pt").pixel_values
-            generated_ids = self.trocr_model.generate(inputs)
+            with MODELS.inference_lock(self.trocr_model):
+                generated_ids = self.trocr_model.generate(inputs)
             text = self.trocr_processor.batch_decode(generated_ids, skip_special_tokens=True)[0].strip()
             if not text or not self._is_plausible_text(text):
                 return OCRResult("", [], 0.0, "trocr"), 0.0
@@ -239,6 +446,207 @@ class OCREngine:
             logger.debug("TrOCR error: %s", str(e)[:80])
             return OCRResult("", [], 0.0, "trocr"), 0.0
 
+    def _ocr_trocr_lines(self, img: np.ndarray, lines: List[Tuple[int, int, int, int]]) -> Tuple[OCRResult, float]:
+        """
+        TrOCR on all line crops of a frame in a single generate() call.
+        The processor resizes every crop to the model input size, so the
+        lines stack into one batch tensor.
+        """
+        if self.trocr_processor is None or self.trocr_model is None:
+            return OCRResult("", [], 0.0, "trocr"), 0.0
+        try:
+            pil_imgs = []
+            for x, y, w, h in lines:
+                line = img[y:y + h, x:x + w]
+                if len(line.shape) == 2:
+                    rgb = cv2.cvtColor(line, cv2.COLOR_GRAY2RGB)
+                else:
+                    rgb = cv2.cvtColor(line, cv2.COLOR_BGR2RGB)
+                pil_imgs.append(Image.fromarray(rgb))
+            inputs = self.trocr_processor(images=pil_imgs, return_tensors="pt").pixel_values
+            with MODELS.inference_lock(self.trocr_model):
+                generated_ids = self.trocr_model.generate(inputs)
+            texts = [t.strip() for t in self.trocr_processor.batch_decode(generated_ids, skip_special_tokens=True)]
+            text, boxes = self._assemble_lines(lines, texts)
+            if not text or not self._is_plausible_text(text):
+                return OCRResult("", [], 0.0, "trocr"), 0.0
+            conf = 0.7
+            return OCRResult(text, boxes, conf, "trocr"), conf
+        except Exception as e:
+            logger.debug("TrOCR batch error: %s", str(e)[:80])
+            return OCRResult("", [], 0.0, "trocr"), 0.0
+
+    def _engine_jobs(self, crop: np.ndarray, gray: np.ndarray, lines: Optional[list] = None) -> List[Tuple[str, object, np.ndarray]]:
+        """(name, backend, image) for every loaded engine, cheapest first."""
+        if lines:
+            jobs = [("tesseract", partial(self._ocr_tesseract_lines, lines=lines), gray)]
+        else:
+            jobs = [("tesseract", self._ocr_tesseract, gray)]
+        # PaddleOCR / EasyOCR (color image works better)
+        if self.paddle is not None:
+            jobs.append(("paddle", self._ocr_paddle, crop))
+        if self.easyocr is not None:
+            jobs.append(("easyocr", self._ocr_easy, crop))
+        if self.trocr_model is not None and self.trocr_processor is not None:
+            if lines:
+                jobs.append(("trocr", partial(self._ocr_trocr_lines, lines=lines), gray))
+            else:
+                jobs.append(("trocr", self._ocr_trocr, gray))
+        return jobs
+
+    def _timed(self, name: str, fn, img: np.ndarray) -> Tuple[OCRResult, float]:
+        """Run one backend and fold its latency into the per-engine moving average."""
+        t0 = time.monotonic()
+        try:
+            return fn(img)
+        finally:
+            elapsed = time.monotonic() - t0
+            OCR_BACKEND_SECONDS.observe(elapsed, engine=name)
+            prev = self.engine_latency.get(name)
+            self.engine_latency[name] = elapsed if prev is None else prev + 0.2 * (elapsed - prev)
+
+    def _govern(self, jobs, time_left: float):
+        """
+        Latency-budget governor: drop engines whose average latency doesn't fit
+        in the time left for this frame. Every probe_every frames a dropped
+        engine is let through once so its average can recover. Sequential
+        engines share the budget, so each kept engine's average is deducted
+        before the next one is considered.
+        """
+        if self.latency_budget <= 0:
+            return jobs
+        sequential = not self.parallel_ocr or len(jobs) < 2
+        kept = []
+        for job in jobs:
+            avg = self.engine_latency.get(job[0])
+            if avg is None or avg <= time_left:
+                self._skipped_frames.pop(job[0], None)
+            else:
+                skipped = self._skipped_frames.get(job[0], 0) + 1
+                self._skipped_frames[job[0]] = 0 if skipped >= self.probe_every else skipped
+                if skipped < self.probe_every:
+                    continue
+            kept.append(job)
+            if sequential and avg is not None:
+                time_left -= avg
+        return kept
+
+    def _run_cascade(self, jobs) -> List[Tuple[OCRResult, float]]:
+        """
+        Confidence cascade: run the cheapest engine (Tesseract) first and only
+        escalate to the heavier engines when its result is missing, implausible
+        or below cascade_confidence - within whatever latency budget is left.
+        """
+        started = time.monotonic()
+        name, fn, img = jobs[0]
+        res, conf = self._timed(name, fn, img)
+        if res.text and conf >= self.cascade_confidence and self._is_plausible_text(res.text):
+            return [(res, conf)]
+        candidates = [(res, conf)] if res.text else []
+
+        rest = jobs[1:]
+        deadline = self.ocr_deadline
+        if self.latency_budget > 0:
+            time_left = self.latency_budget - (time.monotonic() - started)
+            rest = self._govern(rest, time_left)
+            deadline = min(deadline, max(0.0, time_left))
+        if rest:
+            candidates.extend(self._run_engines(rest, deadline))
+        return candidates
+
+    def _run_engines(self, jobs, deadline: Optional[float] = None) -> List[Tuple[OCRResult, float]]:
+        """Run OCR backends and collect every non-empty result."""
+        candidates: List[Tuple[OCRResult, float]] = []
+        if deadline is None:
+            deadline = self.ocr_deadline
+        if not self.parallel_ocr or len(jobs) < 2:
+            # A running engine can't be cut short, but none is started past the deadline
+            stop_at = time.monotonic() + deadline
+            for i, (name, fn, img) in enumerate(jobs):
+                if i and time.monotonic() >= stop_at:
+                    logger.debug("OCR deadline hit, skipped: %s", ", ".join(j[0] for j in jobs[i:]))
+                    break
+                res, conf = self._timed(name, fn, img)
+                if res.text:
+                    candidates.append((res, conf))
+            return candidates
+
+        # Backends spend their time in Tesseract subprocesses, torch or Paddle
+        # kernels, all of which release the GIL, so threads overlap well.
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="ocr")
+
+        futures = {}
+        for name, fn, img in jobs:
+            # An engine still busy with an earlier (late) frame is skipped, so a
+            # slow backend can never pile up work in the pool.
+            prev = self._inflight.get(name)
+            if prev is not None and not prev.done():
+                continue
+            fut = self._pool.submit(self._timed, name, fn, img)
+            self._inflight[name] = fut
+            futures[fut] = name
+
+        deadline = time.monotonic() + deadline
+        pending = set(futures)
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for fut in done:
+                try:
+                    res, conf = fut.result()
+                except Exception as e:
+                    logger.debug("%s failed: %s", futures[fut], str(e)[:80])
+                    continue
+                if res.text:
+                    candidates.append((res, conf))
+
+        if pending:
+            logger.debug("OCR deadline hit, dropped: %s", ", ".join(futures[f] for f in pending))
+        return candidates
+
+    def apply_settings(self, cfg: dict):
+        """Pick up runtime-tunable settings without touching loaded models."""
+        self.cfg = cfg
+        self.min_confidence = float(cfg.get("min_confidence", 0.5))
+        self.min_text_len = int(cfg.get("min_text_len", 3))
+        self.parallel_ocr = bool(cfg.get("parallel_ocr", False))
+        self.ocr_deadline = float(cfg.get("ocr_deadline", 2.0))
+        self.line_segmentation = bool(cfg.get("line_segmentation", True))
+        self.cascade = bool(cfg.get("cascade", True))
+        self.cascade_confidence = float(cfg.get("cascade_confidence", 0.7))
+        self.latency_budget = float(cfg.get("latency_budget", 1.5))
+        self.probe_every = int(cfg.get("latency_probe_every", 30))
+        if not cfg.get("board_detection", True):
+            self.board = None
+        elif self.board is None:
+            self.board = BoardRectifier(cfg)
+
+    def board_stats(self) -> dict:
+        return self.board.stats() if self.board is not None else {}
+
+    def latency_stats(self) -> dict:
+        """Moving-average latency per engine (ms) and engines the governor is currently holding back."""
+        return {
+            "avg_ms": {name: round(v * 1000, 1) for name, v in self.engine_latency.items()},
+            "throttled": sorted(name for name, n in self._skipped_frames.items() if n),
+        }
+
+    def cache_stats(self) -> dict:
+        return self.cache.stats() if self.cache is not None else {}
+
+    def close(self):
+        """Release the engine's worker pool; the shared Tesseract handles stay in the registry."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._pool = None
+        if self.tess_api is not None:
+            self.tess_api = None
+            self.tesseract_ready = PYTESSERACT_AVAILABLE
+        self._inflight.clear()
+
     def extract_text(self, frame: np.ndarray) -> OCRResult:
         """
         Ultra-fast text extraction - optimized for speed and detection.
@@ -246,10 +654,14 @@ class OCREngine:
         if frame is None or frame.size == 0:
             return OCRResult("", [])
         
-        # Use full frame for maximum text detection (faster than cropping)
-        # Only crop if frame is very large
+        # OCR the rectified board when one is found; otherwise the full frame,
+        # center-cropped only if very large
         h, w = frame.shape[:2]
-        if max(h, w) > 1920:
+        x1, y1 = 0, 0
+        board = self.board.rectify(frame) if self.board is not None else None
+        if board is not None:
+            crop = board
+        elif max(h, w) > 1920:
             # Crop center 80% for very large frames
             x1, y1 = int(w * 0.1), int(h * 0.1)
             x2, y2 = int(w * 0.9), int(h * 0.9)
@@ -273,32 +685,22 @@ class OCREngine:
             new_w, new_h = int(w_gray * scale), int(h_gray * scale)
             gray = cv2.resize(gray, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
         
-        # Run available engines and pick the best result
-        candidates: List[Tuple[OCRResult, float]] = []
-
-        # Tesseract
-        res_tess, conf_tess = self._ocr_tesseract(gray)
-        if res_tess.text:
-            candidates.append((res_tess, conf_tess))
+        cache_key = thumb = None
+        if self.cache is not None:
+            cache_key, thumb = image_fingerprint(gray), image_thumbnail(gray)
+            cached = self.cache.get(cache_key, thumb)
+            if cached is not None:
+                return cached.copy()
 
-        # PaddleOCR (color image works better)
-        if self.paddle is not None:
-            res_pad, conf_pad = self._ocr_paddle(crop)
-            if res_pad.text:
-                candidates.append((res_pad, conf_pad))
-
-        # EasyOCR
-        if self.easyocr is not None:
-            res_easy, conf_easy = self._ocr_easy(crop)
-            if res_easy.text:
-                candidates.append((res_easy, conf_easy))
-
-        # TrOCR
-        if self.trocr_model is not None and self.trocr_processor is not None:
-            res_trocr, conf_trocr = self._ocr_trocr(gray)
-            if res_trocr.text:
-                candidates.append((res_trocr, conf_trocr))
+        lines = detect_text_lines(gray) if self.line_segmentation else None
 
+        # Run available engines and pick the best result
+        jobs = self._engine_jobs(crop, gray, lines)
+        if self.cascade:
+            candidates = self._run_cascade(jobs)
+        else:
+            deadline = min(self.ocr_deadline, self.latency_budget) if self.latency_budget > 0 else None
+            candidates = self._run_engines(self._govern(jobs, self.latency_budget), deadline)
         if not candidates:
             return OCRResult("", [])
 
@@ -309,6 +711,16 @@ class OCREngine:
         )
 
         if best_res.text and len(best_res.text) >= self.min_text_len and best_conf >= self.min_confidence:
+            # Map boxes from the engine's input image back to frame coordinates
+            src = next((img for name, _, img in jobs if name == best_res.engine), crop)
+            scale = src.shape[1] / float(crop.shape[1])
+            boxes = [(int(bx / scale), int(by / scale), int(bw / scale), int(bh / scale)) for bx, by, bw, bh in best_res.boxes]
+            if board is not None:
+                best_res.boxes = self.board.to_frame(boxes)
+            else:
+                best_res.boxes = [(bx + x1, by + y1, bw, bh) for bx, by, bw, bh in boxes]
+            if cache_key is not None:
+                self.cache.put(cache_key, best_res.copy(), thumb)
             return best_res
 
         return OCRResult("", [])
@@ -0,0 +1,214 @@
+import heapq
+import logging
+import multiprocessing as mp
+import queue
+import threading
+import time
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from .metrics import METRICS
+from .ocr_engine import OCRResult
+
+logger = logging.getLogger("ocr_workers")
+
+WORKER_RESTARTS = METRICS.counter(
+    "assistive_ocr_worker_restarts_total", "OCR worker processes that died and were respawned", ("pipeline",)
+)
+
+
+def _worker_main(ocr_cfg: dict, slot_names: List[str], tasks, results):
+    """OCR worker process: reads frames from shared-memory slots, returns results."""
+    from .ocr_engine import OCREngine
+
+    logging.basicConfig(level=logging.INFO)
+    engine = OCREngine(ocr_cfg)
+    slots = [shared_memory.SharedMemory(name=name) for name in slot_names]
+    try:
+        while True:
+            task = tasks.get()
+            if task is None:
+                break
+            seq, slot, shape, dtype = task
+            frame = np.ndarray(shape, dtype=np.dtype(dtype), buffer=slots[slot].buf)
+            try:
+                res = engine.extract_text(frame)
+                out = (seq, slot, res.text, res.boxes, res.confidence, res.engine)
+            except Exception as e:
+                logger.debug("Worker OCR error: %s", str(e)[:80])
+                out = (seq, slot, "", [], 0.0, "")
+            del frame
+            results.put(out)
+    finally:
+        engine.close()
+        for shm in slots:
+            shm.close()
+
+
+class OCRWorkerPool:
+    """
+    Pool of OCR worker processes fed through a ring of shared-memory slots.
+
+    Frames are copied once into a free slot and only (seq, slot, shape) goes
+    through the task queue, so no frame is ever pickled. Results come back in
+    completion order and are re-sequenced by frame number before they leave
+    the pool. Each worker loads its own OCREngine, so memory grows with the
+    number of workers.
+
+    Every worker has its own task queue and the pool remembers which slots
+    it handed to which worker. A worker that dies (segfault, OOM kill) is
+    noticed on the next collect: its slots go back to the ring, its frames
+    are written off and a replacement is started.
+    """
+
+    def __init__(
+        self,
+        ocr_cfg: dict,
+        workers: int = 2,
+        slots: int = 0,
+        max_frame_bytes: int = 1920 * 1080 * 3,
+        reorder_timeout: float = 5.0,
+        name: str = "default",
+    ):
+        self._ctx = mp.get_context("spawn")
+        self._ocr_cfg = ocr_cfg
+        self.name = name
+        self.workers = max(1, workers)
+        self.slot_count = slots or self.workers * 2
+        self.max_frame_bytes = max_frame_bytes
+        self.reorder_timeout = reorder_timeout
+        self._shm = [shared_memory.SharedMemory(create=True, size=max_frame_bytes) for _ in range(self.slot_count)]
+        self._free: "queue.Queue[int]" = queue.Queue()
+        for i in range(self.slot_count):
+            self._free.put(i)
+        self._results = self._ctx.Queue()
+        self._meta = {}
+        self._next_seq = 0
+        self._expected = 0
+        self._reorder: List[Tuple[int, float, Optional[OCRResult]]] = []
+        self._lock = threading.Lock()
+        self._tasks: List[Any] = [None] * self.workers
+        self._procs: List[Any] = [None] * self.workers
+        self._inflight: List[Dict[int, int]] = [{} for _ in range(self.workers)]  # worker -> {seq: slot}
+        self.restarts = 0
+        for i in range(self.workers):
+            self._spawn(i)
+        logger.info("OCR worker pool started: %d workers, %d slots", self.workers, self.slot_count)
+
+    def _spawn(self, i: int):
+        # A fresh queue: the old one may have died with its lock held
+        self._tasks[i] = self._ctx.Queue()
+        names = [shm.name for shm in self._shm]
+        proc = self._ctx.Process(
+            target=_worker_main, args=(self._ocr_cfg, names, self._tasks[i], self._results), name=f"ocr-worker-{i}", daemon=True
+        )
+        proc.start()
+        self._procs[i] = proc
+
+    def _reap(self):
+        """Reclaim the slots of dead workers, write off their frames and respawn them."""
+        now = time.monotonic()
+        with self._lock:
+            for i, proc in enumerate(self._procs):
+                if proc.exitcode is None:
+                    continue
+                lost = self._inflight[i]
+                self._inflight[i] = {}
+                for seq, slot in lost.items():
+                    self._free.put(slot)
+                    heapq.heappush(self._reorder, (seq, now, None))
+                logger.error(
+                    "OCR worker %s died (exit code %s), %d frame(s) lost; restarting it", proc.name, proc.exitcode, len(lost)
+                )
+                self.restarts += 1
+                WORKER_RESTARTS.inc(pipeline=self.name)
+                self._spawn(i)
+
+    def has_free_slot(self) -> bool:
+        return not self._free.empty()
+
+    def pending(self) -> int:
+        """Frames submitted whose results haven't been handed out yet."""
+        return len(self._meta)
+
+    def _fit(self, frame: np.ndarray) -> np.ndarray:
+        """Downscale frames that don't fit a slot (OCR crops huge frames anyway)."""
+        if frame.nbytes <= self.max_frame_bytes:
+            return frame
+        scale = (self.max_frame_bytes / float(frame.nbytes)) ** 0.5
+        h, w = frame.shape[:2]
+        return cv2.resize(frame, (max(1, int(w * scale)), max(1, int(h * scale))), interpolation=cv2.INTER_AREA)
+
+    def submit(self, frame: np.ndarray, meta: Any = None, timeout: float = 0.5) -> Optional[int]:
+        """Copy a frame into a free slot and queue it; returns its sequence number or None if busy."""
+        try:
+            slot = self._free.get(timeout=timeout)
+        except queue.Empty:
+            return None
+        frame = np.ascontiguousarray(self._fit(frame))
+        view = np.ndarray(frame.shape, dtype=frame.dtype, buffer=self._shm[slot].buf)
+        view[...] = frame
+        del view
+        with self._lock:
+            seq = self._next_seq
+            self._next_seq += 1
+            self._meta[seq] = meta
+            # Least busy worker; ties go to the lowest index
+            i = min(range(self.workers), key=lambda w: len(self._inflight[w]))
+            self._inflight[i][seq] = slot
+            self._tasks[i].put((seq, slot, frame.shape, frame.dtype.str))
+        return seq
+
+    def get_ordered(self, timeout: float = 0.3) -> List[Tuple[int, OCRResult, Any]]:
+        """Collect finished results and return those that are next in sequence order."""
+        try:
+            item = self._results.get(timeout=timeout)
+            while True:
+                seq, slot, text, boxes, conf, engine = item
+                with self._lock:
+                    for inflight in self._inflight:
+                        if inflight.pop(seq, None) is not None:
+                            self._free.put(slot)
+                            break
+                    heapq.heappush(self._reorder, (seq, time.monotonic(), OCRResult(text, boxes, conf, engine)))
+                item = self._results.get_nowait()
+        except queue.Empty:
+            pass
+        self._reap()
+
+        ready = []
+        while self._reorder:
+            seq, arrived, res = self._reorder[0]
+            if seq < self._expected:
+                # Already written off (late result, or a dead worker's frame)
+                heapq.heappop(self._reorder)
+                continue
+            # A frame lost with a crashed worker must not stall everything behind it
+            if seq != self._expected and time.monotonic() - arrived < self.reorder_timeout:
+                break
+            heapq.heappop(self._reorder)
+            for lost in range(self._expected, seq):
+                self._meta.pop(lost, None)
+            self._expected = seq + 1
+            meta = self._meta.pop(seq, None)
+            if res is not None:  # None: lost with a dead worker
+                ready.append((seq, res, meta))
+        return ready
+
+    def close(self):
+        for tasks in self._tasks:
+            tasks.put(None)
+        for p in self._procs:
+            p.join(timeout=2)
+            if p.is_alive():
+                p.terminate()
+        for shm in self._shm:
+            try:
+                shm.close()
+                shm.unlink()
+            except Exception:
+                pass
+        logger.info("OCR worker pool stopped")
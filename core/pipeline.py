@@ -1,39 +1,155 @@
+import copy
 import threading
 import time
 import queue
 import cv2
 import logging
-from typing import Dict, Any
+from collections import deque
+from typing import Any, Dict, List, Optional
+from .audio_stream import AudioBroadcaster
+from .events import EventBroadcaster
+from .frame_gate import FrameChangeDetector
+from .frame_hub import FrameHub
+from .metrics import FRAMES, QUEUE_DEPTH, STAGE_SECONDS
+from .scheduler import SCHEDULER
 from .ocr_engine import OCREngine, OCRResult
+from .ocr_workers import OCRWorkerPool
+from .sources import ImageDirectorySource
+from .speech_queue import SpeechQueue, Utterance
+from .text_diff import new_lines, split_lines
+from .transcript_store import TranscriptStore
 from .tts_engine import TTSEngine
 
 logger = logging.getLogger("pipeline")
 
+RESOLUTIONS = {"480p": (640, 480), "720p": (1280, 720), "1080p": (1920, 1080)}
+
+# Settings that can change on a live pipeline without reloading any model.
+# Anything else in "ocr"/"tts" rebuilds that engine (models come from the
+# shared registry, so only genuinely new models are loaded); any "camera"
+# change restarts the pipeline threads.
+RUNTIME_KEYS = {
+    "ocr": {
+        "engine", "capture_interval", "min_confidence", "min_text_len",
+        "change_detection", "change_min_blocks", "change_pixel_delta", "change_persist_frames",
+        "parallel_ocr", "ocr_deadline", "line_segmentation",
+        "cascade", "cascade_confidence", "latency_budget", "latency_probe_every",
+        "board_detection",
+    },
+    "tts": {
+        "voice", "speed", "volume", "streaming", "stream_prefetch",
+        "incremental", "line_similarity", "spoken_memory",
+        "max_speech_lag", "speech_queue_lines", "stream_sample_rate", "stream_buffer_seconds",
+    },
+}
+# Camera keys that only affect the preview stream (no capture restart)
+PREVIEW_KEYS = {"preview_fps", "preview_width", "preview_quality"}
+# Read once when the pipeline is built; changing them needs a server restart
+RESTART_KEYS = {"app": {"transcript_db"}}
+
 
 class AssistivePipeline:
-    def __init__(self, config):
+    def __init__(self, config, name: str = "default"):
+        self.name = name
         self.config = config
         self.cfg = config.data
-        self.ocr = OCREngine(self.cfg["ocr"])
-        self.tts = TTSEngine(self.cfg["tts"])
+        # Lazy load: serve with Tesseract/espeak immediately, heavy models warm up in the background
+        lazy = bool(self.cfg["app"].get("lazy_load", True))
+        # Speech for listeners on their own devices; outlives TTS engine reloads
+        self.audio = AudioBroadcaster(
+            name,
+            sample_rate=int(self.cfg["tts"].get("stream_sample_rate", 22050)),
+            buffer_seconds=float(self.cfg["tts"].get("stream_buffer_seconds", 15.0)),
+        )
+        self.ocr = OCREngine(self.cfg["ocr"], lazy=lazy)
+        # Held while self.ocr runs, so a replaced engine is never closed mid-frame
+        self._ocr_lock = threading.Lock()
+        self.tts = TTSEngine(self.cfg["tts"], lazy=lazy, tenant=name, audio_out=self.audio)
+        if lazy:
+            warmup = bool(self.cfg["app"].get("warmup_inference", True))
+            self.ocr.start_warmup(warmup)
+            self.tts.start_warmup(warmup)
+        self.change_gate = FrameChangeDetector(self.cfg["ocr"])
         self.frame_q = queue.Queue(maxsize=1)
-        self.text_q = queue.Queue()
-        self.history = []
+        # Set while the processor waits for a frame; capture only decodes then
+        self._proc_ready = threading.Event()
+        # Latest decoded frame for the preview stream and camera/OCR tests
+        cam_cfg = self.cfg["camera"]
+        self.hub = FrameHub(
+            preview_fps=float(cam_cfg.get("preview_fps", 5.0)),
+            preview_width=int(cam_cfg.get("preview_width", 960)),
+            jpeg_quality=int(cam_cfg.get("preview_quality", 70)),
+        )
+        # Bounded speech backlog: manual requests first, board text coalesced, stale lines dropped
+        self.speech = SpeechQueue(
+            name,
+            max_lines=int(self.cfg["tts"].get("speech_queue_lines", 20)),
+            max_lag=float(self.cfg["tts"].get("max_speech_lag", 10.0)),
+            on_interrupt=lambda: self.tts.stop(),
+        )
+        self._speaker = None
+        self._speaker_lock = threading.Lock()
+        # Held while an utterance plays, so self.tts is never swapped mid-utterance
+        self._tts_lock = threading.Lock()
+        # Recent entries in memory; the full lecture goes to the transcript store
+        self.history = deque(maxlen=int(self.cfg["app"].get("max_history", 50)))
+        self._next_id = 1
+        self.store = None
+        db_path = self.cfg["app"].get("transcript_db", "transcripts.db")
+        if db_path:
+            try:
+                self.store = TranscriptStore(db_path)
+            except Exception as e:
+                logger.error("Transcript store unavailable (%s), keeping history in memory only", e)
         self.lock = threading.Lock()
+        # Config as last applied by reconfigure()
+        self._applied_cfg = copy.deepcopy(self.cfg)
+        self._reconfig_lock = threading.Lock()
         self.running = False
         self.threads = []
         self.last_text = ""
+        self.frames_skipped = 0
+        self.frames_processed = 0
+        # Lines already read out, so only newly written lines are re-queued to TTS
+        self.spoken_lines = deque(maxlen=int(self.cfg["tts"].get("spoken_memory", 200)))
+        self._last_emit_text = ""
+        self._last_emit_time = 0.0
+        # Optional multi-process OCR (ocr.workers > 0); started with the pipeline
+        self.workers = None
+        # Server push to dashboards: transcript entries and throttled status deltas
+        self.events = EventBroadcaster()
+        self._last_status: Dict[str, Any] = {}
+        self._last_status_push = 0.0
+        QUEUE_DEPTH.set_function(lambda: self.frame_q.qsize(), queue="frame", pipeline=name)
+        QUEUE_DEPTH.set_function(lambda: len(self.speech), queue="speech", pipeline=name)
 
     def start(self):
         if self.running:
             return
         self.running = True
+        self.change_gate.reset()
+        self.spoken_lines.clear()
+        if self.workers is not None:
+            # Left over from a run that ended on its own (replay finished, camera failed)
+            self.workers.close()
+            self.workers = None
+        n_workers = int(self.cfg["ocr"].get("workers", 0))
+        if n_workers > 0:
+            self.workers = OCRWorkerPool(
+                self.cfg["ocr"],
+                workers=n_workers,
+                max_frame_bytes=int(self.cfg["ocr"].get("worker_frame_bytes", 1920 * 1080 * 3)),
+                name=self.name,
+            )
         tcap = threading.Thread(target=self._capture_loop, name="capture", daemon=True)
         tproc = threading.Thread(target=self._process_loop, name="process", daemon=True)
-        ttts = threading.Thread(target=self._tts_loop, name="tts", daemon=True)
-        self.threads = [tcap, tproc, ttts]
+        self.threads = [tcap, tproc]
+        self._ensure_speaker()
+        if self.workers is not None:
+            self.threads.append(threading.Thread(target=self._collect_loop, name="ocr-collect", daemon=True))
         for t in self.threads:
             t.start()
+        self._publish_status(force=True)
         logger.info("Pipeline started")
 
     def stop(self):
@@ -42,141 +158,523 @@ class AssistivePipeline:
             self.frame_q.put(None, timeout=0.1)
         except queue.Full:
             pass
-        try:
-            self.text_q.put(None, timeout=0.1)
-        except queue.Full:
-            pass
+        # Board text still waiting is dropped; manual requests and the current line finish
+        self.speech.clear()
         for t in self.threads:
             t.join(timeout=1)
+        if self.workers is not None:
+            self.workers.close()
+            self.workers = None
+        self._publish_status(force=True)
         logger.info("Pipeline stopped")
 
     def _get_capture_source(self):
         cam_cfg = self.cfg["camera"]
-        if cam_cfg.get("source_type") == "gstreamer":
+        source_type = cam_cfg.get("source_type")
+        if source_type == "gstreamer":
             return (
                 "nvarguscamerasrc ! video/x-raw(memory:NVMM), "
                 f"width={self.cfg['camera'].get('width', 1920)}, "
                 f"height={self.cfg['camera'].get('height', 1080)}, "
                 "framerate=30/1 ! nvvidconv ! videoconvert ! appsink"
             )
+        if source_type == "video":
+            return cam_cfg.get("source_path", "")
+        if source_type == "images":
+            return ImageDirectorySource(cam_cfg.get("source_path", ""), fps=float(cam_cfg.get("images_fps", 1.0)))
         return int(cam_cfg.get("camera_id", 0))
 
+    def _push_frame(self, frame, meta: Dict[str, Any], block: bool = False):
+        """Hand a frame to the processor; live sources drop the stale one, replay can wait instead."""
+        item = (frame, meta)
+        if block:
+            while self.running:
+                try:
+                    self.frame_q.put(item, timeout=0.2)
+                    return
+                except queue.Full:
+                    continue
+            return
+        try:
+            if self.frame_q.full():
+                _ = self.frame_q.get_nowait()
+                FRAMES.inc(outcome="dropped", pipeline=self.name)
+            self.frame_q.put_nowait(item)
+        except queue.Full:
+            pass
+        except Exception:
+            pass
+
+    def _processor_ready(self) -> bool:
+        """True when a frame handed over now would be picked up right away."""
+        if not self._proc_ready.is_set():
+            return False
+        workers = self.workers
+        return workers is None or workers.has_free_slot()
+
+    def _configure_camera(self, cap):
+        """Ask for a compressed pixel format and the configured size; the device may refuse either."""
+        cam_cfg = self.cfg["camera"]
+        width, height = RESOLUTIONS.get(cam_cfg.get("resolution", "720p"), RESOLUTIONS["720p"])
+        fourcc = (cam_cfg.get("fourcc") or "").strip()
+        if len(fourcc) == 4:
+            # Must be set before the size: V4L2 picks the available sizes per format
+            cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*fourcc))
+        cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        code = int(cap.get(cv2.CAP_PROP_FOURCC))
+        got = "".join(chr((code >> 8 * i) & 0xFF) for i in range(4)) if code else "?"
+        logger.info(
+            "Camera negotiated %dx%d %s (requested %dx%d %s)",
+            int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)), got,
+            width, height, fourcc or "default",
+        )
+
     def _capture_loop(self):
         cap_source = self._get_capture_source()
-        cap = cv2.VideoCapture(cap_source)
+        cap = cap_source if isinstance(cap_source, ImageDirectorySource) else cv2.VideoCapture(cap_source)
         interval = max(0.05, float(self.cfg["ocr"].get("capture_interval", 0.1)))
         last_push = 0.0
 
         if isinstance(cap_source, int) and cap.isOpened():
-            res = self.cfg["camera"].get("resolution", "720p")  # Use 720p for speed
-            if res == "1080p":
-                cap.set(cv2.CAP_PROP_FRAME_WIDTH, 1920)
-                cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 1080)
-            else:
-                cap.set(cv2.CAP_PROP_FRAME_WIDTH, 1280)
-                cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 720)
-            cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+            self._configure_camera(cap)
 
         if not cap.isOpened():
             logger.error("Camera open failed")
             self.running = False
+            self._publish_status(force=True)
+            return
+
+        if self.cfg["camera"].get("source_type") in ("video", "images"):
+            finished = self._replay_loop(cap, interval)
+            cap.release()
+            if finished:
+                self._finish_replay()
             return
 
+        # grab() every frame so the driver buffer never goes stale, but only
+        # decode (retrieve) when the interval has passed and the processor is
+        # free - OCR speed sets the sampling rate, nothing is decoded to be dropped.
+        # A preview viewer additionally gets frames at the preview rate.
         while self.running:
-            ret, frame = cap.read()
-            if not ret:
+            t0 = time.perf_counter()
+            if not cap.grab():
                 time.sleep(0.01)
                 continue
-            
+            FRAMES.inc(outcome="grabbed", pipeline=self.name)
+
             now = time.time()
-            if now - last_push < interval:
+            ocr_due = now - last_push >= interval and self._processor_ready()
+            if not ocr_due and not self.hub.wants_frame():
+                continue
+            ret, frame = cap.retrieve()
+            if not ret or frame is None:
                 continue
-            last_push = now
-            
+            STAGE_SECONDS.observe(time.perf_counter() - t0, stage="capture", pipeline=self.name)
+            FRAMES.inc(outcome="captured", pipeline=self.name)
+            self.hub.publish(frame, now)
+
+            if ocr_due:
+                last_push = now
+                self._push_frame(frame, {"frame_ts": now, "media_ts": None})
+
+        cap.release()
+
+    def _finish_replay(self):
+        """End of the file: let the processor drain what it was handed, then stop."""
+        while self.running:
             try:
-                if self.frame_q.full():
-                    _ = self.frame_q.get_nowait()
-                self.frame_q.put_nowait(frame)
+                self.frame_q.put(None, timeout=0.5)
+                break
             except queue.Full:
-                pass
-            except Exception:
-                pass
-        
-        cap.release()
+                continue
+        for t in self.threads:
+            if t.name == "process":
+                t.join()
+        workers = self.workers
+        if workers is not None:
+            # ...and the worker processes finish the frames still in flight
+            deadline = time.monotonic() + workers.reorder_timeout
+            while self.running and workers.pending() and time.monotonic() < deadline:
+                time.sleep(0.05)
+        self.running = False
+        self._publish_status(force=True)
+        logger.info("Pipeline stopped: replay finished")
+
+    def _replay_loop(self, cap, interval: float) -> bool:
+        """
+        Play a video file or image directory through the pipeline.
+
+        camera.replay_speed: 1.0 = real time, 2.0 = twice as fast, 0 = as fast as
+        the pipeline can take frames (nothing dropped). Frames are sampled every
+        capture_interval of *media* time; frames in between are only grabbed,
+        never decoded. In real-time mode a sample that comes due while the
+        processor is still busy is skipped undecoded, as with a live camera.
+        Returns True when the file ran out (rather than the pipeline being stopped).
+        """
+        speed = float(self.cfg["camera"].get("replay_speed", 1.0))
+        loop = bool(self.cfg["camera"].get("loop", False))
+        fps = cap.get(cv2.CAP_PROP_FPS) or 25.0
+        started = time.monotonic()
+        last_media = None
+
+        while self.running:
+            if not cap.grab():
+                if loop and cap.set(cv2.CAP_PROP_POS_FRAMES, 0):
+                    started = time.monotonic()
+                    last_media = None
+                    continue
+                logger.info("Replay finished")
+                return True
+            FRAMES.inc(outcome="grabbed", pipeline=self.name)
+            media_ts = max(0.0, cap.get(cv2.CAP_PROP_POS_FRAMES) - 1) / fps
+            if last_media is not None and media_ts - last_media < interval:
+                continue
+            if speed > 0:
+                # Real-time pacing: wait until this frame's media time comes due
+                delay = started + media_ts / speed - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                if not self._processor_ready():
+                    # Busy: skip without decoding, as a live camera would
+                    continue
+            t0 = time.perf_counter()
+            ret, frame = cap.retrieve()
+            if not ret or frame is None:
+                continue
+            STAGE_SECONDS.observe(time.perf_counter() - t0, stage="capture", pipeline=self.name)
+            FRAMES.inc(outcome="captured", pipeline=self.name)
+            self.hub.publish(frame)
+            last_media = media_ts
+            self._push_frame(frame, {"frame_ts": time.time(), "media_ts": round(media_ts, 3)}, block=speed <= 0)
+        return False
 
     def _process_loop(self):
-        min_len = int(self.cfg["ocr"].get("min_text_len", 3))
-        min_conf = float(self.cfg["ocr"].get("min_confidence", 0.5))
-        last_text = ""
-        last_time = 0
-        frame_count = 0
-        
         while self.running:
             try:
-                frame = self.frame_q.get(timeout=0.3)  # Faster timeout for responsiveness
-                if frame is None:
+                self._publish_status()
+                self._proc_ready.set()
+                try:
+                    item = self.frame_q.get(timeout=0.3)  # Faster timeout for responsiveness
+                finally:
+                    self._proc_ready.clear()
+                if item is None:
                     break
+                frame, meta = item
 
-                frame_count += 1
-                ocr_res: OCRResult = self.ocr.extract_text(frame)
-                text = (ocr_res.text or "").strip()
-
-                if not text or len(text) < min_len:
-                    continue
-                
-                if ocr_res.confidence < min_conf:
+                # Board unchanged since the last OCR'd frame - nothing new to read
+                with STAGE_SECONDS.time(stage="change_gate", pipeline=self.name):
+                    changed = self.change_gate.should_process(frame)
+                if not changed:
+                    self.frames_skipped += 1
+                    FRAMES.inc(outcome="skipped", pipeline=self.name)
                     continue
 
-                # Simple duplicate check (fast) - allow same text after 1.5 seconds
-                now = time.time()
-                if text == last_text and (now - last_time < 1.5):
+                self.frames_processed += 1
+                FRAMES.inc(outcome="ocr", pipeline=self.name)
+                if self.workers is not None:
+                    # Hand off to a worker process; _collect_loop picks up the result
+                    while self.running and self.workers.submit(frame, meta) is None:
+                        pass
                     continue
 
-                # Save to history and update status immediately
-                with self.lock:
-                    self.history.append({
-                        "ts": now,
-                        "text": text,
-                        "engine": ocr_res.engine,
-                        "confidence": ocr_res.confidence
-                    })
-                    if len(self.history) > self.cfg["app"].get("max_history", 50):
-                        self.history.pop(0)
-
-                last_text = text
-                last_time = now
-                self.last_text = text
-                self.text_q.put(text)
-                
+                with STAGE_SECONDS.time(stage="ocr", pipeline=self.name):
+                    ocr_res: OCRResult = self.run_ocr(frame)
+                self._handle_ocr_result(ocr_res, meta)
+
             except queue.Empty:
                 continue
             except Exception:
                 continue
 
-    def _tts_loop(self):
+    def run_ocr(self, frame) -> OCRResult:
+        """OCR one frame on this pipeline's engine, serialized with the process loop and engine swaps."""
+        # Shared OCR slots are handed out round-robin across pipelines
+        with SCHEDULER.slot("ocr", self.name), self._ocr_lock:
+            return self.ocr.extract_text(frame)
+
+    def _collect_loop(self):
+        """Consume worker results in frame order and feed them to dedupe/TTS."""
         while self.running:
+            workers = self.workers
+            if workers is None:
+                break
             try:
-                text = self.text_q.get(timeout=0.5)
-                if text is None:
-                    break
-                self.tts.speak(
-                    text,
-                    voice=self.cfg["tts"].get("voice"),
-                    speed=self.cfg["tts"].get("speed", 1.0),
-                    volume=self.cfg["tts"].get("volume", 0.9),
-                )
-            except queue.Empty:
-                continue
+                for _, ocr_res, meta in workers.get_ordered(timeout=0.3):
+                    self._handle_ocr_result(ocr_res, meta)
             except Exception:
                 continue
 
+    def _handle_ocr_result(self, ocr_res: OCRResult, meta: Optional[Dict[str, Any]] = None):
+        """
+        Filter, dedupe and record an OCR result, then queue its new lines for speech.
+        meta carries the capture timestamps of the frame (frame_ts, media_ts).
+        """
+        min_len = int(self.cfg["ocr"].get("min_text_len", 3))
+        min_conf = float(self.cfg["ocr"].get("min_confidence", 0.5))
+        text = (ocr_res.text or "").strip()
+
+        if not text or len(text) < min_len:
+            return
+
+        if ocr_res.confidence < min_conf:
+            return
+
+        # Simple duplicate check (fast) - allow same text after 1.5 seconds
+        now = time.time()
+        if text == self._last_emit_text and (now - self._last_emit_time < 1.5):
+            return
+
+        # Save to history and update status immediately
+        entry = {
+            "ts": now,
+            "text": text,
+            "engine": ocr_res.engine,
+            "confidence": ocr_res.confidence
+        }
+        if meta:
+            entry["frame_ts"] = meta.get("frame_ts")
+            entry["media_ts"] = meta.get("media_ts")
+            if meta.get("frame_ts"):
+                # Capture -> transcript latency for this frame
+                entry["lag"] = round(now - meta["frame_ts"], 3)
+        with self.lock:
+            if self.store is not None:
+                self.store.add(entry)
+            else:
+                entry["id"] = self._next_id
+                self._next_id += 1
+            self.history.append(entry)
+        self.events.publish("transcript", entry)
+
+        self._last_emit_text = text
+        self._last_emit_time = now
+        self.last_text = text
+
+        speech = text
+        if self.cfg["tts"].get("incremental", True):
+            fresh = new_lines(
+                list(self.spoken_lines),
+                split_lines(text),
+                float(self.cfg["tts"].get("line_similarity", 0.85)),
+            )
+            if not fresh:
+                return
+            self.spoken_lines.extend(fresh)
+            speech = "\n".join(fresh)
+        ts = None
+        if meta and meta.get("frame_ts"):
+            # Speech lag counts from when the frame was captured, not when OCR finished
+            ts = time.monotonic() - (now - meta["frame_ts"])
+        self.speech.add_board(split_lines(speech), ts)
+
+    def say(self, text: str, interrupt: bool = False) -> Optional[Utterance]:
+        """Speak text ahead of any board text (None if too many requests are already waiting)."""
+        self._ensure_speaker()
+        return self.speech.say(text, interrupt=interrupt)
+
+    def _ensure_speaker(self):
+        # Speech outlives start/stop so /api/speak works while the camera is off
+        with self._speaker_lock:
+            if self._speaker is None or not self._speaker.is_alive():
+                self._speaker = threading.Thread(target=self._tts_loop, name=f"tts-{self.name}", daemon=True)
+                self._speaker.start()
+
+    def _tts_loop(self):
+        while True:
+            utt = self.speech.get()
+            if utt is None:
+                break
+            try:
+                with self._tts_lock:
+                    tts = self.tts
+                    spoken = tts.speak(
+                        utt.text,
+                        voice=self.cfg["tts"].get("voice"),
+                        speed=self.cfg["tts"].get("speed", 1.0),
+                        volume=self.cfg["tts"].get("volume", 0.9),
+                    )
+                if spoken:
+                    utt.finish("spoken")
+                else:
+                    utt.finish("interrupted" if tts.interrupted else "failed")
+            except Exception as e:
+                logger.warning("Speech failed: %s", e)
+                utt.finish("failed")
+
     def get_status(self) -> Dict[str, Any]:
         return {
             "running": self.running,
             "last_text": self.last_text,
             "history_count": len(self.history),
+            "frames_skipped": self.frames_skipped,
+            "frames_processed": self.frames_processed,
+            "ocr_cache": self.ocr.cache_stats(),
+            "ocr_latency": self.ocr.latency_stats(),
+            "board": self.ocr.board_stats(),
+            "audio_cache": self.tts.cache_stats(),
+            "tts": self.tts.stats(),
+            "speech_queue": self.speech.stats(),
+            "audio_stream": self.audio.stats(),
+        }
+
+    def _publish_status(self, force: bool = False):
+        """Push the status fields that changed since the last push, at most every 0.5 s."""
+        if not self.events.has_subscribers():
+            return
+        now = time.monotonic()
+        if not force and now - self._last_status_push < 0.5:
+            return
+        self._last_status_push = now
+        status = self.get_status()
+        delta = {k: v for k, v in status.items() if self._last_status.get(k) != v}
+        self._last_status = status
+        if delta:
+            self.events.publish("status", delta)
+
+    def reconfigure(self) -> Dict[str, Any]:
+        """
+        Apply config changes (self.cfg already holds the new values) with the
+        least disruption: runtime settings in place, engines rebuilt only when
+        a model-affecting key changed, threads restarted only for camera or
+        worker-pool changes. The diff is taken against the config this method
+        last applied, so back-to-back updates are each applied once. Returns
+        what was done.
+        """
+        with self._reconfig_lock:
+            new_cfg = copy.deepcopy(self.cfg)
+            actions = self._reconfigure(self._applied_cfg, new_cfg)
+            self._applied_cfg = new_cfg
+        return actions
+
+    def _reconfigure(self, old_cfg: Dict[str, Any], new_cfg: Dict[str, Any]) -> Dict[str, Any]:
+        changed = {}
+        for section, values in new_cfg.items():
+            before = old_cfg.get(section, {})
+            if isinstance(values, dict):
+                keys = {k for k in set(values) | set(before) if values.get(k) != before.get(k)}
+                if keys:
+                    changed[section] = keys
+        actions = {
+            "changed": {k: sorted(v) for k, v in changed.items()},
+            "reloaded": [],
+            "restarted": False,
+            "restart_required": sorted(
+                f"{section}.{key}" for section, keys in RESTART_KEYS.items() for key in changed.get(section, set()) & keys
+            ),
+        }
+
+        camera_keys = changed.get("camera", set())
+        restart = bool(camera_keys - PREVIEW_KEYS)
+        if camera_keys & PREVIEW_KEYS:
+            cam_cfg = self.cfg["camera"]
+            self.hub.configure(
+                float(cam_cfg.get("preview_fps", 5.0)),
+                int(cam_cfg.get("preview_width", 960)),
+                int(cam_cfg.get("preview_quality", 70)),
+            )
+        ocr_keys = changed.get("ocr", set())
+        tts_keys = changed.get("tts", set())
+        lazy = bool(self.cfg["app"].get("lazy_load", True))
+        warmup = bool(self.cfg["app"].get("warmup_inference", True))
+
+        if ocr_keys - RUNTIME_KEYS["ocr"]:
+            old_ocr = self.ocr
+            self.ocr = OCREngine(self.cfg["ocr"], lazy=lazy)
+            if lazy:
+                self.ocr.start_warmup(warmup)
+            # Wait for a frame still running on the old engine before closing it
+            with self._ocr_lock:
+                old_ocr.close()
+            actions["reloaded"].append("ocr")
+            # Worker processes hold their own engines
+            restart = restart or self.workers is not None or "workers" in ocr_keys
+        elif ocr_keys:
+            self.ocr.apply_settings(self.cfg["ocr"])
+        if ocr_keys & {"change_detection", "change_min_blocks", "change_pixel_delta", "change_persist_frames"}:
+            self.change_gate = FrameChangeDetector(self.cfg["ocr"])
+
+        if tts_keys - RUNTIME_KEYS["tts"]:
+            old_tts = self.tts
+            tts = TTSEngine(self.cfg["tts"], lazy=lazy, tenant=self.name, audio_out=self.audio)
+            if lazy:
+                tts.start_warmup(warmup)
+            # Cut off the utterance playing on the old engine and swap once it has returned;
+            # until then stop requests still reach the engine that is speaking
+            old_tts.stop()
+            with self._tts_lock:
+                self.tts = tts
+            actions["reloaded"].append("tts")
+        elif tts_keys:
+            self.tts.apply_settings(self.cfg["tts"])
+        if tts_keys & {"max_speech_lag", "speech_queue_lines"}:
+            self.speech.configure(
+                max_lines=int(self.cfg["tts"].get("speech_queue_lines", 20)),
+                max_lag=float(self.cfg["tts"].get("max_speech_lag", 10.0)),
+            )
+        if tts_keys & {"stream_sample_rate", "stream_buffer_seconds"}:
+            self.audio.configure(
+                int(self.cfg["tts"].get("stream_sample_rate", 22050)),
+                float(self.cfg["tts"].get("stream_buffer_seconds", 15.0)),
+            )
+        if "spoken_memory" in tts_keys:
+            self.spoken_lines = deque(self.spoken_lines, maxlen=int(self.cfg["tts"].get("spoken_memory", 200)))
+
+        if "max_history" in changed.get("app", set()):
+            with self.lock:
+                self.history = deque(self.history, maxlen=int(self.cfg["app"].get("max_history", 50)))
+        # Slot counts are process-wide and follow the default pipeline's config
+        if self.name == "default":
+            for resource, default in (("ocr", 2), ("tts", 1)):
+                if f"{resource}_slots" in changed.get("app", set()):
+                    SCHEDULER.configure(resource, int(self.cfg["app"].get(f"{resource}_slots", default)))
+
+        if restart and self.running:
+            self.stop()
+            self.start()
+            actions["restarted"] = True
+        logger.info("Reconfigured: %s", actions)
+        return actions
+
+    def get_readiness(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ocr.is_ready() and self.tts.is_ready(),
+            "ocr": dict(self.ocr.engine_state),
+            "tts": dict(self.tts.engine_state),
         }
 
-    def get_history(self):
+    def get_history(
+        self,
+        since: Optional[int] = None,
+        before: Optional[int] = None,
+        limit: Optional[int] = None,
+        q: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Newest-first transcript page; see TranscriptStore.query for the cursor semantics."""
+        if limit is None:
+            limit = int(self.cfg["app"].get("max_history", 50))
         with self.lock:
-            return list(self.history)[::-1]
+            entries = list(self.history)
+        if since is not None:
+            entries = [e for e in entries if e["id"] > since]
+        if before is not None:
+            entries = [e for e in entries if e["id"] < before]
+        if q:
+            entries = [e for e in entries if q.lower() in e["text"].lower()]
+        if self.store is not None:
+            # Recent entries may still be queued for the writer; merge them in from memory
+            rows = self.store.query(since=since, before=before, limit=limit, q=q)
+            seen = {e["id"] for e in rows}
+            entries = sorted(rows + [e for e in entries if e["id"] not in seen], key=lambda e: e["id"])
+        entries = entries[:limit] if since is not None else entries[-limit:]
+        return entries[::-1]
+
+    def close(self):
+        """Stop the pipeline and flush the transcript to disk."""
+        self.stop()
+        self.speech.close()
+        if self.store is not None:
+            self.store.close()
+        QUEUE_DEPTH.remove(queue="frame", pipeline=self.name)
+        QUEUE_DEPTH.remove(queue="speech", pipeline=self.name)
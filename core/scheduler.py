@@ -0,0 +1,112 @@
+import logging
+import threading
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from typing import Deque, Dict, Optional
+
+logger = logging.getLogger("scheduler")
+
+
+class _Resource:
+    def __init__(self, capacity: int):
+        self.capacity = max(1, capacity)
+        self.in_use = 0
+        # tenant -> waiting tickets, in round-robin order (next tenant first)
+        self.waiting: "OrderedDict[str, Deque[threading.Event]]" = OrderedDict()
+        self.granted: Dict[str, int] = {}
+
+
+class FairScheduler:
+    """
+    Fair-share admission for shared compute (OCR, TTS) across pipelines.
+
+    Each resource has a number of slots. While a slot is free work starts
+    immediately; once all slots are busy, waiters queue per tenant (pipeline)
+    and freed slots are handed out round-robin across tenants, so one busy
+    classroom with a backlog can't starve the others.
+    """
+
+    def __init__(self, capacities: Optional[Dict[str, int]] = None):
+        self._lock = threading.Lock()
+        self._resources: Dict[str, _Resource] = {}
+        for name, capacity in (capacities or {}).items():
+            self._resources[name] = _Resource(capacity)
+
+    def configure(self, name: str, capacity: int):
+        """Set a resource's slot count; takes effect immediately, also for queued waiters."""
+        with self._lock:
+            res = self._resources.setdefault(name, _Resource(capacity))
+            res.capacity = max(1, capacity)
+            self._hand_out(res)
+
+    @staticmethod
+    def _hand_out(res: _Resource):
+        """Start queued waiters while slots are free; caller holds the lock."""
+        while res.waiting and res.in_use < res.capacity:
+            # Next tenant in turn gets the slot, then goes to the back of the line
+            tenant, queue = next(iter(res.waiting.items()))
+            ticket = queue.popleft()
+            del res.waiting[tenant]
+            if queue:
+                res.waiting[tenant] = queue
+            res.in_use += 1
+            res.granted[tenant] = res.granted.get(tenant, 0) + 1
+            ticket.set()
+
+    def _resource(self, name: str) -> _Resource:
+        res = self._resources.get(name)
+        if res is None:
+            res = self._resources[name] = _Resource(1)
+        return res
+
+    def acquire(self, name: str, tenant: str, timeout: Optional[float] = None) -> bool:
+        with self._lock:
+            res = self._resource(name)
+            if res.in_use < res.capacity and not res.waiting:
+                res.in_use += 1
+                res.granted[tenant] = res.granted.get(tenant, 0) + 1
+                return True
+            ticket = threading.Event()
+            res.waiting.setdefault(tenant, deque()).append(ticket)
+        if ticket.wait(timeout):
+            return True
+        with self._lock:
+            queue = res.waiting.get(tenant)
+            if queue is not None and ticket in queue:
+                queue.remove(ticket)
+                if not queue:
+                    del res.waiting[tenant]
+                return False
+        # Granted between the timeout and taking the lock
+        return True
+
+    def release(self, name: str):
+        with self._lock:
+            res = self._resource(name)
+            res.in_use = max(0, res.in_use - 1)
+            # After a shrink, waiters only start once in_use is below the new capacity
+            self._hand_out(res)
+
+    @contextmanager
+    def slot(self, name: str, tenant: str):
+        self.acquire(name, tenant)
+        try:
+            yield
+        finally:
+            self.release(name)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                name: {
+                    "capacity": res.capacity,
+                    "in_use": res.in_use,
+                    "waiting": {t: len(q) for t, q in res.waiting.items()},
+                    "granted": dict(res.granted),
+                }
+                for name, res in self._resources.items()
+            }
+
+
+# Shared by every pipeline in this process
+SCHEDULER = FairScheduler({"ocr": 2, "tts": 1})
@@ -0,0 +1,72 @@
+import logging
+from typing import List, Tuple
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger("segmentation")
+
+Box = Tuple[int, int, int, int]  # x, y, w, h
+
+
+def group_rows(boxes: List[Box]) -> List[List[Box]]:
+    """Group boxes into rows (top-to-bottom), each row sorted left-to-right."""
+    rows: List[List[Box]] = []
+    for box in sorted(boxes, key=lambda b: b[1] + b[3] / 2):
+        cy = box[1] + box[3] / 2
+        if rows:
+            ref = rows[-1][0]
+            # Same row if the vertical centre falls inside the row's first box
+            if ref[1] <= cy <= ref[1] + ref[3]:
+                rows[-1].append(box)
+                continue
+        rows.append([box])
+    return [sorted(row, key=lambda b: b[0]) for row in rows]
+
+
+def sort_reading_order(boxes: List[Box]) -> List[Box]:
+    """Flatten boxes into reading order."""
+    return [b for row in group_rows(boxes) for b in row]
+
+
+def detect_text_lines(gray: np.ndarray, max_lines: int = 40, pad: int = 4) -> List[Box]:
+    """
+    Morphology-based text line detector.
+
+    Works for dark-on-light (whiteboard, slides) and light-on-dark (chalk)
+    alike because it thresholds the morphological gradient rather than the
+    raw intensity. Characters are joined horizontally into line blobs whose
+    bounding boxes are returned in reading order.
+    """
+    if gray is None or gray.size == 0:
+        return []
+    h, w = gray.shape[:2]
+
+    grad = cv2.morphologyEx(gray, cv2.MORPH_GRADIENT, cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3)))
+    _, bw = cv2.threshold(grad, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)
+
+    # Wide, short kernel bridges letter and word gaps but not line gaps
+    kw = max(15, w // 40)
+    joined = cv2.morphologyEx(bw, cv2.MORPH_CLOSE, cv2.getStructuringElement(cv2.MORPH_RECT, (kw, 1)))
+    joined = cv2.morphologyEx(joined, cv2.MORPH_OPEN, cv2.getStructuringElement(cv2.MORPH_RECT, (3, 3)))
+
+    contours, _ = cv2.findContours(joined, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    boxes: List[Box] = []
+    for c in contours:
+        x, y, bw_, bh = cv2.boundingRect(c)
+        if bh < 8 or bw_ < 12 or bh > h * 0.5:
+            continue
+        # Text lines are wider than tall; tall blobs are people, frames or noise
+        if bw_ < bh * 0.8:
+            continue
+        fill = cv2.countNonZero(bw[y:y + bh, x:x + bw_]) / float(bw_ * bh)
+        if fill < 0.08:
+            continue
+        x0, y0 = max(0, x - pad), max(0, y - pad)
+        x1, y1 = min(w, x + bw_ + pad), min(h, y + bh + pad)
+        boxes.append((x0, y0, x1 - x0, y1 - y0))
+
+    if len(boxes) > max_lines:
+        # Keep the largest blobs - tiny ones are usually noise
+        boxes = sorted(boxes, key=lambda b: b[2] * b[3], reverse=True)[:max_lines]
+    return sort_reading_order(boxes)
@@ -0,0 +1,72 @@
+import logging
+import os
+from typing import List
+
+import cv2
+
+logger = logging.getLogger("sources")
+
+IMAGE_EXTS = (".png", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff", ".webp")
+
+
+class ImageDirectorySource:
+    """
+    A directory of still images played back like a camera.
+
+    Mirrors the parts of cv2.VideoCapture the capture loop uses (isOpened,
+    grab/retrieve, read, get, set, release). Frames are taken in file-name
+    order and timestamped at a fixed `fps`, so a folder of board snapshots
+    can be replayed at real-time pace or as fast as possible.
+    """
+
+    def __init__(self, path: str, fps: float = 1.0):
+        self.path = path
+        self.fps = max(0.001, float(fps))
+        self.files: List[str] = []
+        if os.path.isdir(path):
+            self.files = sorted(
+                os.path.join(path, name) for name in os.listdir(path) if name.lower().endswith(IMAGE_EXTS)
+            )
+        if not self.files:
+            logger.error("No images found in %s", path)
+        self.pos = -1  # index of the last grabbed image
+
+    def isOpened(self) -> bool:
+        return bool(self.files)
+
+    def grab(self) -> bool:
+        if self.pos + 1 >= len(self.files):
+            return False
+        self.pos += 1
+        return True
+
+    def retrieve(self):
+        if self.pos < 0 or self.pos >= len(self.files):
+            return False, None
+        frame = cv2.imread(self.files[self.pos])
+        return frame is not None, frame
+
+    def read(self):
+        if not self.grab():
+            return False, None
+        return self.retrieve()
+
+    def get(self, prop: int) -> float:
+        if prop == cv2.CAP_PROP_POS_MSEC:
+            return max(0, self.pos) * 1000.0 / self.fps
+        if prop == cv2.CAP_PROP_FPS:
+            return self.fps
+        if prop == cv2.CAP_PROP_FRAME_COUNT:
+            return float(len(self.files))
+        if prop == cv2.CAP_PROP_POS_FRAMES:
+            return float(self.pos + 1)
+        return 0.0
+
+    def set(self, prop: int, value: float) -> bool:
+        if prop == cv2.CAP_PROP_POS_FRAMES:
+            self.pos = int(value) - 1
+            return True
+        return False
+
+    def release(self):
+        self.files = []
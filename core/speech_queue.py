@@ -0,0 +1,183 @@
+import logging
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, List, Optional, Tuple
+
+from .metrics import METRICS
+
+logger = logging.getLogger("speech_queue")
+
+SPEECH_DROPPED = METRICS.counter(
+    "assistive_speech_dropped_total", "Queued speech discarded before it was spoken (stale, overflow, interrupted)", ("pipeline", "reason")
+)
+
+
+class Utterance:
+    """One piece of text handed to TTS; wait() blocks until it was spoken or discarded."""
+
+    def __init__(self, text: str, priority: str, ts: Optional[float] = None):
+        self.text = text
+        self.priority = priority
+        self.ts = ts if ts is not None else time.monotonic()
+        self.status = "queued"
+        self._done = threading.Event()
+
+    def finish(self, status: str):
+        self.status = status
+        self._done.set()
+
+    def wait(self, timeout: Optional[float] = None) -> str:
+        self._done.wait(timeout)
+        return self.status
+
+
+class SpeechQueue:
+    """
+    Bounded speech backlog between OCR and TTS.
+
+    Manual requests (/api/speak) always go before board text. Board text is
+    not queued utterance by utterance: new lines from every OCR update are
+    merged into one pending block, so whatever has piled up while TTS was
+    busy is spoken in a single call. Each line remembers when it was read
+    off the board, and lines older than `max_lag` seconds by the time TTS
+    gets to them are dropped, so speech never trails the board by more than
+    that. Past `max_lines` pending lines the oldest go first.
+
+    interrupt() (or say(..., interrupt=True)) drops pending board text and
+    calls `on_interrupt` to cut off whatever is playing.
+    """
+
+    def __init__(
+        self,
+        name: str = "default",
+        max_lines: int = 20,
+        max_manual: int = 8,
+        max_lag: float = 10.0,
+        on_interrupt: Optional[Callable[[], None]] = None,
+    ):
+        self.name = name
+        self.max_lines = max(1, int(max_lines))
+        self.max_manual = max(1, int(max_manual))
+        self.max_lag = float(max_lag)
+        self.on_interrupt = on_interrupt
+        self._cond = threading.Condition()
+        self._manual: Deque[Utterance] = deque()
+        self._board: Deque[Tuple[float, str]] = deque()
+        self._closed = False
+        self._stats = {"board_updates": 0, "coalesced": 0, "stale": 0, "overflow": 0, "interrupted": 0, "rejected": 0}
+
+    def configure(self, max_lines: Optional[int] = None, max_lag: Optional[float] = None):
+        with self._cond:
+            if max_lines is not None:
+                self.max_lines = max(1, int(max_lines))
+                self._trim_board()
+            if max_lag is not None:
+                self.max_lag = float(max_lag)
+
+    def _drop(self, reason: str, n: int = 1):
+        if n:
+            self._stats[reason] += n
+            SPEECH_DROPPED.inc(n, pipeline=self.name, reason=reason)
+
+    def _trim_board(self):
+        overflow = len(self._board) - self.max_lines
+        for _ in range(max(0, overflow)):
+            self._board.popleft()
+        self._drop("overflow", max(0, overflow))
+
+    def add_board(self, lines: List[str], ts: Optional[float] = None):
+        """Queue new board lines (ts = monotonic time they were captured)."""
+        lines = [line for line in lines if line.strip()]
+        if not lines:
+            return
+        ts = ts if ts is not None else time.monotonic()
+        with self._cond:
+            if self._board:
+                self._stats["coalesced"] += 1
+            self._stats["board_updates"] += 1
+            self._board.extend((ts, line) for line in lines)
+            self._trim_board()
+            self._cond.notify()
+
+    def say(self, text: str, interrupt: bool = False) -> Optional[Utterance]:
+        """Queue a manual request ahead of board text; None when the manual queue is full."""
+        utt = Utterance(text, "manual")
+        with self._cond:
+            full = len(self._manual) >= self.max_manual
+        if interrupt and not full:
+            # Stop playback before queueing, so the stop can't land on this utterance
+            self.interrupt(board_only=True)
+        with self._cond:
+            if len(self._manual) >= self.max_manual:
+                self._drop("rejected")
+                return None
+            self._manual.append(utt)
+            self._cond.notify()
+        return utt
+
+    def get(self, timeout: Optional[float] = None) -> Optional[Utterance]:
+        """Next thing to speak, or None on timeout / close. Stale board lines are dropped here."""
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        with self._cond:
+            while not self._closed:
+                if self._manual:
+                    return self._manual.popleft()
+                if self._board:
+                    cutoff = time.monotonic() - self.max_lag
+                    fresh = [(ts, line) for ts, line in self._board if ts >= cutoff]
+                    self._drop("stale", len(self._board) - len(fresh))
+                    self._board.clear()
+                    if fresh:
+                        return Utterance("\n".join(line for _, line in fresh), "board", fresh[0][0])
+                    continue
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return None
+                self._cond.wait(remaining)
+        return None
+
+    def interrupt(self, board_only: bool = False):
+        """Barge-in: drop pending board text (and manual requests unless board_only) and stop playback."""
+        with self._cond:
+            dropped = len(self._board)
+            self._board.clear()
+            manual = []
+            if not board_only:
+                manual = list(self._manual)
+                self._manual.clear()
+        for utt in manual:
+            utt.finish("interrupted")
+        self._drop("interrupted", dropped + len(manual))
+        if self.on_interrupt is not None:
+            try:
+                self.on_interrupt()
+            except Exception as e:
+                logger.warning("Interrupting playback failed: %s", e)
+
+    def clear(self):
+        """Drop pending board text without touching playback or manual requests."""
+        with self._cond:
+            self._board.clear()
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            manual = list(self._manual)
+            self._manual.clear()
+            self._board.clear()
+            self._cond.notify_all()
+        for utt in manual:
+            utt.finish("dropped")
+
+    def __len__(self) -> int:
+        return len(self._manual) + len(self._board)
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "pending_manual": len(self._manual),
+                "pending_lines": len(self._board),
+                "max_lag": self.max_lag,
+                **self._stats,
+            }
@@ -0,0 +1,84 @@
+import logging
+import queue
+import threading
+from typing import Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger("tesseract_backend")
+
+# tesserocr wraps libtesseract directly (no subprocess, no temp PNG)
+try:
+    import tesserocr  # type: ignore
+    TESSEROCR_AVAILABLE = True
+except Exception:
+    tesserocr = None
+    TESSEROCR_AVAILABLE = False
+
+
+class TesseractAPIPool:
+    """
+    Pool of long-lived libtesseract handles.
+
+    pytesseract forks the tesseract binary, writes a temp image and reloads
+    the traineddata on every call. Here each handle is created once (language
+    model loaded once) and reused; NumPy buffers are handed over as raw bytes.
+    A handle is not thread-safe, so each call checks one out of the pool.
+    """
+
+    def __init__(self, lang: str = "eng", size: int = 2, tessdata: Optional[str] = None):
+        if not TESSEROCR_AVAILABLE:
+            raise RuntimeError("tesserocr is not installed")
+        self.lang = lang
+        self.size = max(1, size)
+        self.tessdata = tessdata
+        self._idle: "queue.LifoQueue" = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+        # Create one handle up front so a bad install fails here, not mid-stream
+        self._idle.put(self._new_handle())
+
+    def _new_handle(self):
+        kwargs = {"lang": self.lang}
+        if self.tessdata:
+            kwargs["path"] = self.tessdata
+        api = tesserocr.PyTessBaseAPI(**kwargs)
+        self._created += 1
+        return api
+
+    def _acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._created < self.size:
+                return self._new_handle()
+        return self._idle.get()
+
+    def recognize(self, img: np.ndarray, psm: int = 6) -> Tuple[str, float]:
+        """OCR a grayscale or BGR image; returns (text, confidence 0-1)."""
+        img = np.ascontiguousarray(img)
+        h, w = img.shape[:2]
+        bpp = 1 if img.ndim == 2 else img.shape[2]
+        api = self._acquire()
+        try:
+            api.SetPageSegMode(psm)
+            api.SetImageBytes(img.tobytes(), w, h, bpp, w * bpp)
+            text = (api.GetUTF8Text() or "").strip()
+            conf = max(0.0, float(api.MeanTextConf())) / 100.0
+            api.Clear()
+            return text, conf
+        finally:
+            self._idle.put(api)
+
+    def close(self):
+        while True:
+            try:
+                api = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                api.End()
+            except Exception:
+                pass
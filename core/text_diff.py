@@ -0,0 +1,51 @@
+import re
+from difflib import SequenceMatcher
+from typing import List
+
+_NON_WORD = re.compile(r"[^\w]+", re.UNICODE)
+_NUMBER = re.compile(r"\d+")
+
+
+def normalize_line(line: str) -> str:
+    """Lowercase and drop punctuation/spacing so OCR jitter doesn't look like an edit."""
+    return _NON_WORD.sub(" ", line.lower()).strip()
+
+
+def split_lines(text: str) -> List[str]:
+    return [ln.strip() for ln in text.splitlines() if ln.strip()]
+
+
+def new_lines(previous: List[str], current: List[str], similarity: float = 0.85) -> List[str]:
+    """
+    Lines of `current` that are new or changed compared with `previous`.
+
+    The two boards are aligned line-by-line; lines that the alignment marks as
+    inserted or replaced are kept unless they closely match some previous line
+    (OCR noise, or a line that merely moved up after an erase). Numbers must
+    match exactly: "Chapter 4" after "Chapter 3" is new content, not noise.
+    """
+    prev_keys = [normalize_line(ln) for ln in previous]
+    prev_nums = [_NUMBER.findall(k) for k in prev_keys]
+    cur_keys = [normalize_line(ln) for ln in current]
+    matcher = SequenceMatcher(None, prev_keys, cur_keys, autojunk=False)
+
+    out = []
+    for tag, _, _, j1, j2 in matcher.get_opcodes():
+        if tag not in ("insert", "replace"):
+            continue
+        for j in range(j1, j2):
+            key = cur_keys[j]
+            if not key:
+                continue
+            nums = _NUMBER.findall(key)
+            seen = False
+            for prev, prev_num in zip(prev_keys, prev_nums):
+                if nums != prev_num:
+                    continue
+                m = SequenceMatcher(None, key, prev, autojunk=False)
+                if m.real_quick_ratio() >= similarity and m.quick_ratio() >= similarity and m.ratio() >= similarity:
+                    seen = True
+                    break
+            if not seen:
+                out.append(current[j])
+    return out
@@ -0,0 +1,172 @@
+import logging
+import os
+import queue
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger("transcript_store")
+
+_COLUMNS = ("id", "ts", "text", "engine", "confidence", "frame_ts", "media_ts", "lag")
+
+
+class TranscriptStore:
+    """
+    SQLite-backed transcript of everything read from the board.
+
+    add() is called on the OCR path and only assigns an id and enqueues the
+    entry; a writer thread inserts queued entries in batches, one transaction
+    per batch. The database runs in WAL mode so history queries from the web
+    server never wait on the writer. Text is indexed with FTS5 when the
+    SQLite build has it, otherwise search falls back to LIKE.
+
+    Ids increase monotonically and are handed out before the row is written,
+    so they can be used as cursors (/api/history?since=<id>) and are already
+    present on entries pushed to dashboards.
+    """
+
+    def __init__(self, path: str, batch_size: int = 64, flush_interval: float = 1.0):
+        self.path = path
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.fts = False
+        self._local = threading.local()
+        self._queue: "queue.Queue" = queue.Queue()
+        self._id_lock = threading.Lock()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        conn = self._connect()
+        self._init_schema(conn)
+        self._next_id = (conn.execute("SELECT COALESCE(MAX(id), 0) FROM transcript").fetchone()[0] or 0) + 1
+
+        self._stop = threading.Event()
+        self._writer = threading.Thread(target=self._write_loop, name="transcript-writer", daemon=True)
+        self._writer.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=5.0)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _conn(self) -> sqlite3.Connection:
+        """Per-thread read connection."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+        return conn
+
+    def _init_schema(self, conn: sqlite3.Connection):
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS transcript ("
+            "id INTEGER PRIMARY KEY, ts REAL NOT NULL, text TEXT NOT NULL, engine TEXT, "
+            "confidence REAL, frame_ts REAL, media_ts REAL, lag REAL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS transcript_ts ON transcript(ts)")
+        try:
+            conn.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS transcript_fts "
+                "USING fts5(text, content='transcript', content_rowid='id')"
+            )
+            conn.execute(
+                "CREATE TRIGGER IF NOT EXISTS transcript_ai AFTER INSERT ON transcript BEGIN "
+                "INSERT INTO transcript_fts(rowid, text) VALUES (new.id, new.text); END"
+            )
+            conn.execute(
+                "CREATE TRIGGER IF NOT EXISTS transcript_ad AFTER DELETE ON transcript BEGIN "
+                "INSERT INTO transcript_fts(transcript_fts, rowid, text) VALUES ('delete', old.id, old.text); END"
+            )
+            self.fts = True
+        except sqlite3.OperationalError as e:
+            logger.info("FTS5 not available, search uses LIKE: %s", e)
+        conn.commit()
+        self._local.conn = conn
+
+    def add(self, entry: Dict[str, Any]) -> Dict[str, Any]:
+        """Assign the entry an id and queue it for writing. Never blocks on disk."""
+        with self._id_lock:
+            entry["id"] = self._next_id
+            self._next_id += 1
+        self._queue.put(entry)
+        return entry
+
+    def _write_loop(self):
+        conn = self._connect()
+        while not (self._stop.is_set() and self._queue.empty()):
+            try:
+                batch = [self._queue.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                continue
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                with conn:
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO transcript (id, ts, text, engine, confidence, frame_ts, media_ts, lag) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        [tuple(e.get(c) for c in _COLUMNS) for e in batch],
+                    )
+            except sqlite3.Error as e:
+                logger.error("Transcript write failed (%d entries): %s", len(batch), e)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+        conn.close()
+
+    def flush(self):
+        """Block until every queued entry is written."""
+        self._queue.join()
+
+    def query(
+        self,
+        since: Optional[int] = None,
+        before: Optional[int] = None,
+        limit: int = 50,
+        q: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Newest-first page of entries. `since` returns the oldest `limit`
+        entries after that id (so a client catching up can page forward);
+        otherwise the newest `limit` entries before `before` (or overall).
+        `q` filters by full-text search.
+        """
+        where, args = [], []
+        if since is not None:
+            where.append("t.id > ?")
+            args.append(int(since))
+        if before is not None:
+            where.append("t.id < ?")
+            args.append(int(before))
+        join = ""
+        if q:
+            if self.fts:
+                join = "JOIN transcript_fts f ON f.rowid = t.id"
+                where.append("transcript_fts MATCH ?")
+                # Quote each term so user input can't be parsed as FTS syntax
+                args.append(" ".join('"%s"' % term.replace('"', '""') for term in q.split()))
+            else:
+                where.append("t.text LIKE ?")
+                args.append(f"%{q}%")
+        sql = f"SELECT {', '.join('t.' + c for c in _COLUMNS)} FROM transcript t {join}"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY t.id " + ("ASC" if since is not None else "DESC") + " LIMIT ?"
+        args.append(max(1, int(limit)))
+        try:
+            rows = self._conn().execute(sql, args).fetchall()
+        except sqlite3.Error as e:
+            logger.warning("Transcript query failed: %s", e)
+            return []
+        entries = [{c: v for c, v in zip(_COLUMNS, row) if v is not None} for row in rows]
+        return entries[::-1] if since is not None else entries
+
+    def count(self) -> int:
+        return self._conn().execute("SELECT COUNT(*) FROM transcript").fetchone()[0]
+
+    def close(self):
+        self._stop.set()
+        self._writer.join(timeout=5)
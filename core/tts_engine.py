@@ -1,43 +1,172 @@
 # core/tts_engine.py
+import importlib.util
 import logging
 import sounddevice as sd
 import soundfile as sf
 import numpy as np
 import os
+import queue
+import re
 import subprocess
-from typing import Optional
+import threading
+import time
+from typing import Callable, List, Optional, Tuple
+
+from .audio_cache import AudioCache
+from .espeak_backend import get_backend
+from .metrics import TTS_SECONDS
+from .model_registry import MODELS
+from .scheduler import SCHEDULER
 
 logger = logging.getLogger("tts_engine")
 
-# Try coqui TTS
-COQUI_AVAILABLE = False
+# Coqui TTS pulls in torch, so only check that it is installed here; the
+# actual import happens when the model is loaded.
 try:
-    from TTS.api import TTS as CoquiTTS
-    COQUI_AVAILABLE = True
+    COQUI_AVAILABLE = importlib.util.find_spec("TTS") is not None
 except Exception:
     COQUI_AVAILABLE = False
 
+# Sentence ends, clause breaks before long continuations, and line breaks
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?;:])\s+|\n+")
+_CLAUSE_SPLIT = re.compile(r"(?<=,)\s+")
+
+
+def split_sentences(text: str, max_chars: int = 200) -> List[str]:
+    """Split text into speakable chunks; overly long sentences are cut at commas."""
+    chunks = []
+    for sentence in _SENTENCE_SPLIT.split(text):
+        sentence = sentence.strip()
+        if not sentence:
+            continue
+        if len(sentence) <= max_chars:
+            chunks.append(sentence)
+            continue
+        part = ""
+        for clause in _CLAUSE_SPLIT.split(sentence):
+            if part and len(part) + len(clause) + 1 > max_chars:
+                chunks.append(part)
+                part = clause
+            else:
+                part = f"{part} {clause}".strip()
+        if part:
+            chunks.append(part)
+    return chunks
+
 
 class TTSEngine:
-    def __init__(self, cfg):
+    def __init__(self, cfg, lazy: bool = False, tenant: str = "default", audio_out=None):
         self.cfg = cfg
+        self.tenant = tenant  # pipeline name, for the shared synthesis scheduler
+        # AudioBroadcaster for listeners on their own devices (None = server speakers only)
+        self.audio_out = audio_out
         self.engine = cfg.get("engine", "coqui")
         self.coqui = None
         self.last_audio_path = None
-        if self.engine == "coqui" and COQUI_AVAILABLE:
-            try:
-                model = cfg.get("coqui_model", "tts_models/en/vctk/vits")
-                if model:
-                    self.coqui = CoquiTTS(model_name=model, progress_bar=False, gpu=False)
-                    logger.info("Coqui TTS loaded: %s", model)
-            except Exception as e:
-                logger.warning("Failed to initialize Coqui TTS. Please ensure you have 'espeak-ng' installed (`sudo apt-get install espeak-ng` on Debian/Ubuntu, or see your distribution's package manager). Error: %s", e)
-                self.coqui = None
+        self.model_name = cfg.get("coqui_model", "tts_models/en/vctk/vits")
+        # Synthesized audio for repeated headings/phrases (memory LRU + optional WAV dir)
+        self.cache = None
+        if cfg.get("audio_cache", True):
+            self.cache = AudioCache(
+                max_bytes=int(float(cfg.get("audio_cache_mb", 64)) * 1024 * 1024),
+                cache_dir=cfg.get("audio_cache_dir") or None,
+                max_disk_bytes=int(float(cfg.get("audio_cache_disk_mb", 256)) * 1024 * 1024),
+            )
+        # Sentence streaming: play chunk 1 while later chunks are synthesized
+        self.streaming = bool(cfg.get("streaming", True))
+        self.stream_prefetch = int(cfg.get("stream_prefetch", 2))
+        self.last_ttfa = None
+        self._ttfa_total = 0.0
+        self._ttfa_count = 0
+        # espeak is always usable; Coqui joins once loaded (speak() falls back until then)
+        if self.engine != "coqui" or not self.model_name:
+            coqui_state = "disabled"
+        elif not COQUI_AVAILABLE:
+            coqui_state = "unavailable"
+        else:
+            coqui_state = "pending"
+        self.engine_state = {"espeak": "ready", "coqui": coqui_state}
+        self._warmup_thread = None
+        # Barge-in: stop() sets this and cuts off playback; speak() clears it
+        self._cancel = threading.Event()
+        self._proc: Optional[subprocess.Popen] = None
+        # Set once a backend has actually produced audio for the current speak()
+        self._played = False
+        # Fallback voice; one libespeak-ng instance shared by every engine in the process
+        self.espeak = get_backend() if os.name == "posix" else None
+        if self.espeak is not None and not self.espeak.available:
+            self.engine_state["espeak"] = "unavailable"
+        if not lazy:
+            self.load_engines(warmup=False)
+
+    def load_engines(self, warmup: bool = True):
+        """
+        Load Coqui through the shared model registry (reused if another engine
+        already loaded it); with warmup=True a fresh model synthesizes one short
+        phrase before first use.
+        """
+        if self.engine_state["coqui"] != "pending":
+            return
+        self.engine_state["coqui"] = "loading"
+        try:
+            def load():
+                from TTS.api import TTS as CoquiTTS
+
+                coqui = CoquiTTS(model_name=self.model_name, progress_bar=False, gpu=False)
+                logger.info("Coqui TTS loaded: %s", self.model_name)
+                if warmup:
+                    speakers = getattr(coqui, "speakers", None)
+                    try:
+                        coqui.tts(text="Ready.", speaker=self.cfg.get("voice") or (speakers[0] if speakers else None))
+                    except TypeError:
+                        coqui.tts("Ready.")
+                return coqui
+
+            self.coqui = MODELS.get_or_load(("coqui", self.model_name), load)
+            self.engine_state["coqui"] = "ready"
+        except Exception as e:
+            logger.warning("Failed to initialize Coqui TTS. Please ensure you have 'espeak-ng' installed (`sudo apt-get install espeak-ng` on Debian/Ubuntu, or see your distribution's package manager). Error: %s", e)
+            self.coqui = None
+            self.engine_state["coqui"] = "failed"
+
+    def start_warmup(self, warmup: bool = True):
+        """Load Coqui in the background; espeak serves until it is ready."""
+        if self._warmup_thread is not None:
+            return
+        self._warmup_thread = threading.Thread(target=self.load_engines, args=(warmup,), name="tts-warmup", daemon=True)
+        self._warmup_thread.start()
+
+    def is_ready(self) -> bool:
+        return self.engine_state["coqui"] not in ("pending", "loading")
+
+    def apply_settings(self, cfg: dict):
+        """Pick up runtime-tunable settings without reloading Coqui."""
+        self.cfg = cfg
+        self.streaming = bool(cfg.get("streaming", True))
+        self.stream_prefetch = int(cfg.get("stream_prefetch", 2))
+
+    def stop(self):
+        """Interrupt the current utterance (and the rest of a streamed one)."""
+        self._cancel.set()
+        try:
+            sd.stop()
+        except Exception as e:
+            logger.debug("sounddevice stop failed: %s", e)
+        proc = self._proc
+        if proc is not None and proc.poll() is None:
+            proc.terminate()
 
     def _play_numpy_audio(self, audio: np.ndarray, sr: int):
+        if self._cancel.is_set():
+            return
+        if len(audio):
+            self._played = True
+        if self.audio_out is not None:
+            self.audio_out.publish(audio, sr)
         try:
-            sd.play(audio, samplerate=sr)
-            sd.wait()
+            with TTS_SECONDS.time(phase="playback", engine="sounddevice"):
+                sd.play(audio, samplerate=sr)
+                sd.wait()
         except Exception as e:
             logger.debug("sounddevice playback failed: %s", e)
             tmp = "last_audio.wav"
@@ -51,39 +180,183 @@ class TTSEngine:
             except Exception:
                 pass
 
-    def speak(self, text: str, voice: Optional[str] = "p335", speed: float = 1.0, volume: float = 0.9):
+    def _synthesize_coqui(self, text: str, voice: Optional[str], speed: float) -> Optional[Tuple[np.ndarray, int]]:
+        """Synthesize with Coqui (or fetch from the audio cache). Raises on Coqui errors."""
+        key = None
+        if self.cache is not None:
+            key = AudioCache.make_key(text, voice, speed, self.model_name)
+            hit = self.cache.get(key)
+            if hit is not None:
+                return hit
+        sr = getattr(getattr(self.coqui, "synthesizer", None), "output_sample_rate", None) or 22050
+        t0 = time.perf_counter()
+        # Fair share of synthesis between pipelines, one call at a time per model
+        with SCHEDULER.slot("tts", self.tenant), MODELS.inference_lock(self.coqui):
+            try:
+                audio = self.coqui.tts(text=text, speaker=voice, speed=speed)
+            except TypeError:
+                audio = self.coqui.tts(text)
+        TTS_SECONDS.observe(time.perf_counter() - t0, phase="synthesis", engine="coqui")
+        if isinstance(audio, str):
+            self.last_audio_path = audio
+            audio, sr = sf.read(audio, dtype="float32")
+        elif isinstance(audio, (list, np.ndarray)):
+            audio = np.asarray(audio, dtype=np.float32)
+        else:
+            logger.warning("Coqui returned unexpected audio type: %s", type(audio))
+            return None
+        if key is not None:
+            self.cache.put(key, audio, sr)
+        return audio, sr
+
+    def _record_ttfa(self, started: float):
+        """Time from speak() being called to the first sample being handed to playback."""
+        self.last_ttfa = time.monotonic() - started
+        self._ttfa_total += self.last_ttfa
+        self._ttfa_count += 1
+
+    def speak(self, text: str, voice: Optional[str] = "p335", speed: float = 1.0, volume: float = 0.9) -> bool:
+        """
+        Speak text. True if a backend produced audio and stop() didn't cut it
+        short; False if it was interrupted (see `interrupted`) or no backend
+        could speak at all.
+        """
         if not text:
-            return
+            return True
+        self._cancel.clear()
+        self._played = False
+        self._speak(text, voice, speed, volume)
+        return self._played and not self._cancel.is_set()
+
+    @property
+    def interrupted(self) -> bool:
+        """True if stop() interrupted the last speak()."""
+        return self._cancel.is_set()
+
+    def _speak(self, text: str, voice: Optional[str], speed: float, volume: float):
+        started = time.monotonic()
         if self.coqui:
+            if self.streaming:
+                chunks = split_sentences(text)
+                if len(chunks) > 1:
+                    self._speak_stream(chunks, voice, speed, volume, started)
+                    return
             try:
-                audio = None
-                sr = 22050
-                try:
-                    audio = self.coqui.tts(text=text, speaker=voice, speed=speed)
-                except TypeError:
-                    audio = self.coqui.tts(text)
-                if isinstance(audio, str):
-                    self.last_audio_path = audio
-                    data, sr = sf.read(audio, dtype="float32")
-                    self._play_numpy_audio(data, sr)
-                elif isinstance(audio, np.ndarray):
-                    self._play_numpy_audio(audio, sr)
-                else:
-                    logger.warning("Coqui returned unexpected audio type: %s", type(audio))
+                out = self._synthesize_coqui(text, voice, speed)
+                if out is not None:
+                    self._record_ttfa(started)
+                    self._play_numpy_audio(*out)
             except Exception as e:
                 logger.warning("Coqui playback failed, falling back: %s", e)
                 self._espeak(text, speed, volume, voice)
         else:
-            self._espeak(text, speed, volume, voice)
+            self._espeak(text, speed, volume, voice, started)
+
+    def _speak_stream(
+        self,
+        chunks: List[str],
+        voice: Optional[str],
+        speed: float,
+        volume: float,
+        started: float,
+        synthesize: Optional[Callable[..., Optional[Tuple[np.ndarray, int]]]] = None,
+    ):
+        """
+        Synthesize chunks in a producer thread and play each one as soon as it
+        is ready. `synthesize(chunk, voice, speed, volume)` defaults to Coqui,
+        whose failed chunks fall back to espeak.
+        """
+        fallback = synthesize is None
+        synthesize = synthesize or (lambda chunk, voice, speed, volume: self._synthesize_coqui(chunk, voice, speed))
+        ready: "queue.Queue" = queue.Queue(maxsize=max(1, self.stream_prefetch))
+        done = object()
 
-    def _espeak(self, text: str, speed: float, volume: float, voice: Optional[str] = None):
+        def produce():
+            try:
+                for chunk in chunks:
+                    if self._cancel.is_set():
+                        break
+                    try:
+                        out = synthesize(chunk, voice, speed, volume)
+                    except Exception as e:
+                        logger.warning("Synthesis failed: %s", e)
+                        out = None
+                    ready.put((chunk, out))
+            finally:
+                ready.put(done)
+
+        threading.Thread(target=produce, name="tts-stream", daemon=True).start()
+        first = True
+        while True:
+            item = ready.get()
+            if item is done:
+                break
+            chunk, out = item
+            if self._cancel.is_set():
+                continue  # drain so the producer can finish
+            if first:
+                self._record_ttfa(started)
+                first = False
+            if out is not None:
+                self._play_numpy_audio(*out)
+            elif fallback:
+                self._espeak(chunk, speed, volume, voice)
+
+    def stats(self) -> dict:
+        return {
+            "streaming": self.streaming,
+            "espeak": self.espeak.mode if self.espeak is not None else "system",
+            "last_ttfa": round(self.last_ttfa, 3) if self.last_ttfa is not None else None,
+            "avg_ttfa": round(self._ttfa_total / self._ttfa_count, 3) if self._ttfa_count else None,
+        }
+
+    def cache_stats(self) -> dict:
+        return self.cache.stats() if self.cache is not None else {}
+
+    def _run(self, cmd: List[str]):
+        """Run a speech subprocess to completion; stop() can terminate it."""
+        if self._cancel.is_set():
+            return
+        self._proc = subprocess.Popen(cmd)
+        try:
+            if self._proc.wait() == 0:
+                self._played = True
+        finally:
+            self._proc = None
+
+    def _synthesize_espeak(self, text: str, voice: Optional[str], speed: float, volume: float) -> Optional[Tuple[np.ndarray, int]]:
+        """espeak-ng PCM through the shared in-process backend (or the audio cache)."""
+        key = None
+        if self.cache is not None:
+            # espeak bakes the volume into the samples, so it is part of the key
+            key = AudioCache.make_key(text, voice, speed, f"espeak-ng@{float(volume):.2f}")
+            hit = self.cache.get(key)
+            if hit is not None:
+                return hit
+        t0 = time.perf_counter()
+        out = self.espeak.synthesize(text, speed=speed, volume=volume, voice=voice, cancel=self._cancel)
+        TTS_SECONDS.observe(time.perf_counter() - t0, phase="synthesis", engine="espeak")
+        if out is not None and key is not None and not self._cancel.is_set():
+            self.cache.put(key, *out)
+        return out
+
+    def _espeak(self, text: str, speed: float, volume: float, voice: Optional[str] = None, started: Optional[float] = None):
+        if os.name == "posix" and self.espeak.available:
+            # Same path as Coqui: cached PCM, sentence streaming, speakers and listeners
+            started = started if started is not None else time.monotonic()
+            chunks = split_sentences(text) if self.streaming else []
+            if len(chunks) > 1:
+                self._speak_stream(chunks, voice, speed, volume, started, synthesize=self._synthesize_espeak)
+                return
+            out = self._synthesize_espeak(text, voice, speed, volume)
+            if out is not None:
+                self._record_ttfa(started)
+                self._play_numpy_audio(*out)
+            return
+        t0 = time.perf_counter()
         try:
             if os.name == "posix":
-                cmd = ["espeak-ng", f"-s{int(150*speed)}", f"-a{int(100*volume*100)}"]
-                if voice:
-                    cmd += ["-v", voice]  # e.g. "en+f3" for female voice
-                cmd.append(text)
-                subprocess.run(cmd, check=False)
+                logger.warning("espeak-ng not found; install espeak-ng (library or binary) for fallback speech")
             elif os.name == "nt":
                 ps_voice = f'$s.SelectVoice("{voice}")' if voice else ""
                 ps = (
@@ -94,8 +367,10 @@ class TTSEngine:
                     f'$s.Volume={int(100*volume)}; '
                     f'$s.Speak("{text}");'
                 )
-                subprocess.run(["powershell", "-Command", ps], check=False)
+                self._run(["powershell", "-Command", ps])
             else:
                 print(text)
         except Exception as e:
-            logger.exception("Fallback TTS failed: %s", e)
\ No newline at end of file
+            logger.exception("Fallback TTS failed: %s", e)
+        # System.Speech synthesizes and plays in one call
+        TTS_SECONDS.observe(time.perf_counter() - t0, phase="speak", engine="espeak")
\ No newline at end of file
@@ -1,11 +1,22 @@
 // Modern Dashboard JavaScript for Assistive OCR→TTS
 
 class Dashboard {
-    constructor(config, voices) {
+    constructor(config, voices, pipelineId = 'default') {
         this.config = config;
         this.voices = voices;
+        this.pipelineId = pipelineId;
+        // Per-classroom routes; the unprefixed /api routes act on "default"
+        this.apiBase = pipelineId === 'default' ? '/api' : `/api/pipelines/${encodeURIComponent(pipelineId)}`;
         this.statusInterval = null;
         this.historyInterval = null;
+        this.eventSource = null;
+        this.audioSocket = null;
+        this.audioCtx = null;
+        this.audioNextTime = 0;
+        this.history = [];
+        this.lastId = null;
+        this.searchQuery = '';
+        this.searchTimer = null;
         this.isRunning = false;
     }
 
@@ -13,7 +24,7 @@ class Dashboard {
         this.setupEventListeners();
         this.updateRangeValues();
         this.loadConfig();
-        this.startPolling();
+        this.connectEvents();
         this.showAlert('info', 'Dashboard loaded. Click "Start" to begin OCR processing.');
     }
 
@@ -24,12 +35,21 @@ class Dashboard {
         document.getElementById('replayBtn').addEventListener('click', () => this.replayAudio());
         document.getElementById('testCameraBtn').addEventListener('click', () => this.testCamera());
         document.getElementById('testOcrBtn').addEventListener('click', () => this.testOCR());
+        document.getElementById('previewBtn').addEventListener('click', () => this.togglePreview());
+        document.getElementById('listenBtn').addEventListener('click', () => this.toggleListen());
+        document.getElementById('stopSpeechBtn').addEventListener('click', () => this.stopSpeech());
 
         // Form submissions
         document.getElementById('ocrForm').addEventListener('submit', (e) => this.saveOCRConfig(e));
         document.getElementById('ttsForm').addEventListener('submit', (e) => this.saveTTSConfig(e));
         document.getElementById('cameraForm').addEventListener('submit', (e) => this.saveCameraConfig(e));
 
+        // Transcript search (debounced)
+        document.getElementById('historySearch').addEventListener('input', (e) => {
+            clearTimeout(this.searchTimer);
+            this.searchTimer = setTimeout(() => this.searchHistory(e.target.value.trim()), 300);
+        });
+
         // Range inputs - update display values
         document.getElementById('captureInterval').addEventListener('input', (e) => {
             document.getElementById('captureIntervalValue').textContent = parseFloat(e.target.value).toFixed(1);
@@ -90,6 +110,9 @@ class Dashboard {
             document.getElementById('cameraSource').value = this.config.camera.source_type || 'opencv';
             document.getElementById('cameraId').value = this.config.camera.camera_id || 0;
             document.getElementById('resolution').value = this.config.camera.resolution || '1080p';
+            document.getElementById('fourcc').value = this.config.camera.fourcc ?? 'MJPG';
+            document.getElementById('sourcePath').value = this.config.camera.source_path || '';
+            document.getElementById('replaySpeed').value = this.config.camera.replay_speed ?? 1.0;
         }
 
         this.updateRangeValues();
@@ -97,7 +120,7 @@ class Dashboard {
 
     async startPipeline() {
         try {
-            const response = await fetch('/api/start', { method: 'POST' });
+            const response = await fetch(`${this.apiBase}/start`, { method: 'POST' });
             const data = await response.json();
             if (data.status === 'started') {
                 this.isRunning = true;
@@ -113,7 +136,7 @@ class Dashboard {
 
     async stopPipeline() {
         try {
-            const response = await fetch('/api/stop', { method: 'POST' });
+            const response = await fetch(`${this.apiBase}/stop`, { method: 'POST' });
             const data = await response.json();
             if (data.status === 'stopped') {
                 this.isRunning = false;
@@ -129,7 +152,7 @@ class Dashboard {
 
     async replayAudio() {
         try {
-            const response = await fetch('/api/replay');
+            const response = await fetch(`${this.apiBase}/replay`);
             if (response.status === 200) {
                 const audioBlob = await response.blob();
                 const audioUrl = URL.createObjectURL(audioBlob);
@@ -145,6 +168,83 @@ class Dashboard {
         }
     }
 
+    togglePreview() {
+        // MJPEG stream of the running pipeline's camera; closing it stops the server-side encoding
+        const img = document.getElementById('cameraPreview');
+        const btn = document.getElementById('previewBtn');
+        const show = img.classList.contains('d-none');
+        if (show && !this.isRunning) {
+            this.showAlert('info', 'Start the pipeline to see the camera preview.');
+            return;
+        }
+        img.src = show ? `${this.apiBase}/preview?t=${Date.now()}` : '';
+        img.classList.toggle('d-none', !show);
+        btn.setAttribute('aria-pressed', String(show));
+    }
+
+    async stopSpeech() {
+        try {
+            const response = await fetch(`${this.apiBase}/speak/stop`, { method: 'POST' });
+            if (response.ok) {
+                this.showAlert('info', 'Speech stopped and queue cleared.');
+            }
+        } catch (error) {
+            this.showAlert('danger', `Error stopping speech: ${error.message}`);
+        }
+    }
+
+    toggleListen() {
+        // Live speech on this device over a WebSocket, played with Web Audio
+        const btn = document.getElementById('listenBtn');
+        if (this.audioSocket) {
+            this.audioSocket.close();
+            this.audioSocket = null;
+            btn.setAttribute('aria-pressed', 'false');
+            return;
+        }
+        if (!this.audioCtx) {
+            this.audioCtx = new (window.AudioContext || window.webkitAudioContext)();
+        }
+        this.audioCtx.resume();
+        const proto = location.protocol === 'https:' ? 'wss:' : 'ws:';
+        const socket = new WebSocket(`${proto}//${location.host}${this.apiBase}/audio/ws`);
+        socket.binaryType = 'arraybuffer';
+        let sampleRate = 22050;
+        socket.onmessage = (event) => {
+            if (typeof event.data === 'string') {
+                const msg = JSON.parse(event.data);
+                if (msg.type === 'format') sampleRate = msg.sample_rate;
+                return;
+            }
+            this.playPcmChunk(new Int16Array(event.data), sampleRate);
+        };
+        socket.onclose = (event) => {
+            if (this.audioSocket === socket) {
+                this.audioSocket = null;
+                btn.setAttribute('aria-pressed', 'false');
+                // 1012: the server changed the stream format; listen again in the new one
+                if (event.code === 1012) this.toggleListen();
+            }
+        };
+        this.audioSocket = socket;
+        btn.setAttribute('aria-pressed', 'true');
+    }
+
+    playPcmChunk(pcm, sampleRate) {
+        const ctx = this.audioCtx;
+        const buffer = ctx.createBuffer(1, pcm.length, sampleRate);
+        const samples = buffer.getChannelData(0);
+        for (let i = 0; i < pcm.length; i++) samples[i] = pcm[i] / 32768;
+        const source = ctx.createBufferSource();
+        source.buffer = buffer;
+        source.connect(ctx.destination);
+        // Queue chunks back to back; start fresh after a gap instead of playing late
+        const now = ctx.currentTime;
+        if (this.audioNextTime < now) this.audioNextTime = now + 0.05;
+        source.start(this.audioNextTime);
+        this.audioNextTime += buffer.duration;
+    }
+
     async testCamera() {
         const btn = document.getElementById('testCameraBtn');
         const originalText = btn.innerHTML;
@@ -152,7 +252,7 @@ class Dashboard {
         btn.innerHTML = '<span class="loading-spinner"></span> Testing...';
 
         try {
-            const response = await fetch('/api/test-camera');
+            const response = await fetch(`${this.apiBase}/test-camera`);
             const data = await response.json();
             
             if (data.status === 'ok') {
@@ -176,7 +276,7 @@ class Dashboard {
         btn.innerHTML = '<span class="loading-spinner"></span> Testing...';
 
         try {
-            const response = await fetch('/api/test-ocr');
+            const response = await fetch(`${this.apiBase}/test-ocr`);
             const data = await response.json();
             
             if (data.status === 'ok') {
@@ -284,7 +384,7 @@ class Dashboard {
                 }
             };
 
-            const response = await fetch('/api/config', {
+            const response = await fetch(`${this.apiBase}/config`, {
                 method: 'POST',
                 headers: { 'Content-Type': 'application/json' },
                 body: JSON.stringify(payload)
@@ -293,7 +393,7 @@ class Dashboard {
             const data = await response.json();
             if (data.status === 'saved') {
                 this.config.ocr = payload.ocr;
-                this.showAlert('success', 'OCR settings saved successfully! Pipeline will restart.');
+                await this.reportConfigJob(data.job, 'OCR');
             } else {
                 this.showAlert('danger', 'Failed to save OCR settings');
             }
@@ -322,7 +422,7 @@ class Dashboard {
                 }
             };
 
-            const response = await fetch('/api/config', {
+            const response = await fetch(`${this.apiBase}/config`, {
                 method: 'POST',
                 headers: { 'Content-Type': 'application/json' },
                 body: JSON.stringify(payload)
@@ -331,7 +431,7 @@ class Dashboard {
             const data = await response.json();
             if (data.status === 'saved') {
                 this.config.tts = payload.tts;
-                this.showAlert('success', 'TTS settings saved successfully!');
+                await this.reportConfigJob(data.job, 'TTS');
             } else {
                 this.showAlert('danger', 'Failed to save TTS settings');
             }
@@ -355,11 +455,14 @@ class Dashboard {
                 camera: {
                     source_type: document.getElementById('cameraSource').value,
                     camera_id: parseInt(document.getElementById('cameraId').value),
-                    resolution: document.getElementById('resolution').value
+                    resolution: document.getElementById('resolution').value,
+                    fourcc: document.getElementById('fourcc').value,
+                    source_path: document.getElementById('sourcePath').value,
+                    replay_speed: parseFloat(document.getElementById('replaySpeed').value)
                 }
             };
 
-            const response = await fetch('/api/config', {
+            const response = await fetch(`${this.apiBase}/config`, {
                 method: 'POST',
                 headers: { 'Content-Type': 'application/json' },
                 body: JSON.stringify(payload)
@@ -368,7 +471,7 @@ class Dashboard {
             const data = await response.json();
             if (data.status === 'saved') {
                 this.config.camera = payload.camera;
-                this.showAlert('success', 'Camera settings saved successfully! Pipeline will restart.');
+                await this.reportConfigJob(data.job, 'Camera');
             } else {
                 this.showAlert('danger', 'Failed to save camera settings');
             }
@@ -380,63 +483,185 @@ class Dashboard {
         }
     }
 
+    async waitForJob(job, intervalMs = 300) {
+        // Slow server work (config apply, speech) runs as a background job; poll until it finishes
+        // A job that can't be fetched any more (evicted, server restarted) ends as 'unknown'
+        let current = job;
+        while (current && (current.status === 'queued' || current.status === 'running')) {
+            await new Promise((resolve) => setTimeout(resolve, intervalMs));
+            try {
+                const response = await fetch(`/api/jobs/${current.id}`);
+                if (!response.ok) return { id: current.id, status: 'unknown' };
+                current = await response.json();
+            } catch (error) {
+                return { id: current.id, status: 'unknown' };
+            }
+        }
+        return current || { status: 'unknown' };
+    }
+
+    async reportConfigJob(job, label) {
+        const done = await this.waitForJob(job);
+        if (done.status === 'done') {
+            this.showAlert('success', `${label} settings saved and applied${this.describeApplied(done.result)}.`);
+        } else if (done.status === 'failed') {
+            this.showAlert('danger', `${label} settings saved but could not be applied: ${done.error}`);
+        } else {
+            this.showAlert('warning', `${label} settings saved, but whether they were applied is unknown (the server no longer tracks the job).`);
+        }
+    }
+
+    describeApplied(applied) {
+        // Summarise what the server had to do for a config change
+        if (!applied) return '';
+        const parts = [];
+        if (applied.reloaded && applied.reloaded.length) parts.push(`reloaded ${applied.reloaded.join(', ')}`);
+        if (applied.restarted) parts.push('restarted capture');
+        if (applied.restart_required && applied.restart_required.length) {
+            parts.push(`restart the server to apply ${applied.restart_required.join(', ')}`);
+        }
+        return parts.length ? ` (${parts.join(', ')})` : ' (no restart needed)';
+    }
+
     async updateStatus() {
         try {
-            const response = await fetch('/api/status');
+            const response = await fetch(`${this.apiBase}/status`);
             const data = await response.json();
-            
             if (data.pipeline) {
-                this.isRunning = data.pipeline.running || false;
-                this.updateStatusBadge(this.isRunning);
-                
-                if (data.pipeline.last_text) {
-                    const output = document.getElementById('ocrOutput');
-                    output.textContent = data.pipeline.last_text;
-                    output.classList.add('fade-in');
-                    setTimeout(() => output.classList.remove('fade-in'), 300);
-                }
+                this.renderStatus(data.pipeline);
             }
         } catch (error) {
             console.error('Error updating status:', error);
         }
     }
 
-    async updateHistory() {
+    renderStatus(status) {
+        // status may be a full snapshot or a delta with only the changed fields
+        if ('running' in status) {
+            this.isRunning = status.running || false;
+            this.updateStatusBadge(this.isRunning);
+        }
+        if (status.last_text) {
+            this.showLastText(status.last_text);
+        }
+    }
+
+    showLastText(text) {
+        const output = document.getElementById('ocrOutput');
+        if (output.textContent === text) return;
+        output.textContent = text;
+        output.classList.add('fade-in');
+        setTimeout(() => output.classList.remove('fade-in'), 300);
+    }
+
+    maxHistory() {
+        return (this.config.app && this.config.app.max_history) || 50;
+    }
+
+    async loadHistory() {
         try {
-            const response = await fetch('/api/history');
+            const response = await fetch(`${this.apiBase}/history?limit=${this.maxHistory()}`);
             const data = await response.json();
-            
-            const list = document.getElementById('historyList');
-            const count = document.getElementById('historyCount');
-            
-            if (data.history && data.history.length > 0) {
-                list.innerHTML = '';
-                count.textContent = data.history.length;
-                
-                data.history.forEach((h, index) => {
-                    const item = document.createElement('div');
-                    item.className = 'history-item fade-in';
-                    item.style.animationDelay = `${index * 0.05}s`;
-                    
-                    const time = new Date(h.ts * 1000).toLocaleString();
-                    const engine = h.engine ? ` [${h.engine}]` : '';
-                    const confidence = h.confidence ? ` (${(h.confidence * 100).toFixed(0)}%)` : '';
-                    
-                    item.innerHTML = `
-                        <div class="history-item-time">${time}${engine}${confidence}</div>
-                        <div class="history-item-text">${this.escapeHtml(h.text)}</div>
-                    `;
-                    list.appendChild(item);
-                });
-            } else {
-                list.innerHTML = '<div class="text-muted text-center">No history yet</div>';
-                count.textContent = '0';
+            this.history = data.history || [];
+            this.lastId = data.latest_id ?? null;
+            if (!this.searchQuery) {
+                this.renderHistory();
+            }
+        } catch (error) {
+            console.error('Error loading history:', error);
+        }
+    }
+
+    async updateHistory() {
+        // Incremental: only fetch entries newer than the last one we have
+        if (this.lastId === null) {
+            return this.loadHistory();
+        }
+        try {
+            let hasMore = true;
+            while (hasMore) {
+                const response = await fetch(`${this.apiBase}/history?since=${this.lastId}&limit=${this.maxHistory()}`);
+                const data = await response.json();
+                const entries = data.history || [];
+                entries.slice().reverse().forEach((h) => this.addHistoryEntry(h));
+                hasMore = data.has_more && entries.length > 0;
             }
         } catch (error) {
             console.error('Error updating history:', error);
         }
     }
 
+    async searchHistory(query) {
+        this.searchQuery = query;
+        if (!query) {
+            this.renderHistory();
+            return;
+        }
+        try {
+            const response = await fetch(`${this.apiBase}/history?q=${encodeURIComponent(query)}&limit=${this.maxHistory()}`);
+            const data = await response.json();
+            if (this.searchQuery === query) {
+                this.renderHistory(data.history || []);
+            }
+        } catch (error) {
+            console.error('Error searching history:', error);
+        }
+    }
+
+    addHistoryEntry(entry) {
+        if (entry.id !== undefined) {
+            // Polling and push can overlap after a reconnect
+            if (this.lastId !== null && entry.id <= this.lastId) return;
+            this.lastId = entry.id;
+        }
+        this.showLastText(entry.text);
+        const maxHistory = this.maxHistory();
+        this.history.unshift(entry);
+        if (this.history.length > maxHistory) {
+            this.history.length = maxHistory;
+        }
+        if (this.searchQuery) return;  // Showing search results; new entries appear when search is cleared
+        const list = document.getElementById('historyList');
+        if (this.history.length === 1) {
+            list.innerHTML = '';
+        }
+        list.insertBefore(this.createHistoryItem(entry, 0), list.firstChild);
+        while (list.children.length > this.history.length) {
+            list.removeChild(list.lastChild);
+        }
+        document.getElementById('historyCount').textContent = this.history.length;
+    }
+
+    renderHistory(entries = this.history) {
+        const list = document.getElementById('historyList');
+        const count = document.getElementById('historyCount');
+
+        if (entries.length > 0) {
+            list.innerHTML = '';
+            count.textContent = entries.length;
+            entries.forEach((h, index) => list.appendChild(this.createHistoryItem(h, index)));
+        } else {
+            list.innerHTML = '<div class="text-muted text-center">No history yet</div>';
+            count.textContent = '0';
+        }
+    }
+
+    createHistoryItem(h, index) {
+        const item = document.createElement('div');
+        item.className = 'history-item fade-in';
+        item.style.animationDelay = `${index * 0.05}s`;
+
+        const time = new Date(h.ts * 1000).toLocaleString();
+        const engine = h.engine ? ` [${h.engine}]` : '';
+        const confidence = h.confidence ? ` (${(h.confidence * 100).toFixed(0)}%)` : '';
+
+        item.innerHTML = `
+            <div class="history-item-time">${time}${engine}${confidence}</div>
+            <div class="history-item-text">${this.escapeHtml(h.text)}</div>
+        `;
+        return item;
+    }
+
     updateStatusBadge(isRunning) {
         const badge = document.getElementById('statusBadge');
         if (isRunning) {
@@ -472,6 +697,32 @@ class Dashboard {
         }, timeout);
     }
 
+    connectEvents() {
+        // Server push (SSE); falls back to polling if the browser or server can't do it
+        if (typeof EventSource === 'undefined') {
+            this.startPolling();
+            return;
+        }
+        this.updateHistory();
+        const source = new EventSource(`${this.apiBase}/events`);
+        this.eventSource = source;
+        source.addEventListener('open', () => {
+            if (this.statusInterval) {
+                // Reconnected after a fallback: resync, then stop polling
+                this.stopPolling();
+                this.updateHistory();
+            }
+        });
+        source.addEventListener('status', (e) => this.renderStatus(JSON.parse(e.data)));
+        source.addEventListener('transcript', (e) => this.addHistoryEntry(JSON.parse(e.data)));
+        source.addEventListener('error', () => {
+            // EventSource keeps retrying on its own; poll in the meantime
+            if (!this.statusInterval) {
+                this.startPolling();
+            }
+        });
+    }
+
     startPolling() {
         // Update status every second
         this.statusInterval = setInterval(() => this.updateStatus(), 1000);
@@ -491,6 +742,8 @@ class Dashboard {
         if (this.historyInterval) {
             clearInterval(this.historyInterval);
         }
+        this.statusInterval = null;
+        this.historyInterval = null;
     }
 
     escapeHtml(text) {